@@ -0,0 +1,367 @@
+"""Benchmark chất lượng nghiệm theo thời gian trên tập Example (và instance sinh ngẫu nhiên).
+
+Mỗi lần chạy (instance, solver, seed) ghi lại đường cong anytime: nghiệm tốt nhất theo
+thời gian thực và theo số lần đánh giá. Solver là một quy tắc dispatch (xem
+core/portfolio.py, vd. "baseline") hoặc một engine tối ưu (xem core/optimizers.py, vd.
+"gwo"). Kết quả lưu ra JSON kèm commit git và backend decoder để so sánh giữa các commit:
+tóm tắt median/IQR theo (instance, solver) và performance profile (Dolan–Moré) theo
+objective cuối và theo thời gian đạt mục tiêu.
+
+Chạy (trong thư mục Final_Project):
+    python -m core.benchmark run "../Example/*.json" --generate --solvers baseline gwo --seeds 5 -o bench.json
+    python -m core.benchmark compare bench_old.json bench.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Tuple, Iterable
+
+from .scheduler import Scheduler
+from .control import CancellationToken
+from .portfolio import DISPATCH_RULES, run_rule
+from .optimizers import ENGINES, build_optimizer
+from .tuning import defaults_for
+from .instances import generated_set, load_instances
+from .robustness import percentile
+from . import jit_engine
+
+FORMAT_VERSION = 1
+# Ngưỡng mặc định của profile thời gian: đạt trong 1% so với objective tốt nhất đã biết
+TARGET_TOLERANCE = 0.01
+PROFILE_TAUS = (1.0, 1.01, 1.02, 1.05, 1.1, 1.2, 1.5, 2.0, 5.0, 10.0)
+
+
+def solver_kind(name: str) -> str:
+    if name in DISPATCH_RULES:
+        return "rule"
+    if name in ENGINES:
+        return "engine"
+    raise ValueError(f"Unknown solver '{name}' (không phải quy tắc dispatch hay engine)")
+
+
+def solver_params(name: str, n_jobs: int, max_iter: int = None) -> Dict[str, Any]:
+    # GWO dùng tham số đã tune cho lớp kích thước (gwo_defaults.json); engine khác dùng mặc định
+    params: Dict[str, Any] = {}
+    if name == "gwo":
+        tuned = defaults_for(n_jobs)
+        params = tuned.gwo_kwargs() if tuned is not None else {"pop_size": 20, "max_iter": 50}
+    if max_iter is not None:
+        params["max_iter"] = max_iter
+    params.setdefault("max_iter", 100)
+    return params
+
+
+def run_one(instance_name: str, instance_data: Dict[str, Any], solver: str, seed: int,
+            max_iter: int = None, time_limit: float = None) -> Dict[str, Any]:
+    """Một lần chạy (hàm top-level để chạy trong process con).
+
+    curve: các điểm [giây, số lần đánh giá, objective tốt nhất], thêm một điểm mỗi khi
+    nghiệm tốt nhất cải thiện (và điểm cuối cùng).
+    """
+    sch = Scheduler.from_dict(instance_data)
+    start, cpu_start = time.time(), time.process_time()
+    curve: List[List[float]] = []
+
+    if solver_kind(solver) == "rule":
+        res = run_rule(sch, solver)
+        best, evaluations = res['metrics']['objectiveValue'], 1
+        curve.append([time.time() - start, 1, best])
+    else:
+        params = solver_params(solver, len(sch.jobs), max_iter)
+        iterations = params.pop("max_iter")
+        token = CancellationToken()
+
+        if solver == "gwo":
+            opt = build_optimizer(sch, solver, seed=seed, max_iter=iterations, **params)
+        else:
+            opt = build_optimizer(sch, solver, seed=seed, **params)
+
+        def record(t, max_t, _fitness):
+            # Dùng best_fitness (tốt nhất đến giờ), không phải tốt nhất của vòng lặp
+            elapsed = time.time() - start
+            if not curve or opt.best_fitness < curve[-1][2]:
+                curve.append([elapsed, opt.evaluations, opt.best_fitness])
+            if time_limit is not None and elapsed >= time_limit:
+                token.cancel()
+
+        if solver == "gwo":
+            _, best = opt.solve(progress_callback=record, cancel_token=token)
+        else:
+            _, best = opt.run(iterations, progress_callback=record, cancel_token=token, time_limit=time_limit)
+        evaluations = opt.evaluations
+
+    elapsed = time.time() - start
+    if not curve or curve[-1][2] > best or curve[-1][1] != evaluations:
+        curve.append([elapsed, evaluations, best])
+    return {"instance": instance_name, "solver": solver, "seed": seed, "n_jobs": len(sch.jobs),
+            "objective": best, "time": elapsed, "cpu_time": time.process_time() - cpu_start,
+            "evaluations": evaluations, "curve": curve}
+
+
+def run_benchmark(instances: List[Tuple[str, Dict[str, Any]]], solvers: Iterable[str], seeds: Iterable[int],
+                  max_iter: int = None, time_limit: float = None, max_workers: int = None,
+                  on_result=None) -> List[Dict[str, Any]]:
+    """Chạy mọi tổ hợp (instance, solver, seed) trên process pool.
+
+    Quy tắc dispatch là tất định nên chỉ chạy một lần với seed đầu tiên.
+    on_result(res) được gọi khi từng lần chạy xong (theo thứ tự hoàn thành).
+    """
+    solvers, seeds = list(solvers), list(seeds)
+    for name in solvers:
+        solver_kind(name)
+    jobs = [(name, data, solver, seed) for name, data in instances for solver in solvers
+            for seed in (seeds[:1] if solver_kind(solver) == "rule" else seeds)]
+    results = []
+    workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+    with ProcessPoolExecutor(max_workers=min(workers, max(1, len(jobs)))) as pool:
+        futures = [pool.submit(run_one, name, data, solver, seed, max_iter, time_limit)
+                   for name, data, solver, seed in jobs]
+        for fut in as_completed(futures):
+            res = fut.result()
+            results.append(res)
+            if on_result:
+                on_result(res)
+    order = {solver: i for i, solver in enumerate(solvers)}
+    results.sort(key=lambda r: (r['instance'], order[r['solver']], r['seed']))
+    return results
+
+
+# ---------- tổng hợp ----------
+def best_at(curve: List[List[float]], t: float, axis: int = 0) -> float:
+    """Objective tốt nhất đạt được tới thời điểm t (axis=0: giây, axis=1: số lần đánh giá)."""
+    best = math.inf
+    for point in curve:
+        if point[axis] > t:
+            break
+        best = point[2]
+    return best
+
+
+def time_to_target(curve: List[List[float]], target: float) -> float:
+    for elapsed, _, value in curve:
+        if value <= target:
+            return elapsed
+    return math.inf
+
+
+def _group(runs: List[Dict[str, Any]]) -> Dict[Tuple[str, str], List[Dict[str, Any]]]:
+    groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for res in runs:
+        groups.setdefault((res['instance'], res['solver']), []).append(res)
+    return groups
+
+
+def best_known(runs: List[Dict[str, Any]]) -> Dict[str, float]:
+    best: Dict[str, float] = {}
+    for res in runs:
+        best[res['instance']] = min(best.get(res['instance'], math.inf), res['objective'])
+    return best
+
+
+def summarize(runs: List[Dict[str, Any]], tolerance: float = TARGET_TOLERANCE) -> List[Dict[str, Any]]:
+    """Một dòng cho mỗi (instance, solver): median và IQR của objective, thời gian, số lần
+    đánh giá và thời gian đạt mục tiêu (objective tốt nhất đã biết * (1 + tolerance))."""
+    known = best_known(runs)
+    rows = []
+    for (inst, solver), group in _group(runs).items():
+        objs = sorted(r['objective'] for r in group)
+        times = sorted(r['time'] for r in group)
+        target = known[inst] + tolerance * abs(known[inst])
+        ttt = sorted(time_to_target(r['curve'], target) for r in group)
+        rows.append({
+            "instance": inst, "solver": solver, "runs": len(group),
+            "median": percentile(objs, 0.5), "q1": percentile(objs, 0.25), "q3": percentile(objs, 0.75),
+            "best": objs[0], "worst": objs[-1],
+            "median_time": percentile(times, 0.5),
+            "median_evaluations": percentile(sorted(r['evaluations'] for r in group), 0.5),
+            # inf (không đạt) không nội suy được: lấy phần tử giữa
+            "median_time_to_target": ttt[(len(ttt) - 1) // 2],
+            "success_rate": sum(1 for t in ttt if t != math.inf) / len(ttt),
+        })
+    rows.sort(key=lambda r: (r['instance'], r['median']))
+    return rows
+
+
+def _ratio(value: float, best: float) -> float:
+    if value == math.inf:
+        return math.inf
+    if value == best:
+        return 1.0
+    if best <= 0:
+        return math.inf
+    return value / best
+
+
+def performance_profile(rows: List[Dict[str, Any]], metric: str = "median",
+                        taus: Iterable[float] = PROFILE_TAUS) -> Dict[str, List[List[float]]]:
+    """Profile Dolan–Moré: với mỗi solver, tỉ lệ instance có metric <= tau * metric tốt nhất.
+
+    Trả về {solver: [[tau, tỉ lệ], ...]}; metric là một cột của summarize (vd. "median",
+    "median_time_to_target").
+    """
+    by_instance: Dict[str, Dict[str, float]] = {}
+    for row in rows:
+        by_instance.setdefault(row['instance'], {})[row['solver']] = row[metric]
+    solvers = sorted({row['solver'] for row in rows})
+    ratios: Dict[str, List[float]] = {s: [] for s in solvers}
+    for values in by_instance.values():
+        best = min(values.values())
+        for s in solvers:
+            ratios[s].append(_ratio(values.get(s, math.inf), best))
+    n = max(1, len(by_instance))
+    return {s: [[tau, sum(1 for r in ratios[s] if r <= tau) / n] for tau in taus] for s in solvers}
+
+
+def anytime_medians(runs: List[Dict[str, Any]], points: int = 20, axis: int = 0) -> List[Dict[str, Any]]:
+    """Đường cong anytime median qua các seed trên lưới log (axis=0: giây, 1: số lần đánh giá)."""
+    out = []
+    for (inst, solver), group in _group(runs).items():
+        horizon = max(r['curve'][-1][axis] for r in group)
+        lo = min(r['curve'][0][axis] for r in group)
+        lo = max(lo, horizon * 1e-4, 1e-6)
+        grid = [lo * (horizon / lo) ** (k / (points - 1)) for k in range(points)] if horizon > lo else [horizon]
+        curve = []
+        for t in grid:
+            vals = sorted(best_at(r['curve'], t, axis) for r in group)
+            curve.append([t, vals[(len(vals) - 1) // 2]])
+        out.append({"instance": inst, "solver": solver, "axis": "time" if axis == 0 else "evaluations",
+                    "curve": curve})
+    return out
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5)
+        return out.stdout.strip() if out.returncode == 0 else ""
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def build_report(runs: List[Dict[str, Any]], settings: Dict[str, Any]) -> Dict[str, Any]:
+    rows = summarize(runs)
+    return {
+        "version": FORMAT_VERSION,
+        "meta": {"commit": _git_commit(), "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                 "python": platform.python_version(), "machine": platform.machine(),
+                 "cpus": os.cpu_count(), "decoder": jit_engine.backend(), "settings": settings},
+        "summary": rows,
+        "profiles": {"objective": performance_profile(rows, "median"),
+                     "time_to_target": performance_profile(rows, "median_time_to_target")},
+        "anytime": anytime_medians(runs, axis=0) + anytime_medians(runs, axis=1),
+        "runs": runs,
+    }
+
+
+def save_report(report: Dict[str, Any], path: str):
+    # JSON không có Infinity chuẩn: ghi thành null
+    def clean(value):
+        if isinstance(value, float) and math.isinf(value):
+            return None
+        if isinstance(value, dict):
+            return {k: clean(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [clean(v) for v in value]
+        return value
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(clean(report), f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    if report.get('version') != FORMAT_VERSION:
+        raise ValueError(f"'{path}' không phải file benchmark phiên bản {FORMAT_VERSION}")
+    for row in report['summary']:
+        for key, value in row.items():
+            if value is None:
+                row[key] = math.inf
+    return report
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], tolerance: float = 0.005) -> List[Dict[str, Any]]:
+    """So sánh hai báo cáo theo (instance, solver) chung: thay đổi tương đối của median
+    objective và median thời gian. status = "worse"/"better" khi objective lệch quá tolerance."""
+    old_rows = {(r['instance'], r['solver']): r for r in old['summary']}
+    out = []
+    for row in new['summary']:
+        prev = old_rows.get((row['instance'], row['solver']))
+        if prev is None:
+            continue
+        base = abs(prev['median']) or 1.0
+        d_obj = (row['median'] - prev['median']) / base
+        d_time = row['median_time'] / prev['median_time'] if prev['median_time'] > 0 else math.inf
+        status = "worse" if d_obj > tolerance else "better" if d_obj < -tolerance else "same"
+        out.append({"instance": row['instance'], "solver": row['solver'], "old": prev['median'],
+                    "new": row['median'], "objective_change": d_obj, "time_ratio": d_time, "status": status})
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark chất lượng nghiệm theo thời gian.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run")
+    run.add_argument("patterns", nargs="*", help="Glob các file instance JSON")
+    run.add_argument("--generate", action="store_true", help="Thêm các instance sinh ngẫu nhiên")
+    run.add_argument("--solvers", nargs="+", default=["baseline", "gwo"])
+    run.add_argument("--seeds", type=int, default=5, help="Số seed cho mỗi engine")
+    run.add_argument("--iter", type=int, default=None, help="Số vòng lặp (mặc định: theo tuning / 100)")
+    run.add_argument("--time-limit", type=float, default=None, help="Giới hạn giây mỗi lần chạy")
+    run.add_argument("--workers", type=int, default=None)
+    run.add_argument("-o", "--output", default="benchmark.json")
+    cmp = sub.add_parser("compare")
+    cmp.add_argument("old")
+    cmp.add_argument("new")
+    cmp.add_argument("--tolerance", type=float, default=0.005)
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        old, new = load_report(args.old), load_report(args.new)
+        print(f"{old['meta']['commit'] or args.old} -> {new['meta']['commit'] or args.new}")
+        rows = compare(old, new, args.tolerance)
+        for row in rows:
+            print(f"{row['instance']:24s} {row['solver']:9s} {row['old']:12.2f} -> {row['new']:12.2f} "
+                  f"({row['objective_change'] * 100:+.2f}%)  thời gian x{row['time_ratio']:.2f}  {row['status']}")
+        worse = sum(1 for row in rows if row['status'] == "worse")
+        print(f"{len(rows)} cặp so sánh, {worse} cặp kém hơn")
+        return
+
+    instances = load_instances(args.patterns)
+    if args.generate:
+        instances += generated_set([(20, 3), (60, 5), (200, 8)])
+    if not instances:
+        parser.error("Không có instance nào")
+
+    def report(res):
+        print(f"{res['instance']:24s} {res['solver']:9s} seed={res['seed']} objective={res['objective']:.2f} "
+              f"time={res['time']:.2f}s eval={res['evaluations']}", flush=True)
+
+    settings = {"solvers": args.solvers, "seeds": args.seeds, "max_iter": args.iter,
+                "time_limit": args.time_limit, "instances": [name for name, _ in instances]}
+    runs = run_benchmark(instances, args.solvers, range(args.seeds), args.iter, args.time_limit,
+                         args.workers, on_result=report)
+    result = build_report(runs, settings)
+    save_report(result, args.output)
+
+    print()
+    for row in result['summary']:
+        print(f"{row['instance']:24s} {row['solver']:9s} median={row['median']:.2f} "
+              f"IQR=[{row['q1']:.2f}, {row['q3']:.2f}] time={row['median_time']:.2f}s "
+              f"đạt mục tiêu={row['success_rate'] * 100:.0f}%")
+    for name, profile in result['profiles'].items():
+        print(f"Profile {name}:")
+        for solver, points in profile.items():
+            print(f"  {solver:9s} " + " ".join(f"{tau:g}:{frac:.2f}" for tau, frac in points))
+    print(f"Đã ghi {len(runs)} lần chạy vào {args.output}")
+
+
+if __name__ == '__main__':
+    main()
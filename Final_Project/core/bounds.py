@@ -0,0 +1,115 @@
+"""Cận dưới cho hàm mục tiêu alpha * makespan + beta * tổng trễ có trọng số.
+
+Tính cận cho một file instance (trong thư mục Final_Project):
+    python -m core.bounds Example/hard_ex.json
+"""
+import argparse
+import json
+from dataclasses import dataclass, asdict
+from typing import Dict, Any
+
+from .scheduler import Scheduler, topological_order
+
+
+@dataclass
+class LowerBounds:
+    critical_path: float   # đường găng có tính release (head) của job
+    load: float            # tổng thời lượng chia đều cho các máy
+    makespan: float
+    tardiness_job: float   # từng job hoàn thành sớm nhất có thể
+    tardiness_edd: float   # nới lỏng thành một máy nhanh gấp m lần, ghép EDD với w_min
+    tardiness: float
+    objective: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def job_heads(scheduler: Scheduler) -> Dict[int, float]:
+    """Thời điểm bắt đầu sớm nhất của từng job: release, máy rảnh sớm nhất, tiền nhiệm."""
+    earliest_machine = min((scheduler.machine_ready.get(m, 0) for m in range(1, scheduler.machines + 1)), default=0)
+    heads: Dict[int, float] = {}
+    for jid in topological_order(scheduler):
+        job = scheduler.jobs[jid]
+        h = max(job.r, earliest_machine)
+        for p in job.preds:
+            h = max(h, heads[p] + scheduler.jobs[p].p)
+        heads[jid] = h
+    return heads
+
+
+def lower_bounds(scheduler: Scheduler) -> LowerBounds:
+    """Cận dưới hợp lệ cho mọi lịch khả thi, O(n log n + số cạnh).
+
+    Makespan và tổng trễ được chặn độc lập rồi cộng theo alpha, beta (giả sử alpha,
+    beta >= 0). Cận trễ EDD: thời điểm hoàn thành nhỏ thứ k của mọi lịch không nhỏ hơn
+    L_k = max(giá trị nhỏ thứ k của head + p, máy rảnh sớm nhất + tổng k thời lượng nhỏ
+    nhất / m); ghép các L_k tăng dần với due date tăng dần cho tổng trễ nhỏ nhất, nhân
+    với trọng số nhỏ nhất.
+    """
+    jobs = scheduler.jobs
+    m = max(1, scheduler.machines)
+    if not jobs:
+        return LowerBounds(0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+    heads = job_heads(scheduler)
+    earliest = {jid: heads[jid] + job.p for jid, job in jobs.items()}
+    critical_path = max(earliest.values())
+
+    # Mỗi máy không thể bắt đầu trước max(thời điểm rảnh, head nhỏ nhất). Máy rảnh quá
+    # muộn có thể không được dùng, nên lấy min theo số máy q dùng các máy rảnh sớm nhất
+    first_start = min(heads.values())
+    starts = sorted(max(scheduler.machine_ready.get(k, 0), first_start) for k in range(1, m + 1))
+    total_p = sum(job.p for job in jobs.values())
+    load = float('inf')
+    acc = 0.0
+    for q, s in enumerate(starts, start=1):
+        acc += s
+        load = min(load, (acc + total_p) / q)
+    makespan = max(critical_path, load)
+
+    tardiness_job = sum(job.w * max(0.0, earliest[jid] - job.d) for jid, job in jobs.items())
+
+    base = min(scheduler.machine_ready.get(k, 0) for k in range(1, m + 1))
+    ps = sorted(job.p for job in jobs.values())
+    completions = sorted(earliest.values())
+    dues = sorted(job.d for job in jobs.values())
+    w_min = min(job.w for job in jobs.values())
+    acc = 0.0
+    edd = 0.0
+    for k in range(len(jobs)):
+        acc += ps[k]
+        c = max(completions[k], base + acc / m)
+        edd += max(0.0, c - dues[k])
+    tardiness_edd = max(0.0, w_min) * edd
+    tardiness = max(tardiness_job, tardiness_edd)
+
+    objective = scheduler.alpha * makespan + scheduler.beta * tardiness
+    return LowerBounds(float(critical_path), float(load), float(makespan), float(tardiness_job),
+                       float(tardiness_edd), float(tardiness), float(objective))
+
+
+def optimality_gap(objective: float, lower_bound: float) -> float:
+    # Gap tương đối (UB - LB) / UB; 0 nghĩa là đã chứng minh tối ưu
+    if objective <= 0:
+        return 0.0
+    return max(0.0, (objective - lower_bound) / objective)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tính cận dưới và gap của lịch greedy cho một instance.")
+    parser.add_argument("input", help="File instance JSON")
+    args = parser.parse_args(argv)
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        sch = Scheduler.from_dict(json.load(f))
+    lb = lower_bounds(sch)
+    for key, value in lb.to_dict().items():
+        print(f"{key:15s} {value:.2f}")
+    sch.greedy_schedule()
+    obj = sch.compute_metrics()["objectiveValue"]
+    print(f"greedy objective={obj:.2f} gap={optimality_gap(obj, lb.objective) * 100:.2f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+"""Checkpoint nhị phân cho các lần chạy GWO dài và tiếp tục chạy từ checkpoint.
+
+Chạy GWO có checkpoint / tiếp tục (trong thư mục Final_Project):
+    python -m core.checkpoint run Example/hard_ex.json run.ckpt --pop 30 --iter 500 --every-seconds 60
+    python -m core.checkpoint resume Example/hard_ex.json run.ckpt --pop 30 --iter 500
+    python -m core.checkpoint info run.ckpt
+"""
+import argparse
+import json
+import os
+import struct
+import threading
+import time
+from array import array
+from typing import List, Dict, Any, Optional
+
+MAGIC = b"GWOCKPT1"
+# config hash, vòng lặp kế tiếp, pop_size, số chiều, độ dài lịch sử, số chiều đã cạnh tranh,
+# độ dài metadata JSON, best fitness, có best solution hay không
+HEADER = struct.Struct("<20sIIIIIId?")
+
+
+def encode_state(state: Dict[str, Any]) -> bytes:
+    """Đóng gói trạng thái GWO: header cố định + các mảng double/int64 + metadata JSON nhỏ."""
+    keys = state["keys"]
+    population = state["population"]
+    history = state["history"]
+    meta = json.dumps(state.get("meta", {})).encode("utf-8")
+    rng_version, rng_internal, gauss_next = state["rng_state"]
+    best = state["best"]
+
+    parts = [MAGIC, HEADER.pack(state["config_hash"], state["iteration"], len(population), len(keys),
+                                len(history[0]), len(state["contended"]), len(meta),
+                                state["best_fitness"], best is not None)]
+    parts.append(array('q', keys).tobytes())
+    flat = array('d')
+    for row in population:
+        flat.extend(row)
+    parts.append(flat.tobytes())
+    if best is not None:
+        parts.append(array('d', best).tobytes())
+    for series in history:
+        parts.append(array('d', series).tobytes())
+    parts.append(array('q', state["contended"]).tobytes())
+    # Trạng thái Mersenne Twister: 625 số nguyên 32 bit
+    parts.append(struct.pack("<I", len(rng_internal)))
+    parts.append(array('Q', rng_internal).tobytes())
+    parts.append(struct.pack("<i?d", rng_version, gauss_next is not None, gauss_next or 0.0))
+    parts.append(meta)
+    return b"".join(parts)
+
+
+def decode_state(data: bytes) -> Dict[str, Any]:
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a GWO checkpoint file")
+    pos = len(MAGIC)
+    (config_hash, iteration, pop_size, dim, n_hist, n_contended, meta_len,
+     best_fitness, has_best) = HEADER.unpack_from(data, pos)
+    pos += HEADER.size
+
+    def take(typecode, count):
+        nonlocal pos
+        arr = array(typecode)
+        size = arr.itemsize * count
+        arr.frombytes(data[pos:pos + size])
+        pos += size
+        return arr
+
+    keys = list(take('q', dim))
+    flat = take('d', pop_size * dim)
+    population = [list(flat[i * dim:(i + 1) * dim]) for i in range(pop_size)]
+    best = list(take('d', dim)) if has_best else None
+    history = [list(take('d', n_hist)) for _ in range(3)]
+    contended = list(take('q', n_contended))
+    (n_rng,) = struct.unpack_from("<I", data, pos)
+    pos += 4
+    rng_internal = tuple(take('Q', n_rng))
+    rng_version, has_gauss, gauss = struct.unpack_from("<i?d", data, pos)
+    pos += struct.calcsize("<i?d")
+    meta = json.loads(data[pos:pos + meta_len].decode("utf-8"))
+    return {
+        "config_hash": config_hash,
+        "iteration": iteration,
+        "keys": keys,
+        "population": population,
+        "best": best,
+        "best_fitness": best_fitness,
+        "history": history,
+        "contended": contended,
+        "rng_state": (rng_version, rng_internal, gauss if has_gauss else None),
+        "meta": meta,
+    }
+
+
+def write_atomic(path: str, data: bytes):
+    # Ghi file tạm rồi os.replace: file checkpoint luôn là bản cũ hoặc bản mới hoàn chỉnh
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str) -> Dict[str, Any]:
+    with open(path, 'rb') as f:
+        return decode_state(f.read())
+
+
+class CheckpointWriter:
+    """Ghi checkpoint định kỳ (theo số vòng lặp và/hoặc thời gian) trên một thread nền.
+
+    Vòng lặp GWO chỉ tốn thời gian đóng gói trạng thái thành bytes; việc ghi đĩa và
+    fsync chạy nền. Nếu lần ghi trước chưa xong thì lần kế tiếp chờ nó (chỉ có một file).
+    """
+
+    def __init__(self, path: str, every_iters: int = None, every_seconds: float = None):
+        if not every_iters and not every_seconds:
+            every_iters = 1
+        self.path = path
+        self.every_iters = every_iters
+        self.every_seconds = every_seconds
+        self.last_iteration = 0
+        self.last_time = time.time()
+        self.writes = 0
+        self.error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def due(self, iteration: int) -> bool:
+        if self.every_iters and iteration - self.last_iteration >= self.every_iters:
+            return True
+        return bool(self.every_seconds) and time.time() - self.last_time >= self.every_seconds
+
+    def submit(self, iteration: int, data: bytes):
+        self.wait()
+        self.last_iteration = iteration
+        self.last_time = time.time()
+        self._thread = threading.Thread(target=self._write, args=(data,), daemon=True)
+        self._thread.start()
+
+    def _write(self, data: bytes):
+        try:
+            write_atomic(self.path, data)
+            self.writes += 1
+        except OSError as e:
+            self.error = e
+
+    def wait(self):
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+
+def main(argv=None):
+    from .scheduler import Scheduler
+    from .gwo import GWOScheduler
+    from .tuning import defaults_for
+
+    parser = argparse.ArgumentParser(description="Chạy GWO có checkpoint, tiếp tục từ checkpoint hoặc xem checkpoint.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("run", "resume"):
+        p = sub.add_parser(name)
+        p.add_argument("input", help="File instance JSON")
+        p.add_argument("checkpoint", help="File checkpoint")
+        p.add_argument("--pop", type=int, default=None, help="Mặc định: gwo_defaults.json hoặc 20")
+        p.add_argument("--iter", type=int, default=None, help="Mặc định: gwo_defaults.json hoặc 50")
+        p.add_argument("--seed", type=int, default=None)
+        p.add_argument("--every-iters", type=int, default=None)
+        p.add_argument("--every-seconds", type=float, default=None)
+    info = sub.add_parser("info")
+    info.add_argument("checkpoint")
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        state = load_checkpoint(args.checkpoint)
+        print(f"iteration={state['iteration']} pop={len(state['population'])} dim={len(state['keys'])} "
+              f"best={state['best_fitness']:.2f} hash={state['config_hash'].hex()}")
+        return
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        sch = Scheduler.from_dict(json.load(f))
+    # Tham số đã tune cho lớp kích thước (nếu có); --pop/--iter ghi đè
+    tuned = defaults_for(len(sch.jobs))
+    options = tuned.gwo_kwargs() if tuned is not None else {"pop_size": 20, "max_iter": 50}
+    if args.pop is not None:
+        options["pop_size"] = args.pop
+    if args.iter is not None:
+        options["max_iter"] = args.iter
+    gwo = GWOScheduler(sch, seed=args.seed, **options)
+    writer = CheckpointWriter(args.checkpoint, args.every_iters, args.every_seconds)
+
+    def report(t, max_t, fitness):
+        print(f"iter {t}/{max_t} best={fitness:.2f}", flush=True)
+
+    if args.command == "run":
+        _, best = gwo.solve(progress_callback=report, checkpoint=writer)
+    else:
+        _, best = gwo.resume(args.checkpoint, progress_callback=report, checkpoint=writer)
+    print(f"best objective={best:.2f} ({writer.writes} checkpoint)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+from typing import Dict, Set
+
+
+class ContentionTracker:
+    """Ghi lại các job có priority thực sự ảnh hưởng tới lần decode.
+
+    Một job "cạnh tranh" nếu có lúc nó nằm trong ready heap khi số job sẵn sàng nhiều
+    hơn số máy rảnh ở lượt giao việc: khi đó job nào được giao (và job nào phải chờ) phụ
+    thuộc priority. Nếu mọi job sẵn sàng đều được giao ngay trong lượt của nó thì
+    priority của nó không làm thay đổi lịch trong lần decode đó.
+
+    Decoder gọi `entered` khi job vào ready heap và `assigned` sau mỗi lượt pop; chi
+    phí O(1) mỗi job nhờ so sánh số thứ tự lượt thay vì duyệt lại cả ready heap.
+    """
+
+    def __init__(self, contended: Set[int]):
+        self.contended = contended
+        self.step = 0
+        self.last_contended = -1
+        self.since: Dict[int, int] = {}
+
+    def entered(self, jid: int):
+        self.since[jid] = self.step
+
+    def assigned(self, ready_count: int, free_count: int, jids):
+        # ready_count: số job trong ready heap ngay trước lượt pop; free_count: số máy rảnh lấy ra
+        if ready_count > free_count:
+            self.last_contended = self.step
+        for jid in jids:
+            if self.last_contended >= self.since[jid]:
+                self.contended.add(jid)
+        self.step += 1
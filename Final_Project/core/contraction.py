@@ -0,0 +1,92 @@
+from typing import List, Dict
+
+from .scheduler import Scheduler, topological_order
+
+
+def essential_preds(scheduler: Scheduler, max_jobs: int = 5000) -> Dict[int, List[int]]:
+    """Tiền nhiệm sau khi bỏ cạnh bắc cầu (u -> v thừa nếu u đã là tổ tiên của một tiền nhiệm khác của v).
+
+    Dùng bitset tổ tiên (số nguyên Python) theo thứ tự topo, bộ nhớ O(n^2) bit; với
+    instance lớn hơn max_jobs hoặc có chu trình thì giữ nguyên danh sách preds.
+    """
+    jobs = scheduler.jobs
+    direct = {jid: list(dict.fromkeys(p for p in job.preds if p in jobs)) for jid, job in jobs.items()}
+    if len(jobs) > max_jobs:
+        return direct
+    try:
+        order = topological_order(scheduler)
+    except ValueError:
+        return direct
+    bit = {jid: 1 << i for i, jid in enumerate(order)}
+    ancestors: Dict[int, int] = {}
+    result: Dict[int, List[int]] = {}
+    for jid in order:
+        preds = direct[jid]
+        reach = 0
+        for p in preds:
+            reach |= ancestors[p]
+        result[jid] = [p for p in preds if not reach & bit[p]]
+        ancestors[jid] = reach | sum(bit[p] for p in preds)
+    return result
+
+
+class ChainContraction:
+    """Gộp các chuỗi tiền nhiệm tuyến tính thành một chiều duy nhất cho GWO.
+
+    Job v được gộp vào tiền nhiệm u khi u là tiền nhiệm duy nhất của v và v là job kế
+    tiếp duy nhất của u, sau khi đã bỏ các cạnh bắc cầu (nên chuỗi như super_hard_ex,
+    nơi job k còn phụ thuộc thêm k-10, k-20, vẫn được nhận ra). Các job trong cùng
+    chuỗi không bao giờ cùng nằm trong ready heap, nên thứ tự giữa chúng do ràng buộc
+    quyết định; chỉ mức ưu tiên của cả chuỗi so với job khác là cần tối ưu. Mỗi chuỗi được đại diện bởi job đầu chuỗi.
+
+    Dùng làm `encoding` cho GWOScheduler: `keys` là các chiều tìm kiếm, `reduce` thu
+    vector đầy đủ về vector rút gọn, `expand` trải vector rút gọn ra từng job để decode.
+    """
+
+    def __init__(self, scheduler: Scheduler, max_jobs: int = 5000):
+        jobs = scheduler.jobs
+        preds = essential_preds(scheduler, max_jobs)
+        succ: Dict[int, List[int]] = {jid: [] for jid in jobs}
+        for jid in jobs:
+            for p in preds[jid]:
+                succ[p].append(jid)
+
+        def merges_into_pred(jid):
+            return len(preds[jid]) == 1 and len(succ[preds[jid][0]]) == 1
+
+        self.chains: Dict[int, List[int]] = {}
+        self.head_of: Dict[int, int] = {}
+        for jid in jobs:
+            if merges_into_pred(jid):
+                continue
+            chain = [jid]
+            while len(succ[chain[-1]]) == 1 and merges_into_pred(succ[chain[-1]][0]):
+                chain.append(succ[chain[-1]][0])
+            self.chains[jid] = chain
+            for member in chain:
+                self.head_of[member] = jid
+
+        # Chu trình gồm toàn job "gộp được" không có đầu chuỗi: giữ riêng từng job
+        for jid in jobs:
+            if jid not in self.head_of:
+                self.chains[jid] = [jid]
+                self.head_of[jid] = jid
+
+        self.keys: List[int] = list(self.chains)
+
+    @property
+    def dimension(self) -> int:
+        return len(self.keys)
+
+    @property
+    def reduction(self) -> float:
+        # Tỉ lệ số chiều được bỏ đi (0 = không gộp được gì)
+        total = len(self.head_of)
+        return 1.0 - self.dimension / total if total else 0.0
+
+    def reduce(self, vector: Dict[int, float]) -> Dict[int, float]:
+        # Giá trị của chuỗi = giá trị của job đầu chuỗi
+        return {head: vector[head] for head in self.keys}
+
+    def expand(self, vector: Dict[int, float]) -> Dict[int, float]:
+        return {jid: vector[head] for jid, head in self.head_of.items()}
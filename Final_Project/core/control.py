@@ -0,0 +1,42 @@
+import threading
+
+
+class SolveCancelled(Exception):
+    """Được ném ra từ bên trong vòng lặp giải khi người dùng bấm Dừng."""
+    pass
+
+
+class CancellationToken:
+    """Token hủy/tạm dừng dùng chung giữa thread GUI và thread giải (cooperative)."""
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    def cancel(self):
+        self._cancelled.set()
+        # Đánh thức thread đang tạm dừng để nó thấy lệnh hủy
+        self._running.set()
+
+    def pause(self):
+        if not self._cancelled.is_set():
+            self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    def check(self):
+        # Chặn tại đây khi đang tạm dừng; ném SolveCancelled nếu đã bị hủy
+        if not self._running.is_set():
+            self._running.wait()
+        if self._cancelled.is_set():
+            raise SolveCancelled()
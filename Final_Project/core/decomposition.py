@@ -0,0 +1,189 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Tuple
+
+from .scheduler import Scheduler, topological_order
+from .gwo import GWOScheduler
+from .portfolio import seed_vector
+
+
+def _optimize_window(sub: Scheduler, pop_size: int, max_iter: int, seed,
+                     init_vector: Dict[int, float] = None) -> Dict[int, float]:
+    # Hàm top-level để chạy trong process con
+    gwo = GWOScheduler(sub, pop_size=pop_size, max_iter=max_iter, seed=seed, init_vector=init_vector)
+    vector, _ = gwo.solve()
+    return vector
+
+
+def _rule_seed(sub: Scheduler) -> Dict[int, float]:
+    # Alpha wolf của cửa sổ bắt đầu từ lịch của quy tắc baseline trên chính cửa sổ đó
+    sch = Scheduler(machines=sub.machines, alpha=sub.alpha, beta=sub.beta)
+    sch.jobs = sub.jobs
+    sch.machine_ready = dict(sub.machine_ready)
+    return seed_vector(sch.greedy_schedule())
+
+
+class RollingHorizonSolver:
+    """Giải instance rất lớn bằng cách chia job thành các cửa sổ thời gian chồng lấn.
+
+    Job được sắp theo thứ tự topo (release, due date). Mỗi cửa sổ gồm các job chưa chốt
+    của cửa sổ trước cộng các job kế tiếp, tối đa `window_size` job, và được tối ưu bằng
+    GWO (khởi tạo từ lịch của quy tắc baseline) với phần đã chốt làm điều kiện biên.
+    Chỉ chốt các task bắt đầu trước release nhỏ nhất của các job chưa vào cửa sổ nào:
+    job sau không thể dùng khoảng trống trước các task đó, nên thời điểm rảnh của máy
+    không làm mất khoảng trống nào. Nếu như vậy chốt được ít hơn window_size - overlap
+    task thì chốt các task bắt đầu sớm nhất, nên mỗi cửa sổ chuyển tiếp tối đa `overlap` job.
+
+    Với parallel=True, GWO của các cửa sổ cố định (xem plan) chạy song song trên điều kiện
+    biên lấy từ lịch baseline; thời điểm bắt đầu của job trong lịch tối ưu của cửa sổ
+    được dùng làm priority để decode toàn bộ instance một lần.
+
+    Kết quả không bao giờ tệ hơn lịch baseline: nếu tệ hơn thì trả về lịch baseline
+    (`stats`: objective của lịch ghép, của baseline và có dùng baseline thay thế không).
+    """
+
+    def __init__(self, scheduler: Scheduler, window_size: int = 200, overlap: int = 50,
+                 pop_size: int = 10, max_iter: int = 20, parallel: bool = False,
+                 max_workers: int = None, seed=None):
+        if window_size <= 0 or not (0 <= overlap < window_size):
+            raise ValueError("Cần window_size > 0 và 0 <= overlap < window_size")
+        self.sch = scheduler
+        self.window_size = window_size
+        self.overlap = overlap
+        self.pop_size = pop_size
+        self.max_iter = max_iter
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.seed = seed
+        self.stats: Dict[str, Any] = {}
+
+    def plan(self) -> List[Tuple[List[int], List[int]]]:
+        """Các cửa sổ cố định (job trong cửa sổ, job thuộc về cửa sổ) dùng cho chế độ song song."""
+        order = topological_order(self.sch)
+        step = self.window_size - self.overlap
+        windows = []
+        start = 0
+        while start < len(order):
+            window = order[start:start + self.window_size]
+            if start + self.window_size >= len(order):
+                windows.append((window, window))
+                break
+            windows.append((window, order[start:start + step]))
+            start += step
+        return windows
+
+    def _window_seed(self, k: int):
+        return None if self.seed is None else self.seed + k
+
+    def _baseline(self) -> Scheduler:
+        sch = Scheduler(machines=self.sch.machines, alpha=self.sch.alpha, beta=self.sch.beta)
+        sch.jobs = self.sch.jobs
+        sch.machine_ready = dict(self.sch.machine_ready)
+        sch.greedy_schedule()
+        return sch
+
+    def _estimated_boundaries(self, windows, baseline: Scheduler) -> List[Tuple[Dict[int, float], Dict[int, float]]]:
+        # Điều kiện biên ước lượng cho chế độ song song: lấy từ lịch baseline
+        placed = {}
+        for mname, tasks in baseline.schedule.items():
+            mid = int(mname[1:])
+            for task in tasks:
+                placed[task['job']] = (mid, task['end'])
+
+        boundaries = []
+        completed_at: Dict[int, float] = {}
+        machine_ready = dict(self.sch.machine_ready)
+        for window, commit in windows:
+            boundaries.append((dict(completed_at), dict(machine_ready)))
+            for jid in commit:
+                mid, end = placed[jid]
+                completed_at[jid] = end
+                machine_ready[mid] = max(machine_ready.get(mid, 0), end)
+        return boundaries
+
+    def _solve_parallel(self, baseline: Scheduler, progress_callback=None) -> Dict[str, List[Dict[str, Any]]]:
+        windows = self.plan()
+        boundaries = self._estimated_boundaries(windows, baseline)
+        combined: Dict[int, float] = {}
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            futures, subs = [], []
+            for k, ((window, _), (completed_at, machine_ready)) in enumerate(zip(windows, boundaries)):
+                sub = self.sch.subproblem(window, completed_at, machine_ready)
+                subs.append(sub)
+                futures.append(pool.submit(_optimize_window, sub, self.pop_size, self.max_iter,
+                                           self._window_seed(k), _rule_seed(sub)))
+            for k, fut in enumerate(futures):
+                # Vector GWO của các cửa sổ không so sánh được với nhau; thời điểm bắt đầu
+                # trong lịch tối ưu của cửa sổ thì so được, nên dùng làm priority chung
+                starts = {task['job']: task['start']
+                          for tasks in subs[k].greedy_schedule(priority_vector=fut.result()).values()
+                          for task in tasks}
+                for jid in windows[k][1]:
+                    combined[jid] = starts[jid]
+                if progress_callback:
+                    progress_callback(k + 1, len(windows))
+        self.stats["windows"] = len(windows)
+        return self.sch.greedy_schedule(priority_vector=combined)
+
+    def _solve_sequential(self, progress_callback=None) -> Dict[str, List[Dict[str, Any]]]:
+        order = topological_order(self.sch)
+        n = len(order)
+        step = self.window_size - self.overlap
+        # Release nhỏ nhất của các job từ vị trí i trở đi trong thứ tự topo
+        min_release = [float('inf')] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            min_release[i] = min(min_release[i + 1], self.sch.jobs[order[i]].r)
+
+        schedule = {f"M{m}": [] for m in range(1, self.sch.machines + 1)}
+        completed_at: Dict[int, float] = {}
+        machine_ready = dict(self.sch.machine_ready)
+        carried: List[int] = []
+        pos = 0
+        k = 0
+        while carried or pos < n:
+            fill = self.window_size - len(carried)
+            window = carried + order[pos:pos + fill]
+            pos = min(n, pos + fill)
+            sub = self.sch.subproblem(window, completed_at, machine_ready)
+            vector = _optimize_window(sub, self.pop_size, self.max_iter, self._window_seed(k), _rule_seed(sub))
+            sub.greedy_schedule(priority_vector=vector)
+
+            tasks = sorted((task for tasks in sub.schedule.values() for task in tasks),
+                           key=lambda t: (t['start'], t['job']))
+            if pos >= n:
+                commit = tasks
+            else:
+                commit = [t for t in tasks if t['start'] < min_release[pos]]
+                if len(commit) < step:
+                    commit = tasks[:step]
+            committed = set()
+            for task in commit:
+                mid = int(task['machine'][1:])
+                schedule[task['machine']].append(task)
+                completed_at[task['job']] = task['end']
+                machine_ready[mid] = max(machine_ready.get(mid, 0), task['end'])
+                committed.add(task['job'])
+            carried = [jid for jid in window if jid not in committed]
+            k += 1
+            if progress_callback:
+                progress_callback(len(completed_at), n)
+
+        for tasks in schedule.values():
+            tasks.sort(key=lambda t: t['start'])
+        self.stats["windows"] = k
+        self.sch.schedule = schedule
+        return schedule
+
+    def solve(self, progress_callback=None) -> Dict[str, List[Dict[str, Any]]]:
+        """Giải và lưu lịch vào scheduler. progress_callback(đã xong, tổng): số cửa sổ ở
+        chế độ song song, số job đã chốt ở chế độ tuần tự."""
+        baseline = self._baseline()
+        if self.parallel:
+            self._solve_parallel(baseline, progress_callback)
+        else:
+            self._solve_sequential(progress_callback)
+        objective = self.sch.compute_metrics()['objectiveValue']
+        base_objective = baseline.compute_metrics()['objectiveValue']
+        self.stats.update(decomposed=objective, baseline=base_objective, fallback=objective > base_objective)
+        if self.stats["fallback"]:
+            self.sch.schedule = baseline.schedule
+        return self.sch.schedule
@@ -0,0 +1,97 @@
+import random
+import time
+from typing import Dict, Tuple, Any
+
+from .scheduler import Scheduler
+from .control import SolveCancelled
+
+
+class Optimizer:
+    """Giao diện chung của các engine tối ưu priority vector (GWO, GA, PSO, SA, IG).
+
+    Mọi engine dùng chung decoder `greedy_schedule(priority_vector=...)`; giá trị nhỏ
+    hơn được ưu tiên trước. Một engine cài đặt `init` (tạo trạng thái ban đầu) và
+    `step(t)` (một vòng lặp, ghi best_fitness vào best_fitness_history, trả về False để
+    dừng); `best`, `state`, `inject` và `run` dùng chung.
+    """
+
+    name = "base"
+
+    def __init__(self, scheduler: Scheduler, seed=None, init_vector: Dict[int, float] = None):
+        self.sch = scheduler
+        self.rng = random.Random(seed)
+        self.init_vector = init_vector
+        self.max_iter = 0
+        self.evaluations = 0
+        self.best_solution = None
+        self.best_fitness = float('inf')
+        self.best_fitness_history = []
+        self.cancelled = False
+        self._cancel_token = None
+        # ParetoArchive (core/pareto.py) nhận mọi cặp (makespan, penalty) đã decode (None = tắt)
+        self.archive = None
+
+    # ---------- cần cài đặt ----------
+    def init(self):
+        raise NotImplementedError
+
+    def step(self, t: int) -> bool:
+        raise NotImplementedError
+
+    # ---------- dùng chung ----------
+    def heuristic_vector(self) -> Dict[int, float]:
+        # Vector khởi tạo: init_vector nếu có, còn lại dùng heuristic d + p - w
+        init = self.init_vector or {}
+        return {jid: init.get(jid, job.d + job.p - job.w) for jid, job in self.sch.jobs.items()}
+
+    def evaluate(self, vector: Dict[int, float]) -> float:
+        # Decode (không sửa self.sch) và cập nhật nghiệm tốt nhất
+        metrics = self.sch.evaluate(vector, cancel_token=self._cancel_token)
+        fitness = metrics['objectiveValue']
+        self.evaluations += 1
+        if self.archive is not None:
+            self.archive.add(metrics['makespan'], metrics['totalPenalty'], vector)
+        if fitness < self.best_fitness:
+            self.best_fitness = fitness
+            self.best_solution = dict(vector)
+        return fitness
+
+    def best(self) -> Tuple[Dict[int, float], float]:
+        return self.best_solution, self.best_fitness
+
+    def state(self) -> Dict[str, Any]:
+        return {"engine": self.name, "best_fitness": self.best_fitness, "evaluations": self.evaluations,
+                "iterations": len(self.best_fitness_history)}
+
+    def inject(self, vector: Dict[int, float], fitness: float):
+        """Nhận nghiệm tốt từ bên ngoài (vd. engine khác trong portfolio)."""
+        if fitness < self.best_fitness:
+            self.best_fitness = fitness
+            self.best_solution = dict(vector)
+
+    def run(self, max_iter: int, progress_callback=None, cancel_token=None, time_limit: float = None,
+            target: float = None, on_iteration=None) -> Tuple[Dict[int, float], float]:
+        """Chạy tối đa max_iter vòng; dừng sớm khi đạt target, hết time_limit (giây) hoặc
+        on_iteration(optimizer) trả về False."""
+        self.max_iter = max_iter
+        self.cancelled = False
+        self._cancel_token = cancel_token
+        start = time.time()
+        try:
+            self.init()
+            for t in range(max_iter):
+                if not self.step(t):
+                    break
+                if progress_callback:
+                    progress_callback(t + 1, max_iter, self.best_fitness)
+                if on_iteration is not None and on_iteration(self) is False:
+                    break
+                if target is not None and self.best_fitness <= target:
+                    break
+                if time_limit is not None and time.time() - start >= time_limit:
+                    break
+        except SolveCancelled:
+            self.cancelled = True
+        finally:
+            self._cancel_token = None
+        return self.best()
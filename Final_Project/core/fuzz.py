@@ -0,0 +1,568 @@
+"""Fuzz vi sai cho các decoder và optimizer: mọi đường decode phải ra cùng lịch với decoder gốc.
+
+Sinh instance ngẫu nhiên kèm các trường hợp biên (p = 0, release bằng nhau, chuỗi tiền
+nhiệm sâu, priority hòa nhau, thời điểm rảnh máy lẻ, chu trình và tiền nhiệm không tồn
+tại - hai trường hợp cuối mọi decoder phải ném ValueError), decode bằng từng backend
+(xem DECODERS) và so schedule + metrics với bản đóng băng của greedy_schedule gốc
+(`baseline_greedy_schedule`), nên lỗi chung của mọi engine mới vẫn bị phát hiện. GWO với
+seed cố định được chạy tuần tự trong process hiện tại và song song trên process pool,
+kết quả phải trùng khớp. Ca lỗi được thu nhỏ (bỏ job, bỏ tiền nhiệm, đơn giản hóa giá
+trị) rồi ghi ra file JSON để tái hiện bằng --replay.
+
+Chạy (trong thư mục Final_Project):
+    python -m core.fuzz --cases 500 --seed 0 --gwo
+    python -m core.fuzz --replay fuzz_failures/case_12.json
+"""
+import argparse
+import heapq
+import json
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+from .scheduler import Scheduler
+from .validation import validate_schedule
+from .portfolio import DISPATCH_RULES, get_rule
+from . import jit_engine
+
+FLAVORS = ("random", "zero_p", "equal_release", "deep_chain", "ties", "fractional", "busy_machines",
+           "many_machines", "empty", "cycle", "missing_pred")
+
+
+# ---------- sinh ca kiểm thử ----------
+def random_case(rng: random.Random, flavor: str = None, max_jobs: int = 40) -> Dict[str, Any]:
+    """Một ca: instance (định dạng Example/*.json), machine_ready, priority vector hoặc tên quy tắc."""
+    flavor = flavor or rng.choice(FLAVORS)
+    n = 0 if flavor == "empty" else rng.randint(1, max_jobs)
+    machines = rng.randint(n + 1, n + 4) if flavor == "many_machines" else rng.randint(1, 6)
+    ids = list(range(1, n + 1))
+    if rng.random() < 0.3:
+        # id không liên tiếp và thứ tự khai báo xáo trộn
+        ids = sorted(rng.sample(range(1, 4 * n + 2), n))
+    p_values = [0, 1] if flavor == "zero_p" else None
+    common_r = rng.randint(0, 10)
+    jobs = []
+    for i, jid in enumerate(ids):
+        p = rng.choice(p_values) if p_values and rng.random() < 0.6 else rng.randint(0, 12) if rng.random() < 0.1 \
+            else rng.randint(1, 12)
+        r = common_r if flavor == "equal_release" else rng.randint(0, 3 * n)
+        d = r + p + rng.randint(-5, 25)
+        w = rng.choice([0.5, 1.0, 2.0, 3.5]) if flavor == "ties" else round(rng.uniform(0.1, 5.0), 1)
+        preds = []
+        if flavor == "deep_chain" and i > 0:
+            preds = [ids[i - 1]] + ([ids[i - 2]] if i > 1 and rng.random() < 0.2 else [])
+        elif i > 0 and rng.random() < 0.3:
+            preds = sorted(set(rng.choice(ids[max(0, i - 10):i]) for _ in range(rng.randint(1, 3))))
+        jobs.append({"id": jid, "p": p, "d": d, "w": w, "r": r, "preds": preds})
+    if flavor == "cycle" and n >= 1:
+        # Cạnh ngược tạo chu trình (n = 1: job tự phụ thuộc chính nó)
+        a, b = sorted(rng.sample(range(n), 2)) if n > 1 else (0, 0)
+        jobs[b]["preds"] = sorted(set(jobs[b]["preds"] + [ids[a]]))
+        jobs[a]["preds"] = sorted(set(jobs[a]["preds"] + [ids[b]]))
+    if flavor == "missing_pred" and n >= 1:
+        jobs[rng.randrange(n)]["preds"].append(max(ids) + rng.randint(1, 5))
+    if rng.random() < 0.3:
+        rng.shuffle(jobs)
+
+    machine_ready = {}
+    if flavor in ("busy_machines", "fractional"):
+        for k in range(1, machines + 1):
+            if rng.random() < 0.6:
+                t = rng.randint(0, 20)
+                machine_ready[k] = t + 0.5 if flavor == "fractional" and rng.random() < 0.5 else t
+
+    case = {"flavor": flavor,
+            "instance": {"machines": machines, "alpha": rng.choice([1.0, 0.5, 2.0]),
+                         "beta": rng.choice([1.0, 3.0, 0.25]), "jobs": jobs},
+            "machine_ready": machine_ready, "vector": None, "rule": None}
+    if rng.random() < 0.3:
+        case["rule"] = rng.choice(list(DISPATCH_RULES))
+    else:
+        levels = [rng.uniform(-1, 1) for _ in range(3)]
+        tie = flavor == "ties" or rng.random() < 0.3
+        case["vector"] = {j["id"]: (rng.choice(levels) if tie else rng.uniform(-1, 1))
+                          for j in jobs if rng.random() < 0.95}
+    return case
+
+
+def expects_error(case: Dict[str, Any]) -> bool:
+    """Instance không hợp lệ (tiền nhiệm không tồn tại hoặc có chu trình), xét trực tiếp trên dữ liệu."""
+    jobs = case["instance"]["jobs"]
+    ids = {j["id"] for j in jobs}
+    if any(p not in ids for j in jobs for p in j["preds"]):
+        return True
+    indeg = {j["id"]: len(j["preds"]) for j in jobs}
+    succ: Dict[int, List[int]] = {jid: [] for jid in ids}
+    for j in jobs:
+        for p in j["preds"]:
+            succ[p].append(j["id"])
+    queue = [jid for jid, deg in indeg.items() if deg == 0]
+    seen = 0
+    while queue:
+        jid = queue.pop()
+        seen += 1
+        for s in succ[jid]:
+            indeg[s] -= 1
+            if indeg[s] == 0:
+                queue.append(s)
+    return seen != len(ids)
+
+
+def build_scheduler(case: Dict[str, Any]) -> Scheduler:
+    # Luôn dựng Scheduler mới: các backend không dùng chung cache hay trạng thái
+    sch = Scheduler.from_dict(case["instance"])
+    sch.machine_ready = {int(k): v for k, v in case.get("machine_ready", {}).items()}
+    return sch
+
+
+def _vector(case) -> Optional[Dict[int, float]]:
+    return {int(k): v for k, v in case["vector"].items()} if case.get("vector") is not None else None
+
+
+# ---------- decoder tham chiếu ----------
+def baseline_greedy_schedule(scheduler: Scheduler, priority_vector: Dict[int, float] = None,
+                             rule=None) -> Dict[str, List[Dict[str, Any]]]:
+    """Bản đóng băng của Scheduler.greedy_schedule gốc (trước MachinePool, engine int, kernel JIT).
+
+    Giữ nguyên thuật toán gốc để một lỗi chung của các engine mới vẫn bị phát hiện; chỉ
+    thêm thời điểm rảnh ban đầu của máy (machine_ready) và key của quy tắc dispatch
+    (`rule`), hai tính năng có sau bản gốc. Không sửa hàm này khi tối ưu decoder.
+    """
+    jobs = scheduler.jobs
+    # --- build graph (indeg, succ) ---
+    indeg = {jid: 0 for jid in jobs}
+    succ = {jid: [] for jid in jobs}
+    for jid, job in jobs.items():
+        for p in job.preds:
+            if p not in jobs:
+                raise ValueError(f"Predecessor {p} of job {jid} not found")
+            indeg[jid] += 1
+            succ[p].append(jid)
+
+    tmp_q = [jid for jid, deg in indeg.items() if deg == 0]
+    visited = 0
+    tmp_indeg = indeg.copy()
+    while tmp_q:
+        x = tmp_q.pop()
+        visited += 1
+        for nb in succ.get(x, []):
+            tmp_indeg[nb] -= 1
+            if tmp_indeg[nb] == 0:
+                tmp_q.append(nb)
+    if visited != len(jobs):
+        raise ValueError("Cycle detected in precedence constraints")
+
+    # --- machine heap: (time_free, machine_id) ---
+    machine_heap = [(scheduler.machine_ready.get(m, 0), m) for m in range(1, scheduler.machines + 1)]
+    heapq.heapify(machine_heap)
+
+    def ready_key(jid, now):
+        job = jobs[jid]
+        if priority_vector is not None:
+            return (priority_vector.get(jid, 0), job.d, jid)
+        if rule is not None:
+            return rule(job, now, preds_completed_at[jid])
+        alpha_h = 10
+        beta_h = 1.0
+        system_pressure = job.d + job.p
+        job_risk = job.w * (max(0, job.p + max(now, preds_completed_at[jid]) - job.d))
+        core_score = alpha_h * system_pressure - beta_h * job_risk
+        return (core_score, job.d, job.p, -job.w, jid)
+
+    ready_heap = []
+    in_ready = set()
+    release_heap = []
+    sched_indeg = indeg.copy()
+    remaining = set(jobs.keys())
+    preds_completed_at = {jid: 0 for jid in jobs}
+    schedule_dict = {f"M{m}": [] for m in range(1, scheduler.machines + 1)}
+
+    for jid, job in jobs.items():
+        if sched_indeg[jid] == 0:
+            heapq.heappush(release_heap, (job.r, jid))
+
+    current_time = 0.0
+
+    def pop_releases_up_to(now):
+        nonlocal ready_heap
+        while release_heap and release_heap[0][0] <= now:
+            _, jid = heapq.heappop(release_heap)
+            in_ready.add(jid)
+        new_heap = []
+        for jid in list(in_ready):
+            if jid in remaining:
+                heapq.heappush(new_heap, (ready_key(jid, now), jid))
+        ready_heap = new_heap
+
+    pop_releases_up_to(0)
+
+    while remaining:
+        if not ready_heap:
+            if not release_heap:
+                break
+            next_r, _ = release_heap[0]
+            current_time = max(current_time, next_r)
+            pop_releases_up_to(current_time)
+
+        t_free, mid = machine_heap[0]
+        if t_free > current_time + 1e-6 and ready_heap:
+            current_time = t_free
+            pop_releases_up_to(current_time)
+
+        free_machines = []
+        while machine_heap and machine_heap[0][0] <= current_time + 1e-6:
+            free_machines.append(heapq.heappop(machine_heap))
+
+        assignments = []
+        for _ in range(len(free_machines)):
+            while ready_heap and ready_heap[0][1] not in remaining:
+                _, stale_jid = heapq.heappop(ready_heap)
+                in_ready.discard(stale_jid)
+            if not ready_heap:
+                break
+            _, jid = heapq.heappop(ready_heap)
+            in_ready.discard(jid)
+            assignments.append(jid)
+
+        used_free = free_machines[:len(assignments)]
+        unused_free = free_machines[len(assignments):]
+
+        for (t_free, mid), jid in zip(used_free, assignments):
+            job = jobs[jid]
+            start_time = max(t_free, job.r, preds_completed_at[jid])
+            completion_time = start_time + job.p
+            machine_name = f"M{mid}"
+            schedule_dict[machine_name].append({"job": jid, "machine": machine_name,
+                                                "start": float(start_time), "end": float(completion_time)})
+            heapq.heappush(machine_heap, (completion_time, mid))
+            remaining.discard(jid)
+            for s in succ.get(jid, []):
+                preds_completed_at[s] = max(preds_completed_at[s], completion_time)
+                sched_indeg[s] -= 1
+                if sched_indeg[s] == 0:
+                    heapq.heappush(release_heap, (jobs[s].r, s))
+            pop_releases_up_to(completion_time)
+
+        for item in unused_free:
+            heapq.heappush(machine_heap, item)
+
+        if assignments:
+            earliest_completion = min([item[0] for item in used_free]) + job.p
+            current_time = max(current_time, earliest_completion)
+
+    return schedule_dict
+
+
+def decode_baseline(case):
+    sch = build_scheduler(case)
+    rule = get_rule(case["rule"]).key_for(sch) if case.get("rule") else None
+    sch.schedule = baseline_greedy_schedule(sch, _vector(case), rule)
+    return sch.schedule, sch.compute_metrics()
+
+
+# ---------- các backend decode ----------
+def _greedy(case, **kwargs):
+    sch = build_scheduler(case)
+    rule = get_rule(case["rule"]).key_for(sch) if case.get("rule") else None
+    sch.greedy_schedule(priority_vector=_vector(case), rule=rule, **kwargs)
+    return sch.schedule, sch.compute_metrics()
+
+
+def decode_float(case):
+    return _greedy(case, engine="float")
+
+
+def decode_int(case):
+    if not build_scheduler(case).is_integral():
+        return None
+    return _greedy(case, engine="int")
+
+
+def decode_traced(case):
+    # Có contention + progress_callback: luôn đi đường Python, kể cả khi bật Numba
+    return _greedy(case, contention=set(), progress_callback=lambda done, total: None)
+
+
+def decode_auto(case):
+    return _greedy(case)
+
+
+def decode_kernel(case):
+    """Kernel của core/jit_engine.py chạy bằng Python thuần trên list (không cần numpy / numba)."""
+    sch = build_scheduler(case)
+    vector = _vector(case)
+    if vector is None or not sch.is_integral():
+        return None
+    kernel = getattr(jit_engine._decode_kernel, "py_func", jit_engine._decode_kernel)
+    metrics_kernel = getattr(jit_engine._metrics_kernel, "py_func", jit_engine._metrics_kernel)
+    indeg, succ = sch._precedence_graph()
+    ids = list(sch.jobs)
+    jobs = [sch.jobs[jid] for jid in ids]
+    n, m = len(ids), sch.machines
+    index = {jid: i for i, jid in enumerate(ids)}
+    ptr, flat = [0], []
+    for jid in ids:
+        flat.extend(index[s] for s in succ[jid])
+        ptr.append(len(flat))
+    job_of_rank = sorted(range(n), key=lambda i: (vector.get(ids[i], 0), float(jobs[i].d), ids[i]))
+    rank = [0] * n
+    for r, i in enumerate(job_of_rank):
+        rank[i] = r
+    P = [int(j.p) for j in jobs]
+    ready = [int(sch.machine_ready.get(k, 0)) for k in range(1, m + 1)]
+    start, machine, order = [0] * n, [0] * n, [0] * n
+    done = kernel(rank, job_of_rank, P, [int(j.r) for j in jobs], ptr, flat, [indeg[j] for j in ids], ready,
+                  [0] * n, [0] * n, [0] * m, [0] * m, [0] * m, [0] * n, start, machine, order)
+    schedule = {f"M{k}": [] for k in range(1, m + 1)}
+    for j in order[:done]:
+        name = f"M{machine[j]}"
+        schedule[name].append({"job": ids[j], "machine": name, "start": float(start[j]), "end": float(start[j] + P[j])})
+    if done == 0:
+        return schedule, {"makespan": 0, "totalPenalty": 0.0, "maxLateness": 0, "objectiveValue": 0.0}
+    out = [0.0] * 4
+    metrics_kernel(start, P, [float(j.d) for j in jobs], [j.w for j in jobs], float(sch.alpha), float(sch.beta), out)
+    return schedule, {"makespan": int(math.ceil(out[0])), "totalPenalty": float(out[1]), "maxLateness": int(out[2]),
+                      "objectiveValue": float(out[3])}
+
+
+def decode_numba(case):
+    sch = build_scheduler(case)
+    vector = _vector(case)
+    if not jit_engine.NUMBA_AVAILABLE or vector is None or not sch.is_integral():
+        return None
+    schedule = jit_engine.greedy_schedule_jit(sch, vector)
+    metrics = jit_engine.evaluate_jit(sch, vector)
+    if schedule is None or metrics is None:
+        return None
+    return schedule, metrics
+
+
+def evaluate_only(case):
+    # Scheduler.evaluate: chỉ metrics (schedule None = không so)
+    if case.get("rule"):
+        return None
+    return None, build_scheduler(case).evaluate(_vector(case))
+
+
+DECODERS: Dict[str, Callable[[Dict[str, Any]], Optional[Tuple]]] = {
+    "baseline": decode_baseline,
+    "float": decode_float,
+    "int": decode_int,
+    "traced": decode_traced,
+    "auto": decode_auto,
+    "kernel": decode_kernel,
+    "numba": decode_numba,
+    "evaluate": evaluate_only,
+}
+REFERENCE = "baseline"
+
+
+def _run(fn, case):
+    try:
+        return "ok", fn(case)
+    except ValueError as e:
+        return "ValueError", str(e)
+    except Exception as e:  # lỗi khác ValueError cũng là sai khác cần báo
+        return type(e).__name__, str(e)
+
+
+def check_case(case: Dict[str, Any], decoders: List[str] = None) -> List[str]:
+    """Danh sách sai khác (rỗng = mọi backend khớp với decoder gốc đóng băng)."""
+    names = decoders or list(DECODERS)
+    invalid = expects_error(case)
+    status, ref = _run(DECODERS[REFERENCE], case)
+    problems = []
+    if invalid or status != "ok":
+        # Instance không hợp lệ: mọi backend áp dụng được phải ném ValueError
+        if status != "ValueError":
+            problems.append(f"{REFERENCE}: expected ValueError, got {status}")
+        for name in names:
+            if name == REFERENCE:
+                continue
+            st, res = _run(DECODERS[name], case)
+            if st != "ValueError" and not (st == "ok" and res is None):
+                problems.append(f"{name}: expected ValueError, got {st}")
+        return problems
+
+    ref_schedule, ref_metrics = ref
+    report = validate_schedule(build_scheduler(case), ref_schedule)
+    if not report.ok:
+        problems.append(f"{REFERENCE}: infeasible schedule ({report.summary()})")
+    for name in names:
+        if name == REFERENCE:
+            continue
+        st, res = _run(DECODERS[name], case)
+        if st != "ok":
+            problems.append(f"{name}: raised {st}: {res}")
+            continue
+        if res is None:
+            continue
+        schedule, metrics = res
+        if schedule is not None and schedule != ref_schedule:
+            problems.append(f"{name}: schedule differs")
+        if metrics != ref_metrics:
+            problems.append(f"{name}: metrics differ ({metrics} != {ref_metrics})")
+    return problems
+
+
+# ---------- thu nhỏ ca lỗi ----------
+def _without_jobs(case, drop: set):
+    new = json.loads(json.dumps(case))
+    jobs = [j for j in new["instance"]["jobs"] if j["id"] not in drop]
+    for j in jobs:
+        j["preds"] = [p for p in j["preds"] if p not in drop]
+    new["instance"]["jobs"] = jobs
+    if new.get("vector") is not None:
+        new["vector"] = {k: v for k, v in new["vector"].items() if int(k) not in drop}
+    return new
+
+
+def _candidates(case):
+    jobs = case["instance"]["jobs"]
+    ids = [j["id"] for j in jobs]
+    # Bỏ job theo khối (một nửa, một phần tư, ...) rồi từng job
+    size = len(ids) // 2
+    while size >= 1:
+        for i in range(0, len(ids), size):
+            yield _without_jobs(case, set(ids[i:i + size]))
+        size //= 2
+    for k, job in enumerate(jobs):
+        for p in job["preds"]:
+            new = json.loads(json.dumps(case))
+            new["instance"]["jobs"][k]["preds"].remove(p)
+            yield new
+    if case["instance"]["machines"] > 1:
+        for machines in (1, case["instance"]["machines"] - 1):
+            new = json.loads(json.dumps(case))
+            new["instance"]["machines"] = machines
+            new["machine_ready"] = {k: v for k, v in new["machine_ready"].items() if int(k) <= machines}
+            yield new
+    if case["machine_ready"]:
+        yield dict(json.loads(json.dumps(case)), machine_ready={})
+    for field, simple in (("r", 0), ("d", 0), ("w", 1.0), ("p", 1), ("p", 0)):
+        for k, job in enumerate(jobs):
+            if job[field] != simple:
+                new = json.loads(json.dumps(case))
+                new["instance"]["jobs"][k][field] = simple
+                yield new
+    if case.get("vector"):
+        for key, value in case["vector"].items():
+            if value != 0:
+                new = json.loads(json.dumps(case))
+                new["vector"][key] = 0.0
+                yield new
+
+
+def _kind(problem: str) -> str:
+    # Loại sai khác (bỏ phần chi tiết trong ngoặc): biến thể phải lỗi cùng kiểu mới được nhận
+    return problem.split(" (")[0]
+
+
+def shrink(case: Dict[str, Any], check: Callable[[Dict[str, Any]], List[str]] = check_case,
+           max_steps: int = 2000) -> Tuple[Dict[str, Any], List[str]]:
+    """Thu nhỏ tham lam: nhận một biến thể nếu nó vẫn lỗi với cùng backend; lặp đến khi không thu nhỏ được."""
+    problems = check(case)
+    if not problems:
+        return case, problems
+    signature = {_kind(p) for p in problems}
+    steps = 0
+    improved = True
+    while improved and steps < max_steps:
+        improved = False
+        for candidate in _candidates(case):
+            steps += 1
+            found = check(candidate)
+            if found and {_kind(p) for p in found} & signature:
+                case, problems = candidate, found
+                improved = True
+                break
+            if steps >= max_steps:
+                break
+    return case, problems
+
+
+# ---------- GWO tuần tự / song song ----------
+def run_gwo(instance_data: Dict[str, Any], seed: int, pop_size: int, max_iter: int) -> Dict[str, Any]:
+    # Hàm top-level để chạy trong process con
+    from .gwo import GWOScheduler
+    gwo = GWOScheduler(Scheduler.from_dict(instance_data), pop_size=pop_size, max_iter=max_iter, seed=seed)
+    vector, fitness = gwo.solve()
+    return {"vector": vector, "fitness": fitness, "history": gwo.best_fitness_history,
+            "evaluations": gwo.evaluations}
+
+
+def check_gwo(instance_data: Dict[str, Any], seeds: List[int], pop_size: int = 8, max_iter: int = 5,
+              max_workers: int = None) -> List[str]:
+    """GWO cùng seed phải cho kết quả giống hệt khi chạy tuần tự và trên process pool;
+    nếu có Numba thì cả khi đổi backend decode."""
+    serial = [run_gwo(instance_data, s, pop_size, max_iter) for s in seeds]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        parallel = list(pool.map(run_gwo, [instance_data] * len(seeds), seeds, [pop_size] * len(seeds),
+                                 [max_iter] * len(seeds)))
+    problems = [f"gwo seed={s}: serial != parallel" for s, a, b in zip(seeds, serial, parallel) if a != b]
+    if jit_engine.NUMBA_AVAILABLE:
+        previous = jit_engine.backend()
+        for backend in ("python", "numba"):
+            jit_engine.set_backend(backend)
+            try:
+                other = [run_gwo(instance_data, s, pop_size, max_iter) for s in seeds]
+            finally:
+                jit_engine.set_backend(previous)
+            problems += [f"gwo seed={s}: serial != {backend} backend" for s, a, b in zip(seeds, serial, other) if a != b]
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fuzz vi sai các backend decode và GWO tuần tự / song song.")
+    parser.add_argument("--cases", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-jobs", type=int, default=40)
+    parser.add_argument("--flavor", choices=FLAVORS, default=None, help="Chỉ sinh một loại ca")
+    parser.add_argument("--gwo", action="store_true", help="Kiểm tra thêm GWO tuần tự / song song")
+    parser.add_argument("--gwo-cases", type=int, default=5)
+    parser.add_argument("--out", default="fuzz_failures", help="Thư mục ghi các ca lỗi đã thu nhỏ")
+    parser.add_argument("--replay", default=None, help="Chạy lại một ca đã ghi")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        with open(args.replay, 'r', encoding='utf-8') as f:
+            case = json.load(f)
+        problems = check_case(case)
+        print("\n".join(problems) if problems else "Khớp ở mọi backend")
+        return 1 if problems else 0
+
+    print(f"Backend: {', '.join(name for name in DECODERS)} (numba {'có' if jit_engine.NUMBA_AVAILABLE else 'không có'})")
+    rng = random.Random(args.seed)
+    failures = 0
+    for index in range(args.cases):
+        case = random_case(rng, args.flavor, args.max_jobs)
+        problems = check_case(case)
+        if not problems:
+            continue
+        failures += 1
+        small, problems = shrink(case)
+        os.makedirs(args.out, exist_ok=True)
+        path = os.path.join(args.out, f"case_{index}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(dict(small, problems=problems), f, indent=1)
+        print(f"Ca {index} ({case['flavor']}): {problems[0]} - thu nhỏ còn {len(small['instance']['jobs'])} job, "
+              f"ghi {path}", flush=True)
+    print(f"{args.cases} ca, {failures} ca lỗi")
+
+    if args.gwo:
+        gwo_failures = 0
+        for index in range(args.gwo_cases):
+            case = random_case(rng, "random", args.max_jobs)
+            problems = check_gwo(case["instance"], seeds=[index, index + 1000])
+            gwo_failures += bool(problems)
+            for problem in problems:
+                print(f"GWO ca {index}: {problem}")
+        print(f"GWO: {args.gwo_cases} instance, {gwo_failures} instance lỗi")
+        failures += gwo_failures
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
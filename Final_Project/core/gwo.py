@@ -1,32 +1,97 @@
-import random
 import copy
+import hashlib
+import json
+import math
+from dataclasses import asdict
 from typing import List, Dict, Tuple
 from .scheduler import Scheduler # Kết nối với file scheduler.py
+from .engine import Optimizer
+from .control import SolveCancelled
+from .validation import validate_schedule
+from .bounds import lower_bounds, optimality_gap
+from .screening import ScreeningConfig, Screener
+from .checkpoint import encode_state, load_checkpoint
+
+def scale_to_bounds(vector: Dict[int, float], lower: float, upper: float) -> Dict[int, float]:
+    # Co giãn tuyến tính về [lower, upper]: giữ nguyên thứ tự nên decode ra cùng lịch
+    if not vector:
+        return {}
+    lo, hi = min(vector.values()), max(vector.values())
+    if hi == lo:
+        return {jid: lower for jid in vector}
+    k = (upper - lower) / (hi - lo)
+    return {jid: lower + (v - lo) * k for jid, v in vector.items()}
+
+
+class GWOScheduler(Optimizer):
+    name = "gwo"
 
-class GWOScheduler:
     def __init__(self, scheduler: Scheduler,
                  pop_size=20,
                  max_iter=50,
                  lower=-1.0,
-                 upper=1.0):
-        self.sch = scheduler
-        self.jobs = list(scheduler.jobs.keys())
+                 upper=1.0,
+                 seed=None,
+                 init_vector: Dict[int, float] = None,
+                 validate: bool = False,
+                 encoding=None,
+                 freeze_after: int = 0,
+                 gap_target: float = None,
+                 screening: ScreeningConfig = None,
+                 scale_init: bool = False,
+                 archive=None):
+        # RNG riêng cho mỗi lần chạy để có thể tái lập kết quả theo seed; init_vector là
+        # vector khởi tạo cho alpha wolf (warm start), mặc định dùng heuristic d + p - w
+        super().__init__(scheduler, seed=seed, init_vector=init_vector)
+        # Mã hóa không gian tìm kiếm (vd. ChainContraction): mỗi chiều là một key của
+        # encoding, vector được trải ra từng job trước khi decode
+        self.encoding = encoding
+        if freeze_after > 0 and encoding is not None and not hasattr(encoding, "head_of"):
+            # vd. FeatureEncoding: mỗi chiều ảnh hưởng mọi job, không đóng băng theo job được
+            raise ValueError("freeze_after requires an encoding that maps jobs to dimensions (head_of)")
+        self.jobs = list(encoding.keys) if encoding is not None else list(scheduler.jobs.keys())
         self.pop_size = pop_size
         self.max_iter = max_iter
         self.lower = lower
         self.upper = upper
+        # Co giãn vector khởi tạo về [lower, upper] (heuristic d + p - w có thang đo khác hẳn)
+        self.scale_init = scale_init
+        # Chế độ debug: kiểm tra tính khả thi của mọi lịch được decode
+        self.validate = validate
+        # Đóng băng chiều không cạnh tranh sau freeze_after vòng quan sát (0 = tắt)
+        self.freeze_after = freeze_after
+        self.contended = set()   # các chiều từng cạnh tranh trong ready heap
+        self.frozen = set()      # các chiều được bỏ qua khi cập nhật vị trí
+        # Dừng sớm khi gap so với cận dưới <= gap_target (vd. 0.01 = 1%; None = tắt)
+        self.gap_target = gap_target
+        self.lower_bound = None
+        self.stopped_early = False
+        # Sàng lọc sói bằng fitness rẻ trước khi decode chính xác (None = tắt)
+        self.screening = screening
+        self.screener = None
+        self.screening_stats = {}
+        self.iteration = 0       # vòng lặp kế tiếp sẽ chạy (dùng cho checkpoint / resume)
+        # Archive Pareto (makespan, penalty) của mọi lần decode chính xác (xem core/pareto.py)
+        self.archive = archive
 
         self.population: List[Dict[int, float]] = []  # list of priority dicts
         self.fitness: List[float] = []
-        self.best_fitness_history = []
-        self.best_solution = None
+        self.mean_fitness_history = []
+        self.diversity_history = []
 
     # ---------- initialization ----------
     def init_population(self):
         base = {}
         for jid, job in self.sch.jobs.items():
-            # Sử dụng công thức heuristic
-            base[jid] = job.d + job.p - job.w
+            if self.init_vector is not None and jid in self.init_vector:
+                base[jid] = self.init_vector[jid]
+            else:
+                # Sử dụng công thức heuristic
+                base[jid] = job.d + job.p - job.w
+        if self.scale_init:
+            base = scale_to_bounds(base, self.lower, self.upper)
+        if self.encoding is not None:
+            base = self.encoding.reduce(base)
 
         self.population = []
 
@@ -35,78 +100,332 @@ class GWOScheduler:
 
         # beta, delta: noisy heuristic
         for _ in range(2):
-            x = {jid: base[jid] + random.uniform(-0.1, 0.1) for jid in self.jobs}
+            x = {jid: base[jid] + self.rng.uniform(-0.1, 0.1) for jid in self.jobs}
             self.population.append(x)
 
         # rest: random
         while len(self.population) < self.pop_size:
-            x = {jid: random.uniform(self.lower, self.upper) for jid in self.jobs}
+            x = {jid: self.rng.uniform(self.lower, self.upper) for jid in self.jobs}
             self.population.append(x)
 
     # ---------- fitness ----------
+    def full_vector(self, X: Dict[int, float]) -> Dict[int, float]:
+        # Priority vector theo từng job (dùng được trực tiếp cho greedy_schedule)
+        return self.encoding.expand(X) if self.encoding is not None else X
+
     def evaluate(self, X: Dict[int, float]):
+        self.evaluations += 1
+        # Chỉ ghi nhận cạnh tranh trong freeze_after vòng quan sát đầu và khi vẫn còn chiều
+        # chưa cạnh tranh; sau đó tập đóng băng cố định, dùng đường evaluate nhanh
+        watching = (self.iteration < self.freeze_after
+                    and len(self.contended) < len(self.jobs))
+        if not watching and not self.validate:
+            # Chỉ cần metrics: Scheduler.evaluate (kernel JIT nếu có), không sao chép Scheduler
+            metrics = self.sch.evaluate(self.full_vector(X), cancel_token=self._cancel_token)
+            self._archive(metrics, X)
+            return metrics["objectiveValue"]
         # Tạo bản sao mới cho mỗi lần đánh giá fitness
         sch_temp = copy.deepcopy(self.sch) 
-        sch_temp.greedy_schedule(priority_vector=X) 
+        contention = set() if watching else None
+        sch_temp.greedy_schedule(priority_vector=self.full_vector(X), cancel_token=self._cancel_token,
+                                 contention=contention) 
+        if contention:
+            self._record_contention(contention)
+        if self.validate:
+            validate_schedule(sch_temp, max_violations=10).raise_if_invalid()
         metrics = sch_temp.compute_metrics()
+        self._archive(metrics, X)
         return metrics["objectiveValue"]
 
+    def _archive(self, metrics, X: Dict[int, float]):
+        # Chỉ trải vector ra từng job khi điểm thực sự vào archive
+        if self.archive is not None and self.archive.would_accept(metrics["makespan"], metrics["totalPenalty"]):
+            self.archive.add(metrics["makespan"], metrics["totalPenalty"], self.full_vector(X))
+
+    def evaluate_population(self, population: List[Dict[int, float]]) -> List[float]:
+        fitness = []
+        for X in population:
+            if self._cancel_token is not None:
+                self._cancel_token.check()
+            f = self.evaluate(X)
+            fitness.append(f)
+            # Lưu nghiệm tốt nhất từng thấy để trả về khi bị dừng giữa chừng
+            if f < self.best_fitness:
+                self.best_fitness = f
+                self.best_solution = X
+        return fitness
+
+    def screening_active(self, t: int) -> bool:
+        # Vòng đầu đánh giá rẻ, các vòng cuối (từ exact_after) đánh giá chính xác toàn bộ
+        return self.screener is not None and t < self.screening.exact_after * self.max_iter
+
+    def evaluate_screened(self, population: List[Dict[int, float]]) -> List[float]:
+        """Xếp hạng sói bằng Screener, chỉ decode chính xác phần đầu (ít nhất 3 con).
+
+        Sói không được decode nhận fitness vô cùng nên không thể là alpha/beta/delta.
+        Theo chu kỳ audit_every, phần còn lại cũng được decode để đo xem sàng lọc có làm
+        đổi bộ ba dẫn đầu hay không.
+        """
+        stats = self.screening_stats
+        cheap = []
+        for X in population:
+            if self._cancel_token is not None:
+                self._cancel_token.check()
+            cheap.append(self.screener.score(self.full_vector(X)))
+        stats["cheap_evals"] += len(population)
+
+        n = len(population)
+        k = min(n, max(3, math.ceil(self.screening.ratio * n)))
+        order = sorted(range(n), key=lambda i: cheap[i])
+        fitness = [float('inf')] * n
+        for i, f in zip(order[:k], self.evaluate_population([population[i] for i in order[:k]])):
+            fitness[i] = f
+        stats["exact_evals"] += k
+        stats["screened_iterations"] += 1
+
+        audit = self.screening.audit_every
+        if audit and k < n and stats["screened_iterations"] % audit == 0:
+            rest = order[k:]
+            full = list(fitness)
+            for i, f in zip(rest, self.evaluate_population([population[i] for i in rest])):
+                full[i] = f
+            stats["exact_evals"] += len(rest)
+            stats["audits"] += 1
+            leaders = lambda fit: sorted(range(n), key=lambda i: fit[i])[:3]
+            if leaders(fitness) != leaders(full):
+                stats["leader_changes"] += 1
+            fitness = full
+        return fitness
+
+    def _record_contention(self, jobs):
+        if self.encoding is not None:
+            jobs = {self.encoding.head_of[jid] for jid in jobs}
+        self.contended.update(jobs)
+
+    def update_frozen(self):
+        # Chiều chưa từng cạnh tranh (baseline + các lần decode trong freeze_after vòng
+        # quan sát) được đóng băng cho các vòng còn lại
+        self.frozen = set(self.jobs) - self.contended
+
+    def gap(self) -> float:
+        # Gap của nghiệm tốt nhất hiện tại so với cận dưới (None nếu chưa tính cận)
+        if self.lower_bound is None or self.best_solution is None:
+            return None
+        return optimality_gap(self.best_fitness, self.lower_bound)
+
+    def population_diversity(self) -> float:
+        # Độ phân tán trung bình của quần thể: trung bình độ lệch chuẩn trên từng chiều
+        if not self.population or not self.jobs:
+            return 0.0
+        n = len(self.population)
+        total = 0.0
+        for jid in self.jobs:
+            vals = [X[jid] for X in self.population]
+            mean = sum(vals) / n
+            total += (sum((v - mean) ** 2 for v in vals) / n) ** 0.5
+        return total / len(self.jobs)
+
     # ---------- main loop (Added progress_callback) ----------
-    def solve(self, progress_callback=None) -> Tuple[Dict[int, float], float]:
+    def solve(self, progress_callback=None, cancel_token=None, checkpoint=None) -> Tuple[Dict[int, float], float]:
+        """Chạy GWO từ đầu. checkpoint: CheckpointWriter để ghi trạng thái định kỳ (tùy chọn)."""
+        self._cancel_token = cancel_token
+        self.init()
+        return self._solve_from_state(progress_callback, checkpoint)
+
+    def init(self):
+        self._prepare()
         self.init_population()
+        if self.freeze_after > 0:
+            # Quan sát cả lịch baseline (key phụ thuộc thời gian) để bớt đóng băng nhầm
+            contention = set()
+            copy.deepcopy(self.sch).greedy_schedule(cancel_token=self._cancel_token, contention=contention)
+            self._record_contention(contention)
 
-        X_alpha, X_beta, X_delta = None, None, None
-        
-        for t in range(self.max_iter):
-            self.fitness = [self.evaluate(X) for X in self.population]
+    def best(self) -> Tuple[Dict[int, float], float]:
+        if self.best_solution is None:
+            return None, self.best_fitness
+        return self.full_vector(self.best_solution), self.best_fitness
+
+    def inject(self, vector: Dict[int, float], fitness: float):
+        # Thay con sói tệ nhất (theo lần đánh giá gần nhất) bằng nghiệm nhận được
+        X = self.encoding.reduce(vector) if self.encoding is not None else dict(vector)
+        if self.population:
+            worst = max(range(len(self.fitness)), key=lambda i: self.fitness[i]) if self.fitness else -1
+            self.population[worst] = X
+        if fitness < self.best_fitness:
+            self.best_fitness = fitness
+            self.best_solution = X
+
+    def resume(self, path: str, progress_callback=None, cancel_token=None,
+               checkpoint=None) -> Tuple[Dict[int, float], float]:
+        """Tiếp tục một lần chạy từ file checkpoint; kết quả giống hệt như chạy liền một mạch.
 
-            wolves = sorted(zip(self.population, self.fitness), key=lambda x: x[1])
-            
-            X_alpha = wolves[0][0]
-            X_beta = wolves[1][0]
-            X_delta = wolves[2][0]
+        Scheduler và tham số phải trùng với lần chạy đã ghi checkpoint (kiểm tra bằng config hash).
+        """
+        state = load_checkpoint(path)
+        self._cancel_token = cancel_token
+        self._prepare()
+        self.restore_state(state)
+        return self._solve_from_state(progress_callback, checkpoint)
 
-            self.best_fitness_history.append(wolves[0][1])
+    def _prepare(self):
+        self.cancelled = False
+        self.best_solution = None
+        self.best_fitness = float('inf')
+        self.best_fitness_history = []
+        self.mean_fitness_history = []
+        self.diversity_history = []
+        self.contended = set()
+        self.frozen = set()
+        self.stopped_early = False
+        self.iteration = 0
+        if self.screening is not None:
+            self.screener = Screener(self.sch, self.screening)
+            self.screening_stats = {"screened_iterations": 0, "cheap_evals": 0, "exact_evals": 0,
+                                    "audits": 0, "leader_changes": 0}
+        if self.gap_target is not None and self.lower_bound is None:
+            self.lower_bound = lower_bounds(self.sch).objective
 
-            a = 2 * (1 - t / self.max_iter)
+    def _solve_from_state(self, progress_callback, checkpoint):
+        try:
+            self._run(progress_callback, checkpoint)
+        except SolveCancelled:
+            # Dừng theo yêu cầu: trả về nghiệm tốt nhất đến thời điểm này
+            self.cancelled = True
+            if self.best_solution is None:
+                self.best_solution = self.population[0]
+        finally:
+            self._cancel_token = None
+            if checkpoint is not None:
+                checkpoint.wait()
 
-            new_population = []
+        return self.full_vector(self.best_solution), self.best_fitness
 
-            for i, X in enumerate(self.population):
-                # Giữ nguyên 3 con sói đầu tiên
-                if i < 3 and t == 0: 
-                    new_population.append(X)
-                    continue
+    # ---------- checkpoint ----------
+    def config_hash(self) -> bytes:
+        # Băm instance + tham số ảnh hưởng tới quỹ đạo tìm kiếm
+        payload = {
+            "machines": self.sch.machines, "alpha": self.sch.alpha, "beta": self.sch.beta,
+            "jobs": [[j.id, j.p, j.d, j.w, j.r, list(j.preds)] for j in self.sch.jobs.values()],
+            "machine_ready": sorted(self.sch.machine_ready.items()),
+            "keys": self.jobs, "pop_size": self.pop_size, "max_iter": self.max_iter,
+            "lower": self.lower, "upper": self.upper, "scale_init": self.scale_init,
+            "freeze_after": self.freeze_after,
+            "gap_target": self.gap_target,
+            "screening": asdict(self.screening) if self.screening is not None else None,
+            "init_vector": sorted(self.init_vector.items()) if self.init_vector is not None else None,
+        }
+        return hashlib.sha1(json.dumps(payload, sort_keys=True).encode('utf-8')).digest()
 
-                X_new = {}
-                for jid in self.jobs:
-                    r1, r2 = random.random(), random.random()
-                    A1 = 2 * a * r1 - a 
-                    C1 = 2 * r2         
+    def checkpoint_state(self) -> Dict:
+        """Trạng thái đầy đủ ở ranh giới giữa hai vòng lặp (xem core/checkpoint.py)."""
+        return {
+            "config_hash": self.config_hash(),
+            "iteration": self.iteration,
+            "keys": self.jobs,
+            "population": [[X[jid] for jid in self.jobs] for X in self.population],
+            "best": [self.best_solution[jid] for jid in self.jobs] if self.best_solution is not None else None,
+            "best_fitness": self.best_fitness,
+            "history": [self.best_fitness_history, self.mean_fitness_history, self.diversity_history],
+            "contended": sorted(self.contended),
+            "rng_state": self.rng.getstate(),
+            "meta": {"screening_stats": self.screening_stats},
+        }
 
-                    D_alpha = abs(C1 * X_alpha[jid] - X[jid])
-                    D_beta  = abs(C1 * X_beta[jid]  - X[jid])
-                    D_delta = abs(C1 * X_delta[jid] - X[jid])
+    def restore_state(self, state: Dict):
+        if state["config_hash"] != self.config_hash():
+            raise ValueError("Checkpoint was written for a different instance or GWO configuration")
+        keys = state["keys"]
+        self.iteration = state["iteration"]
+        self.population = [dict(zip(keys, row)) for row in state["population"]]
+        self.best_solution = dict(zip(keys, state["best"])) if state["best"] is not None else None
+        self.best_fitness = state["best_fitness"]
+        self.best_fitness_history, self.mean_fitness_history, self.diversity_history = (
+            list(series) for series in state["history"])
+        self.contended = set(state["contended"])
+        self.rng.setstate(state["rng_state"])
+        if self.screening is not None:
+            self.screening_stats = dict(state["meta"].get("screening_stats", self.screening_stats))
 
-                    X1 = X_alpha[jid] - A1 * D_alpha
-                    X2 = X_beta[jid]  - A1 * D_beta
-                    X3 = X_delta[jid] - A1 * D_delta
+    def _save_checkpoint(self, checkpoint):
+        if checkpoint is not None and checkpoint.due(self.iteration):
+            checkpoint.submit(self.iteration, encode_state(self.checkpoint_state()))
 
-                    val = (X1 + X2 + X3) / 3
+    def _run(self, progress_callback=None, checkpoint=None):
+        for t in range(self.iteration, self.max_iter):
+            if not self.step(t, progress_callback):
+                return
+            self.iteration = t + 1
+            self._save_checkpoint(checkpoint)
 
-                    val = max(self.lower, min(self.upper, val))
-                    X_new[jid] = val
+        # Final evaluation (best_solution giữ nghiệm tốt nhất qua mọi vòng lặp)
+        self.evaluate_population(self.population)
 
-                new_population.append(X_new)
+    def step(self, t: int, progress_callback=None) -> bool:
+        """Một vòng lặp GWO: đánh giá quần thể rồi cập nhật vị trí. Trả về False nếu dừng sớm."""
+        if self.screening_active(t):
+            self.fitness = self.evaluate_screened(self.population)
+        else:
+            self.fitness = self.evaluate_population(self.population)
 
-            self.population = new_population
-            
+        wolves = sorted(zip(self.population, self.fitness), key=lambda x: x[1])
+
+        X_alpha = wolves[0][0]
+        X_beta = wolves[1][0]
+        X_delta = wolves[2][0]
+
+        self.best_fitness_history.append(wolves[0][1])
+        # Sói bị sàng lọc (fitness vô cùng) không tính vào trung bình
+        exact = [f for f in self.fitness if f != float('inf')]
+        self.mean_fitness_history.append(sum(exact) / len(exact))
+        self.diversity_history.append(self.population_diversity())
+
+        if self.gap_target is not None and self.gap() <= self.gap_target:
+            # Đã đủ gần cận dưới: dừng, không cần thêm vòng lặp
+            self.stopped_early = True
             if progress_callback:
-                progress_callback(t + 1, self.max_iter, self.best_fitness_history[-1]) 
+                progress_callback(self.max_iter, self.max_iter, self.best_fitness_history[-1])
+            return False
+
+        a = 2 * (1 - t / self.max_iter)
+        if self.freeze_after > 0 and t + 1 >= self.freeze_after:
+            self.update_frozen()
+        active = [jid for jid in self.jobs if jid not in self.frozen] if self.frozen else self.jobs
+
+        new_population = []
+
+        for i, X in enumerate(self.population):
+            if self._cancel_token is not None:
+                self._cancel_token.check()
+            # Giữ nguyên 3 con sói đầu tiên
+            if i < 3 and t == 0: 
+                new_population.append(X)
+                continue
+
+            # Chiều bị đóng băng giữ nguyên giá trị (không ảnh hưởng lịch decode)
+            X_new = dict(X) if self.frozen else {}
+            for jid in active:
+                r1, r2 = self.rng.random(), self.rng.random()
+                A1 = 2 * a * r1 - a 
+                C1 = 2 * r2         
+
+                D_alpha = abs(C1 * X_alpha[jid] - X[jid])
+                D_beta  = abs(C1 * X_beta[jid]  - X[jid])
+                D_delta = abs(C1 * X_delta[jid] - X[jid])
+
+                X1 = X_alpha[jid] - A1 * D_alpha
+                X2 = X_beta[jid]  - A1 * D_beta
+                X3 = X_delta[jid] - A1 * D_delta
+
+                val = (X1 + X2 + X3) / 3
+
+                val = max(self.lower, min(self.upper, val))
+                X_new[jid] = val
+
+            new_population.append(X_new)
 
-        # Final evaluation
-        final_fitness = [self.evaluate(X) for X in self.population]
-        best_idx = final_fitness.index(min(final_fitness))
-        self.best_solution = self.population[best_idx]
+        self.population = new_population
         
-        return self.best_solution, min(final_fitness)
\ No newline at end of file
+        if progress_callback:
+            progress_callback(t + 1, self.max_iter, self.best_fitness_history[-1]) 
+        return True
@@ -0,0 +1,83 @@
+"""Sinh instance ngẫu nhiên và nạp tập instance (dùng cho tuning / benchmark).
+
+Sinh một instance ra file (trong thư mục Final_Project):
+    python -m core.instances out.json --jobs 200 --machines 8 --seed 1
+"""
+import argparse
+import glob
+import json
+import os
+import random
+from typing import List, Dict, Any, Tuple
+
+
+def generate_instance(n_jobs: int, machines: int, seed: int = 0, pred_prob: float = 0.2,
+                      max_preds: int = 3, window: int = 30, p_range: Tuple[int, int] = (1, 20),
+                      w_range: Tuple[float, float] = (0.5, 5.0), slack: float = 3.0,
+                      alpha: float = 1.0, beta: float = 1.0) -> Dict[str, Any]:
+    """Instance cùng định dạng với Example/*.json.
+
+    Tiền nhiệm được chọn trong `window` job đứng trước nên đồ thị luôn là DAG. Release
+    trải đều trên khoảng tổng tải / m; due date = release + p + slack * p trung bình
+    nhân ngẫu nhiên, nên độ chặt của due date co giãn theo kích thước instance.
+    """
+    if n_jobs < 0 or machines < 1:
+        raise ValueError("n_jobs phải >= 0 và machines phải >= 1")
+    rng = random.Random(seed)
+    ps = [rng.randint(*p_range) for _ in range(n_jobs)]
+    horizon = max(1, int(sum(ps) / machines))
+    p_avg = sum(p_range) / 2
+    jobs = []
+    for i in range(n_jobs):
+        jid = i + 1
+        preds = []
+        if i > 0 and rng.random() < pred_prob:
+            lo = max(1, jid - window)
+            preds = sorted(set(rng.randint(lo, jid - 1) for _ in range(rng.randint(1, max_preds))))
+        r = rng.randint(0, horizon // 2)
+        d = r + ps[i] + int(rng.uniform(0, slack) * p_avg)
+        jobs.append({"id": jid, "p": ps[i], "d": d, "w": round(rng.uniform(*w_range), 1),
+                     "r": r, "preds": preds})
+    return {"machines": machines, "alpha": alpha, "beta": beta, "jobs": jobs}
+
+
+def generated_set(sizes: List[Tuple[int, int]], per_size: int = 2, seed: int = 0) -> List[Tuple[str, Dict[str, Any]]]:
+    # sizes: danh sách (số job, số máy); mỗi kích thước sinh per_size instance
+    out = []
+    for n, m in sizes:
+        for k in range(per_size):
+            s = seed * 1000003 + n * 101 + m * 7 + k
+            out.append((f"gen_n{n}_m{m}_{k}", generate_instance(n, m, seed=s)))
+    return out
+
+
+def load_instances(patterns: List[str]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Nạp các file JSON khớp với các glob pattern; trả về danh sách (tên, dữ liệu)."""
+    out = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if 'jobs' not in data:
+                raise ValueError(f"'{path}' không phải file instance (thiếu 'jobs')")
+            out.append((os.path.splitext(os.path.basename(path))[0], data))
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sinh một instance ngẫu nhiên.")
+    parser.add_argument("output", help="File JSON đầu ra")
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--machines", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pred-prob", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    data = generate_instance(args.jobs, args.machines, seed=args.seed, pred_prob=args.pred_prob)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    print(f"Đã ghi {args.jobs} job, {args.machines} máy vào {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+import heapq
+from typing import List, Dict, Any
+
+from .rules import RuleKey, baseline_key
+from .machine_pool import MachinePool
+
+
+class TimeBucketQueue:
+    """Hàng đợi sự kiện theo mốc thời gian nguyên: mỗi mốc là một bucket.
+
+    Chỉ các mốc thời gian khác nhau nằm trong heap, nên nhiều job release cùng thời
+    điểm chỉ tốn O(1) mỗi job. Cho phép
+    chèn mốc nhỏ hơn mốc đã lấy ra, vì decoder dò release bằng thời điểm hoàn thành
+    tương lai rồi mới quay lại thời điểm rảnh của máy.
+    """
+
+    def __init__(self):
+        self.buckets: Dict[int, List[Any]] = {}
+        self.times: List[int] = []
+
+    def __bool__(self):
+        return bool(self.times)
+
+    def push(self, t: int, item):
+        bucket = self.buckets.get(t)
+        if bucket is None:
+            self.buckets[t] = [item]
+            heapq.heappush(self.times, t)
+        else:
+            bucket.append(item)
+
+    def min_time(self) -> int:
+        return self.times[0]
+
+    def pop_upto(self, t: int):
+        # Lấy ra mọi bucket có mốc <= t theo thứ tự thời gian tăng dần
+        out = []
+        while self.times and self.times[0] <= t:
+            k = heapq.heappop(self.times)
+            out.append((k, self.buckets.pop(k)))
+        return out
+
+
+def greedy_schedule_int(sch, indeg: Dict[int, int], succ: Dict[int, List[int]],
+                        priority_vector: Dict[int, float] = None, cancel_token=None,
+                        progress_callback=None, tracker=None, rule: RuleKey = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Bản thời gian nguyên của Scheduler.greedy_schedule, cho ra đúng cùng lịch trình.
+
+    Giữ nguyên các quy tắc của engine float (dò release tới thời điểm hoàn thành sau
+    mỗi lần giao việc, cập nhật current_time, thứ tự máy (thời điểm, mid)) nhưng so sánh
+    số nguyên trực tiếp thay vì dùng epsilon 1e-6, dùng TimeBucketQueue cho release
+    và MachinePool cho máy rảnh. Với priority_vector, key của job là cố định nên ready
+    heap được cập nhật dần thay vì dựng lại ở mỗi bước; với quy tắc dispatch (key phụ
+    thuộc thời điểm, mặc định baseline) heap chỉ được dựng lại một lần sau mỗi lượt
+    giao việc.
+    """
+    jobs = sch.jobs
+    total = len(jobs)
+    P = {jid: int(job.p) for jid, job in jobs.items()}
+    R = {jid: int(job.r) for jid, job in jobs.items()}
+    static_keys = priority_vector is not None
+    rule = rule or baseline_key
+
+    machines = MachinePool(sch.machines, {m: int(t) for m, t in sch.machine_ready.items()})
+
+    releases = TimeBucketQueue()
+    sched_indeg = indeg.copy()
+    for jid in jobs:
+        if sched_indeg[jid] == 0:
+            releases.push(R[jid], jid)
+
+    preds_completed_at = {jid: 0 for jid in jobs}
+    schedule_dict = {f"M{m}": [] for m in range(1, sch.machines + 1)}
+    remaining = total
+
+    ready_heap = []
+    in_ready = []  # chỉ dùng cho key động (baseline)
+
+    def move_releases(now):
+        for _, bucket in releases.pop_upto(now):
+            if tracker is not None:
+                for jid in bucket:
+                    tracker.entered(jid)
+            if static_keys:
+                for jid in bucket:
+                    heapq.heappush(ready_heap, ((priority_vector.get(jid, 0), jobs[jid].d, jid), jid))
+            else:
+                in_ready.extend(bucket)
+
+    def rebuild(now):
+        # Key của quy tắc dispatch phụ thuộc `now`: tính lại toàn bộ ready heap
+        nonlocal ready_heap
+        if not static_keys:
+            ready_heap = [(rule(jobs[jid], now, preds_completed_at[jid]), jid) for jid in in_ready]
+            heapq.heapify(ready_heap)
+
+    def pop_releases_up_to(now):
+        move_releases(now)
+        rebuild(now)
+
+    current_time = 0
+    pop_releases_up_to(0)
+
+    while remaining:
+        if cancel_token is not None:
+            cancel_token.check()
+
+        if not ready_heap:
+            if not releases:
+                break
+            current_time = max(current_time, releases.min_time())
+            pop_releases_up_to(current_time)
+
+        t_free = machines.earliest()
+        if t_free > current_time and ready_heap:
+            current_time = t_free
+            pop_releases_up_to(current_time)
+
+        # Chỉ lấy đúng số máy sẽ được giao việc (máy giống nhau, gom theo thời điểm rảnh)
+        free_machines = machines.take(current_time, len(ready_heap))
+        k = len(free_machines)
+        ready_count = len(ready_heap)
+        assignments = [heapq.heappop(ready_heap)[1] for _ in range(k)]
+        if tracker is not None:
+            tracker.assigned(ready_count, k, assignments)
+        if not static_keys and assignments:
+            assigned = set(assignments)
+            in_ready = [jid for jid in in_ready if jid not in assigned]
+
+        last_completion = None
+        for (t_free, mid), jid in zip(free_machines, assignments):
+            start_time = max(t_free, R[jid], preds_completed_at[jid])
+            completion_time = start_time + P[jid]
+
+            machine_name = f"M{mid}"
+            schedule_dict[machine_name].append({
+                "job": jid,
+                "machine": machine_name,
+                "start": float(start_time),
+                "end": float(completion_time)
+            })
+
+            machines.release(completion_time, mid)
+            remaining -= 1
+
+            for s in succ.get(jid, []):
+                if completion_time > preds_completed_at[s]:
+                    preds_completed_at[s] = completion_time
+                sched_indeg[s] -= 1
+                if sched_indeg[s] == 0:
+                    releases.push(R[s], s)
+
+            move_releases(completion_time)
+            last_completion = completion_time
+
+        if assignments:
+            # Các lần dựng lại ở giữa không ảnh hưởng vì không có pop nào xen giữa
+            rebuild(last_completion)
+
+        if assignments:
+            earliest_completion = free_machines[0][0] + P[assignments[-1]]
+            current_time = max(current_time, earliest_completion)
+
+        if progress_callback is not None:
+            progress_callback(total - remaining, total)
+
+    return schedule_dict
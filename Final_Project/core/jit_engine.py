@@ -0,0 +1,336 @@
+"""Kernel decode + metrics trên mảng có kiểu, biên dịch bằng Numba nếu có cài.
+
+Kernel tái hiện đúng engine thời gian nguyên (core/int_engine.py) với priority vector:
+cùng thứ tự máy (thời điểm rảnh, mid), cùng key (priority, d, id), cùng cách dò release.
+Quy tắc dispatch, theo dõi cạnh tranh và progress callback vẫn đi đường Python.
+
+Chọn backend: biến môi trường SCHEDULER_DECODER=auto|python|numba (mặc định auto: dùng
+Numba nếu import được) hoặc set_backend(...) lúc khởi động (main_app.py --decoder).
+Numba biên dịch với cache=True nên lần chạy sau nạp mã máy từ __pycache__.
+"""
+import math
+import os
+from typing import Dict, Any, Optional
+
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - tùy môi trường
+    np = None
+    njit = None
+    NUMBA_AVAILABLE = False
+
+BACKENDS = ("auto", "python", "numba")
+_backend = "auto"
+
+# Giới hạn để khóa gộp (thời điểm * cơ số + chỉ số) không tràn int64
+_KEY_LIMIT = 2 ** 62
+
+
+def set_backend(name: str):
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown decoder backend '{name}'")
+    if name == "numba" and not NUMBA_AVAILABLE:
+        raise ValueError("Decoder backend 'numba' requires numpy and numba to be installed")
+    _backend = name
+
+
+def backend() -> str:
+    """Backend thực sự được dùng: 'numba' hoặc 'python'."""
+    if _backend == "python" or (_backend == "auto" and not NUMBA_AVAILABLE):
+        return "python"
+    return "numba"
+
+
+def use_jit() -> bool:
+    return backend() == "numba"
+
+
+# ---------- kernel (Python thuần; được njit khi có Numba) ----------
+def _heap_push(heap, size, key):
+    i = size
+    heap[i] = key
+    while i > 0:
+        parent = (i - 1) >> 1
+        if heap[parent] <= key:
+            break
+        heap[i] = heap[parent]
+        i = parent
+    heap[i] = key
+    return size + 1
+
+
+def _heap_pop(heap, size):
+    top = heap[0]
+    size -= 1
+    last = heap[size]
+    i = 0
+    while True:
+        child = 2 * i + 1
+        if child >= size:
+            break
+        if child + 1 < size and heap[child + 1] < heap[child]:
+            child += 1
+        if last <= heap[child]:
+            break
+        heap[i] = heap[child]
+        i = child
+    if size > 0:
+        heap[i] = last
+    return top, size
+
+
+def _decode_kernel(rank, job_of_rank, P, R, succ_ptr, succ_idx, indeg, machine_ready,
+                   ready, releases, mheap, free_t, assign, preds_done,
+                   start_out, machine_out, order_out):
+    """Decode một priority vector (đã quy về hạng `rank`), ghi start/máy/thứ tự giao việc.
+
+    Trả về số job đã xếp. Khóa heap: máy = t * (m + 1) + mid, release = r * n + job.
+    """
+    n = len(P)
+    m = len(machine_ready)
+    bm = m + 1
+    msize = 0
+    for k in range(m):
+        msize = _heap_push(mheap, msize, machine_ready[k] * bm + (k + 1))
+    rsize = 0
+    for j in range(n):
+        preds_done[j] = 0
+        if indeg[j] == 0:
+            rsize = _heap_push(releases, rsize, R[j] * n + j)
+    qsize = 0
+    done = 0
+
+    current = 0
+    while rsize > 0 and releases[0] // n <= current:
+        key, rsize = _heap_pop(releases, rsize)
+        qsize = _heap_push(ready, qsize, rank[key % n])
+
+    while done < n:
+        if qsize == 0:
+            if rsize == 0:
+                break
+            nxt = releases[0] // n
+            if nxt > current:
+                current = nxt
+            while rsize > 0 and releases[0] // n <= current:
+                key, rsize = _heap_pop(releases, rsize)
+                qsize = _heap_push(ready, qsize, rank[key % n])
+
+        t_free = mheap[0] // bm
+        if t_free > current and qsize > 0:
+            current = t_free
+            while rsize > 0 and releases[0] // n <= current:
+                key, rsize = _heap_pop(releases, rsize)
+                qsize = _heap_push(ready, qsize, rank[key % n])
+
+        # Lấy tối đa qsize máy rảnh tại current, theo thứ tự (thời điểm, mid)
+        cnt = 0
+        while cnt < qsize and msize > 0 and mheap[0] // bm <= current:
+            key, msize = _heap_pop(mheap, msize)
+            free_t[cnt] = key
+            cnt += 1
+        for i in range(cnt):
+            r, qsize = _heap_pop(ready, qsize)
+            assign[i] = job_of_rank[r]
+
+        for i in range(cnt):
+            j = assign[i]
+            t = free_t[i] // bm
+            mid = free_t[i] % bm
+            s = t
+            if R[j] > s:
+                s = R[j]
+            if preds_done[j] > s:
+                s = preds_done[j]
+            c = s + P[j]
+            start_out[j] = s
+            machine_out[j] = mid
+            order_out[done] = j
+            done += 1
+            msize = _heap_push(mheap, msize, c * bm + mid)
+            for e in range(succ_ptr[j], succ_ptr[j + 1]):
+                sj = succ_idx[e]
+                if c > preds_done[sj]:
+                    preds_done[sj] = c
+                indeg[sj] -= 1
+                if indeg[sj] == 0:
+                    rsize = _heap_push(releases, rsize, R[sj] * n + sj)
+            while rsize > 0 and releases[0] // n <= c:
+                key, rsize = _heap_pop(releases, rsize)
+                qsize = _heap_push(ready, qsize, rank[key % n])
+
+        if cnt > 0:
+            earliest = free_t[0] // bm + P[assign[cnt - 1]]
+            if earliest > current:
+                current = earliest
+    return done
+
+
+def _metrics_kernel(start, P, D, W, alpha, beta, out):
+    # Cùng công thức và thứ tự cộng với Scheduler.compute_metrics (theo thứ tự job)
+    n = len(P)
+    makespan = 0.0
+    for j in range(n):
+        c = float(start[j] + P[j])
+        if c > makespan:
+            makespan = c
+    penalty = 0.0
+    max_late = 0
+    for j in range(n):
+        tard = float(start[j] + P[j]) - D[j]
+        if tard > 0:
+            penalty += W[j] * tard
+            late = int(math.ceil(tard))
+            if late > max_late:
+                max_late = late
+    out[0] = makespan
+    out[1] = penalty
+    out[2] = max_late
+    out[3] = alpha * makespan + beta * penalty
+
+
+if NUMBA_AVAILABLE:
+    _heap_push = njit(cache=True)(_heap_push)
+    _heap_pop = njit(cache=True)(_heap_pop)
+    _decode_kernel = njit(cache=True)(_decode_kernel)
+    _metrics_kernel = njit(cache=True)(_metrics_kernel)
+
+
+# ---------- dữ liệu mảng của một instance ----------
+class DecoderArrays:
+    """Mảng có kiểu của một Scheduler (theo thứ tự job trong dict), dựng một lần rồi dùng lại."""
+
+    def __init__(self, sch):
+        self.jobs = sch.jobs
+        self.ids = list(sch.jobs)
+        n = len(self.ids)
+        index = {jid: i for i, jid in enumerate(self.ids)}
+        indeg, succ = sch._precedence_graph()   # kiểm tra tiền nhiệm thiếu / chu trình
+        ptr = [0]
+        flat = []
+        for jid in self.ids:
+            flat.extend(index[s] for s in succ[jid])
+            ptr.append(len(flat))
+        jobs = [sch.jobs[jid] for jid in self.ids]
+        self.machines = sch.machines
+        self.ready_times = tuple(int(sch.machine_ready.get(k, 0)) for k in range(1, sch.machines + 1))
+        self.P = np.array([int(j.p) for j in jobs], dtype=np.int64)
+        self.R = np.array([int(j.r) for j in jobs], dtype=np.int64)
+        self.D = np.array([j.d for j in jobs], dtype=np.float64)
+        self.W = np.array([j.w for j in jobs], dtype=np.float64)
+        self.id_arr = np.array(self.ids, dtype=np.int64)
+        self.succ_ptr = np.array(ptr, dtype=np.int64)
+        self.succ_idx = np.array(flat, dtype=np.int64)
+        self.indeg = np.array([indeg[jid] for jid in self.ids], dtype=np.int64)
+        self.machine_ready = np.array(self.ready_times, dtype=np.int64)
+        self.fits = self.fits_for(self.P, self.R)
+
+    def fits_for(self, P, R) -> bool:
+        # Khóa gộp của kernel không tràn int64 với thời lượng P và release R này?
+        n = len(self.ids)
+        horizon = max(self.ready_times, default=0) + (int(R.max()) + int(P.sum()) if n else 0)
+        return (horizon + 1) * (self.machines + 1) < _KEY_LIMIT and (horizon + 1) * max(1, n) < _KEY_LIMIT
+
+    def matches(self, sch) -> bool:
+        return (sch.jobs is self.jobs and len(sch.jobs) == len(self.ids) and sch.machines == self.machines
+                and tuple(int(sch.machine_ready.get(k, 0)) for k in range(1, sch.machines + 1)) == self.ready_times)
+
+    def ranks(self, priority_vector: Dict[int, float]):
+        # Hạng của job theo key (priority, d, id) của engine int; lexsort lấy khóa cuối làm khóa chính
+        prio = np.array([priority_vector.get(jid, 0) for jid in self.ids], dtype=np.float64)
+        job_of_rank = np.lexsort((self.id_arr, self.D, prio)).astype(np.int64)
+        rank = np.empty(len(self.ids), dtype=np.int64)
+        rank[job_of_rank] = np.arange(len(self.ids), dtype=np.int64)
+        return rank, job_of_rank
+
+    def decode(self, priority_vector: Dict[int, float]):
+        rank, job_of_rank = self.ranks(priority_vector)
+        return self.decode_ranked(rank, job_of_rank, self.P, self.R)
+
+    def decode_ranked(self, rank, job_of_rank, P, R):
+        # Decode với hạng đã tính sẵn và thời lượng / release tùy ý (vd. kịch bản nhiễu)
+        n, m = len(self.ids), self.machines
+        start = np.zeros(n, dtype=np.int64)
+        machine = np.zeros(n, dtype=np.int64)
+        order = np.zeros(n, dtype=np.int64)
+        done = _decode_kernel(rank, job_of_rank, P, R, self.succ_ptr, self.succ_idx, self.indeg.copy(),
+                              self.machine_ready, np.empty(n, np.int64), np.empty(n, np.int64),
+                              np.empty(max(1, m), np.int64), np.empty(max(1, m), np.int64),
+                              np.empty(max(1, m), np.int64), np.empty(n, np.int64), start, machine, order)
+        return start, machine, order, done
+
+
+_cache: Dict[int, DecoderArrays] = {}
+_CACHE_SIZE = 8
+
+
+def arrays_for(sch) -> DecoderArrays:
+    # Cache theo dict jobs (các bản sao nông của Scheduler dùng chung jobs)
+    arrays = _cache.get(id(sch.jobs))
+    if arrays is None or not arrays.matches(sch):
+        if len(_cache) >= _CACHE_SIZE:
+            _cache.pop(next(iter(_cache)))
+        arrays = DecoderArrays(sch)
+        _cache[id(sch.jobs)] = arrays
+    return arrays
+
+
+def supports(sch, priority_vector) -> bool:
+    """Kernel dùng được cho lần decode này? (backend numba, priority vector, thời gian nguyên)."""
+    return use_jit() and priority_vector is not None and sch.machines > 0 and sch.is_integral()
+
+
+def greedy_schedule_jit(sch, priority_vector: Dict[int, float]) -> Optional[Dict[str, Any]]:
+    """Lịch trình giống hệt greedy_schedule_int; None nếu instance vượt giới hạn khóa int64."""
+    arrays = arrays_for(sch)
+    if not arrays.fits:
+        return None
+    start, machine, order, done = arrays.decode(priority_vector)
+    schedule_dict = {f"M{m}": [] for m in range(1, sch.machines + 1)}
+    ids, P = arrays.ids, arrays.P
+    for j in order[:done].tolist():
+        name = f"M{int(machine[j])}"
+        s = int(start[j])
+        schedule_dict[name].append({"job": ids[j], "machine": name, "start": float(s), "end": float(s + int(P[j]))})
+    return schedule_dict
+
+
+def evaluate_jit(sch, priority_vector: Dict[int, float]) -> Optional[Dict[str, Any]]:
+    """Metrics của lịch decode từ priority_vector mà không dựng schedule dict."""
+    arrays = arrays_for(sch)
+    if not arrays.fits:
+        return None
+    start, _, _, done = arrays.decode(priority_vector)
+    if done == 0:
+        return {"makespan": 0, "totalPenalty": 0.0, "maxLateness": 0, "objectiveValue": 0.0}
+    if done < len(arrays.ids):
+        return None
+    out = np.zeros(4, dtype=np.float64)
+    _metrics_kernel(start, arrays.P, arrays.D, arrays.W, float(sch.alpha), float(sch.beta), out)
+    return {
+        "makespan": int(math.ceil(out[0])),
+        "totalPenalty": float(out[1]),
+        "maxLateness": int(out[2]),
+        "objectiveValue": float(out[3])
+    }
+
+
+def warmup():
+    """Biên dịch (hoặc nạp từ cache đĩa) kernel trên một instance nhỏ; gọi ở thread nền."""
+    if not use_jit():
+        return
+    from .scheduler import Scheduler
+    from .job import Job
+    sch = Scheduler(machines=2)
+    for jid in range(1, 4):
+        sch.jobs[jid] = Job(id=jid, p=jid, d=3, w=1.0, preds=[1] if jid == 3 else [])
+    evaluate_jit(sch, {1: 0.0, 2: 1.0, 3: 2.0})
+    greedy_schedule_jit(sch, {1: 0.0, 2: 1.0, 3: 2.0})
+
+
+_env_backend = os.environ.get("SCHEDULER_DECODER", "").strip().lower()
+if _env_backend:
+    set_backend(_env_backend)
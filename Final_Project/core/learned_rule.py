@@ -0,0 +1,263 @@
+"""Quy tắc ưu tiên học được: trọng số tuyến tính trên đặc trưng của job thay vì một priority mỗi job.
+
+priority(j) = sum_k weight_k * feature_k(j), với các đặc trưng tĩnh (p, d, w, r, slack,
+đường găng còn lại, số job kế tiếp, d + p - w) đã chuẩn hóa theo instance (thời gian chia
+cho p trung bình, w chia cho w trung bình) nên cùng một bộ trọng số dùng được cho
+instance khác. GWO tìm trên vector trọng số (số chiều không phụ thuộc số job) qua
+`FeatureEncoding`; `RuleLearner` huấn luyện trên cả một tập instance. Quy tắc đã lưu
+(learned_rule.json) được đăng ký thành quy tắc dispatch "learned" (xem core/portfolio.py).
+
+Chạy (trong thư mục Final_Project):
+    python -m core.learned_rule train "../Example/*.json" --generate --iter 40
+    python -m core.learned_rule apply ../Example/hard_ex.json
+"""
+import argparse
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Tuple
+
+from .scheduler import Scheduler
+from .rules import RuleKey, priority_vector_key
+from .gwo import GWOScheduler
+
+RULE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "learned_rule.json")
+
+FEATURES: Tuple[str, ...] = ("p", "d", "w", "r", "slack", "tail", "succ", "dpw")
+
+
+def job_features(scheduler: Scheduler, features: Tuple[str, ...] = FEATURES) -> Tuple[List[int], List[List[float]]]:
+    """Ma trận đặc trưng theo cột: trả về (danh sách job id, [cột của từng đặc trưng])."""
+    from .portfolio import remaining_tails
+
+    for name in features:
+        if name not in FEATURES:
+            raise ValueError(f"Unknown feature '{name}'")
+    jobs = scheduler.jobs
+    ids = list(jobs)
+    n = max(1, len(ids))
+    p_avg = sum(j.p for j in jobs.values()) / n or 1.0
+    w_avg = sum(j.w for j in jobs.values()) / n or 1.0
+    succ = {jid: 0 for jid in ids}
+    for job in jobs.values():
+        for p in job.preds:
+            if p in succ:
+                succ[p] += 1
+    tails = remaining_tails(scheduler) if "tail" in features else {}
+
+    def column(name):
+        if name == "p":
+            return [jobs[j].p / p_avg for j in ids]
+        if name == "d":
+            return [jobs[j].d / p_avg for j in ids]
+        if name == "w":
+            return [jobs[j].w / w_avg for j in ids]
+        if name == "r":
+            return [jobs[j].r / p_avg for j in ids]
+        if name == "slack":
+            return [(jobs[j].d - jobs[j].r - jobs[j].p) / p_avg for j in ids]
+        if name == "tail":
+            return [tails[j] / p_avg for j in ids]
+        if name == "succ":
+            return [float(succ[j]) for j in ids]
+        return [(jobs[j].d + jobs[j].p - jobs[j].w) / p_avg for j in ids]
+
+    return ids, [column(name) for name in features]
+
+
+def linear_scores(columns: List[List[float]], weights: List[float]) -> List[float]:
+    # Tổ hợp tuyến tính theo cột (mỗi cột một lượt, không duyệt từng job qua từng đặc trưng)
+    scores = [0.0] * (len(columns[0]) if columns else 0)
+    for col, weight in zip(columns, weights):
+        if weight:
+            scores = [s + weight * v for s, v in zip(scores, col)]
+    return scores
+
+
+def least_squares(columns: List[List[float]], target: List[float], ridge: float = 1e-9) -> List[float]:
+    """Trọng số x nhỏ nhất ||A x - y||^2 (+ ridge nhỏ để các đặc trưng phụ thuộc tuyến tính vẫn giải được)."""
+    k = len(columns)
+    A = [[sum(a * b for a, b in zip(columns[i], columns[j])) for j in range(k)] for i in range(k)]
+    b = [sum(a * y for a, y in zip(columns[i], target)) for i in range(k)]
+    scale = max((A[i][i] for i in range(k)), default=1.0) or 1.0
+    for i in range(k):
+        A[i][i] += ridge * scale
+    # Khử Gauss có chọn phần tử trội
+    for c in range(k):
+        pivot = max(range(c, k), key=lambda r: abs(A[r][c]))
+        A[c], A[pivot] = A[pivot], A[c]
+        b[c], b[pivot] = b[pivot], b[c]
+        if A[c][c] == 0:
+            continue
+        for r in range(c + 1, k):
+            f = A[r][c] / A[c][c]
+            if f:
+                A[r] = [x - f * y for x, y in zip(A[r], A[c])]
+                b[r] -= f * b[c]
+    x = [0.0] * k
+    for c in reversed(range(k)):
+        if A[c][c] != 0:
+            x[c] = (b[c] - sum(A[c][j] * x[j] for j in range(c + 1, k))) / A[c][c]
+    return x
+
+
+def normalize_weights(weights: List[float]) -> List[float]:
+    # Nhân với hằng số dương không đổi thứ tự ưu tiên: đưa về max |w| = 1 (nằm trong [-1, 1])
+    top = max((abs(w) for w in weights), default=0.0)
+    return [w / top for w in weights] if top > 0 else list(weights)
+
+
+@dataclass
+class LinearRule:
+    weights: Dict[str, float]
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        for name in self.weights:
+            if name not in FEATURES:
+                raise ValueError(f"Unknown feature '{name}'")
+
+    @property
+    def features(self) -> Tuple[str, ...]:
+        return tuple(self.weights)
+
+    def priority_vector(self, scheduler: Scheduler) -> Dict[int, float]:
+        ids, columns = job_features(scheduler, self.features)
+        return dict(zip(ids, linear_scores(columns, list(self.weights.values()))))
+
+    def key_for(self, scheduler: Scheduler) -> RuleKey:
+        # Dùng như quy tắc dispatch: greedy_schedule(rule=rule.key_for(sch))
+        return priority_vector_key(self.priority_vector(scheduler))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"weights": dict(self.weights), "meta": dict(self.meta)}
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> 'LinearRule':
+        return LinearRule(weights={k: float(v) for k, v in d['weights'].items()}, meta=dict(d.get('meta', {})))
+
+    def save(self, path: str = RULE_PATH):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+
+
+def load_rule(path: str = RULE_PATH) -> LinearRule:
+    with open(path, 'r', encoding='utf-8') as f:
+        return LinearRule.from_dict(json.load(f))
+
+
+class FeatureEncoding:
+    """Encoding cho GWOScheduler: mỗi chiều là trọng số của một đặc trưng (key = chỉ số đặc trưng).
+
+    `expand` tính priority vector của mọi job từ trọng số; `reduce` chiếu một priority
+    vector (vd. heuristic d + p - w) về trọng số gần nhất theo bình phương tối thiểu.
+    Không có ánh xạ job -> chiều nên không dùng được với freeze_after.
+    """
+
+    def __init__(self, scheduler: Scheduler, features: Tuple[str, ...] = FEATURES):
+        self.features = tuple(features)
+        self.ids, self.columns = job_features(scheduler, self.features)
+        self.keys: List[int] = list(range(len(self.features)))
+
+    @property
+    def dimension(self) -> int:
+        return len(self.keys)
+
+    def weights(self, vector: Dict[int, float]) -> List[float]:
+        return [vector[k] for k in self.keys]
+
+    def rule(self, vector: Dict[int, float], **meta) -> LinearRule:
+        return LinearRule(dict(zip(self.features, self.weights(vector))), meta)
+
+    def reduce(self, vector: Dict[int, float]) -> Dict[int, float]:
+        target = [vector[jid] for jid in self.ids]
+        return dict(zip(self.keys, normalize_weights(least_squares(self.columns, target))))
+
+    def expand(self, vector: Dict[int, float]) -> Dict[int, float]:
+        return dict(zip(self.ids, linear_scores(self.columns, self.weights(vector))))
+
+
+class RuleLearner(GWOScheduler):
+    """GWO trên trọng số đặc trưng, fitness là trung bình trên một tập instance.
+
+    Fitness của một bộ trọng số = trung bình (objective + 1) / (objective baseline + 1)
+    trên các instance, nên instance lớn không lấn át instance nhỏ; < 1 là tốt hơn baseline.
+    """
+
+    def __init__(self, schedulers: List[Scheduler], features: Tuple[str, ...] = FEATURES, **kwargs):
+        if not schedulers:
+            raise ValueError("RuleLearner cần ít nhất một instance")
+        if kwargs.get('freeze_after') or kwargs.get('gap_target') is not None or kwargs.get('screening'):
+            raise ValueError("freeze_after, gap_target và screening không áp dụng cho RuleLearner")
+        self.encodings = [FeatureEncoding(sch, features) for sch in schedulers]
+        super().__init__(schedulers[0], encoding=self.encodings[0], **kwargs)
+        self.schedulers = schedulers
+        self.reference = [sch.evaluate()['objectiveValue'] for sch in schedulers]
+
+    def evaluate(self, X: Dict[int, float]):
+        self.evaluations += 1
+        total = 0.0
+        for sch, enc, ref in zip(self.schedulers, self.encodings, self.reference):
+            obj = sch.evaluate(enc.expand(X), cancel_token=self._cancel_token)['objectiveValue']
+            total += (obj + 1.0) / (ref + 1.0)
+        return total / len(self.schedulers)
+
+    def learned_rule(self) -> LinearRule:
+        if self.best_solution is None:
+            raise ValueError("Chưa chạy solve()")
+        return self.encoding.rule(self.best_solution, fitness=self.best_fitness, instances=len(self.schedulers))
+
+
+def main(argv=None):
+    from .instances import generated_set, load_instances
+
+    parser = argparse.ArgumentParser(description="Học quy tắc ưu tiên tuyến tính hoặc áp dụng quy tắc đã lưu.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    train = sub.add_parser("train")
+    train.add_argument("patterns", nargs="*", help="Glob các file instance JSON")
+    train.add_argument("--generate", action="store_true", help="Thêm các instance sinh ngẫu nhiên")
+    train.add_argument("--pop", type=int, default=20)
+    train.add_argument("--iter", type=int, default=40)
+    train.add_argument("--seed", type=int, default=0)
+    train.add_argument("-o", "--output", default=RULE_PATH)
+    apply = sub.add_parser("apply")
+    apply.add_argument("input", help="File instance JSON")
+    apply.add_argument("--rule", default=RULE_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "apply":
+        rule = load_rule(args.rule)
+        with open(args.input, 'r', encoding='utf-8') as f:
+            sch = Scheduler.from_dict(json.load(f))
+        baseline = sch.evaluate()['objectiveValue']
+        start = time.time()
+        learned = sch.evaluate(rule.priority_vector(sch))['objectiveValue']
+        print(f"baseline={baseline:.2f} learned={learned:.2f} ({time.time() - start:.4f}s)")
+        return
+
+    instances = load_instances(args.patterns)
+    if args.generate:
+        instances += generated_set([(20, 3), (60, 5), (200, 8)])
+    if not instances:
+        parser.error("Không có instance nào")
+    schedulers = [Scheduler.from_dict(data) for _, data in instances]
+    learner = RuleLearner(schedulers, pop_size=args.pop, max_iter=args.iter, seed=args.seed)
+
+    def report(t, max_t, fitness):
+        print(f"iter {t}/{max_t} fitness={learner.best_fitness:.4f}", flush=True)
+
+    learner.solve(progress_callback=report)
+    rule = learner.learned_rule()
+    rule.save(args.output)
+    for (name, _), sch, enc, ref in zip(instances, schedulers, learner.encodings, learner.reference):
+        obj = sch.evaluate(enc.expand(learner.best_solution))['objectiveValue']
+        print(f"{name:24s} baseline={ref:.2f} learned={obj:.2f}")
+    print("Trọng số: " + ", ".join(f"{k}={v:+.3f}" for k, v in rule.weights.items()))
+    print(f"Đã ghi quy tắc vào {args.output}")
+
+
+if __name__ == '__main__':
+    main()
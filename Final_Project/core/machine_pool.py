@@ -0,0 +1,56 @@
+import heapq
+from typing import List, Dict, Tuple
+
+
+class MachinePool:
+    """Tập máy song song giống hệt nhau, gom theo thời điểm rảnh.
+
+    Mỗi thời điểm rảnh là một nhóm (heap các machine id), nên khi hàng trăm máy rảnh
+    cùng lúc chỉ có một phần tử trong heap thời gian. `take` lấy một lô máy theo thứ tự
+    (thời điểm rảnh, mid) - đúng thứ tự của heap (time_free, mid) cũ - và chỉ chạm vào
+    số máy thực sự được giao việc, các máy còn lại giữ nguyên trong nhóm.
+    """
+
+    def __init__(self, machines: int, machine_ready: Dict[int, float] = None):
+        self.groups: Dict[float, List[int]] = {}
+        self.times: List[float] = []
+        machine_ready = machine_ready or {}
+        for m in range(1, machines + 1):
+            self.release(machine_ready.get(m, 0), m)
+
+    def __len__(self):
+        return sum(len(mids) for mids in self.groups.values())
+
+    def release(self, t: float, mid: int):
+        # Máy mid rảnh từ thời điểm t
+        mids = self.groups.get(t)
+        if mids is None:
+            self.groups[t] = [mid]
+            heapq.heappush(self.times, t)
+        else:
+            heapq.heappush(mids, mid)
+
+    def earliest(self) -> float:
+        return self.times[0]
+
+    def counts(self) -> List[Tuple[float, int]]:
+        """Số máy rảnh ở mỗi thời điểm, theo thời gian tăng dần."""
+        return [(t, len(self.groups[t])) for t in sorted(self.times)]
+
+    def take(self, limit: float, k: int) -> List[Tuple[float, int]]:
+        """Lấy tối đa k máy rảnh trước hoặc tại limit, theo thứ tự (thời điểm rảnh, mid)."""
+        out = []
+        while k > 0 and self.times and self.times[0] <= limit:
+            t = self.times[0]
+            mids = self.groups[t]
+            if len(mids) <= k:
+                # Lấy cả nhóm một lần
+                heapq.heappop(self.times)
+                del self.groups[t]
+                mids.sort()
+                out.extend((t, mid) for mid in mids)
+                k -= len(mids)
+            else:
+                out.extend((t, heapq.heappop(mids)) for _ in range(k))
+                k = 0
+        return out
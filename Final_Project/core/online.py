@@ -0,0 +1,215 @@
+"""Dispatcher trực tuyến (event-driven) cho job đến theo luồng.
+
+Chạy replay một file instance (trong thư mục Final_Project):
+    python -m core.online Example/hard_ex.json
+"""
+import argparse
+import copy
+import heapq
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional
+
+from .job import Job
+from .scheduler import Scheduler, topological_order
+from .rules import RuleKey, baseline_key, priority_vector_key
+
+
+@dataclass
+class Assignment:
+    job: int
+    machine: int
+    start: float
+    end: float
+
+
+class OnlineDispatcher:
+    """Xếp lịch trực tuyến: job được submit dần, máy báo rảnh dần.
+
+    Mỗi sự kiện (submit, machine_free, next_assignment) tốn O(log n). Key ưu tiên của
+    job được tính một lần khi job vào hàng đợi ready, nên các quy tắc phụ thuộc thời
+    gian (như baseline_key) dùng thời điểm job sẵn sàng thay vì tính lại ở mọi bước
+    như greedy_schedule offline.
+
+    Chỉ id và thời điểm xong của job đã hoàn thành được giữ lại (`completed`), tối đa
+    `max_completed` job xong gần nhất (cũ nhất bị bỏ trước), nên bộ nhớ cho job đã xong
+    có giới hạn. Job có tiền nhiệm không đang chạy và không nằm trong `completed` (chưa
+    từng submit, hoặc xong đã lâu hơn max_completed lần hoàn thành) phải chờ đến khi
+    tiền nhiệm đó được submit và chạy xong; `unknown_preds` liệt kê các tiền nhiệm đang
+    được chờ như vậy. Vì vậy job kế tiếp phải được submit trước khi bản ghi của tiền
+    nhiệm bị bỏ (`evicted` đếm số bản ghi đã bỏ).
+    """
+
+    def __init__(self, machines: int, rule: RuleKey = None, max_completed: int = 100_000):
+        if max_completed < 1:
+            raise ValueError("max_completed phải >= 1")
+        self.machines = machines
+        self.max_completed = max_completed
+        self.evicted = 0
+        self.rule = rule or baseline_key
+        self.now = 0.0
+        self.free_heap = [(0.0, m) for m in range(1, machines + 1)]  # (thời điểm rảnh, mid)
+        heapq.heapify(self.free_heap)
+        self.running: Dict[int, Assignment] = {}   # mid -> assignment đang chạy
+        self.jobs: Dict[int, Job] = {}             # job đã submit nhưng chưa xong
+        self.completed: Dict[int, float] = OrderedDict()  # job đã xong -> thời điểm xong (theo thứ tự xong)
+        self.waiting: Dict[int, int] = {}          # jid -> số tiền nhiệm chưa xong
+        self.succ: Dict[int, List[int]] = {}       # tiền nhiệm chưa xong (kể cả chưa submit) -> job chờ
+        self.pred_done: Dict[int, float] = {}
+        self.release_heap = []                     # (r, jid)
+        self.ready_heap = []                       # (key, jid)
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def unknown_preds(self) -> List[int]:
+        # Tiền nhiệm được job đã submit tham chiếu nhưng chính nó chưa được submit
+        return [p for p in self.succ if p not in self.jobs]
+
+    def submit(self, job: Job, t: float = None):
+        if job.id in self.jobs or job.id in self.completed:
+            raise ValueError(f"Job {job.id} already submitted")
+        if t is not None:
+            self.now = max(self.now, t)
+        self.jobs[job.id] = job
+        self.pred_done[job.id] = max((self.completed[p] for p in job.preds if p in self.completed), default=0)
+        # Tiền nhiệm chưa xong, kể cả chưa từng submit: job chờ đến khi tất cả chạy xong
+        pending_preds = [p for p in job.preds if p not in self.completed]
+        if pending_preds:
+            self.waiting[job.id] = len(pending_preds)
+            for p in pending_preds:
+                self.succ.setdefault(p, []).append(job.id)
+        else:
+            heapq.heappush(self.release_heap, (job.r, job.id))
+
+    def machine_free(self, mid: int, t: float):
+        """Máy mid báo rảnh tại t; job đang chạy trên máy được coi là xong."""
+        assignment = self.running.pop(mid, None)
+        if assignment is None:
+            raise ValueError(f"Machine {mid} has no running job")
+        self.now = max(self.now, t)
+        heapq.heappush(self.free_heap, (t, mid))
+        jid = assignment.job
+        del self.jobs[jid]
+        self.completed[jid] = t
+        if len(self.completed) > self.max_completed:
+            self.completed.popitem(last=False)
+            self.evicted += 1
+        for s in self.succ.pop(jid, []):
+            self.pred_done[s] = max(self.pred_done[s], t)
+            self.waiting[s] -= 1
+            if self.waiting[s] == 0:
+                del self.waiting[s]
+                heapq.heappush(self.release_heap, (self.jobs[s].r, s))
+
+    def _release_up_to(self, t: float):
+        while self.release_heap and self.release_heap[0][0] <= t:
+            _, jid = heapq.heappop(self.release_heap)
+            key = self.rule(self.jobs[jid], t, self.pred_done[jid])
+            heapq.heappush(self.ready_heap, (key, jid))
+
+    def next_release_time(self) -> Optional[float]:
+        return self.release_heap[0][0] if self.release_heap else None
+
+    def next_assignment(self, t: float) -> Optional[Assignment]:
+        """Giao job ưu tiên nhất cho máy rảnh sớm nhất tại thời điểm t (None nếu không có)."""
+        self.now = max(self.now, t)
+        self._release_up_to(t)
+        if not self.ready_heap or not self.free_heap or self.free_heap[0][0] > t:
+            return None
+        _, mid = heapq.heappop(self.free_heap)
+        _, jid = heapq.heappop(self.ready_heap)
+        job = self.jobs[jid]
+        start = max(t, job.r, self.pred_done.pop(jid))
+        assignment = Assignment(job=jid, machine=mid, start=float(start), end=float(start + job.p))
+        self.running[mid] = assignment
+        return assignment
+
+
+def replay_instance(scheduler: Scheduler, priority_vector: Dict[int, float] = None,
+                    rule: RuleKey = None) -> Dict[str, Any]:
+    """Phát lại instance như một luồng sự kiện theo thời gian qua OnlineDispatcher.
+
+    Job đến tại thời điểm release (nhưng không sớm hơn các tiền nhiệm của nó), máy báo
+    rảnh đúng lúc job hoàn thành. Kết quả được so sánh với greedy_schedule offline.
+    """
+    if priority_vector is not None:
+        rule = priority_vector_key(priority_vector)
+    dispatcher = OnlineDispatcher(scheduler.machines, rule)
+
+    arrival: Dict[int, float] = {}
+    events = []  # (time, kind, seq, payload); kind 0 = máy rảnh, 1 = job đến
+    seq = 0
+    for jid in topological_order(scheduler):
+        job = scheduler.jobs[jid]
+        arrival[jid] = max([job.r] + [arrival[p] for p in job.preds])
+        events.append((arrival[jid], 1, seq, jid))
+        seq += 1
+    heapq.heapify(events)
+
+    schedule = {f"M{m}": [] for m in range(1, scheduler.machines + 1)}
+    start_time = time.time()
+    num_events = 0
+    while events or len(dispatcher):
+        candidates = [e[0] for e in events[:1]]
+        next_r = dispatcher.next_release_time()
+        if next_r is not None and next_r > dispatcher.now:
+            candidates.append(next_r)
+        if not candidates:
+            break
+        t = min(candidates)
+        while events and events[0][0] <= t:
+            _, kind, _, payload = heapq.heappop(events)
+            num_events += 1
+            if kind == 0:
+                dispatcher.machine_free(payload, t)
+            else:
+                dispatcher.submit(scheduler.jobs[payload], t)
+        while True:
+            a = dispatcher.next_assignment(t)
+            if a is None:
+                break
+            num_events += 1
+            schedule[f"M{a.machine}"].append({"job": a.job, "machine": f"M{a.machine}",
+                                              "start": a.start, "end": a.end})
+            heapq.heappush(events, (a.end, 0, seq, a.machine))
+            seq += 1
+    online_time = time.time() - start_time
+
+    online_sch = copy.copy(scheduler)
+    online_sch.schedule = schedule
+    online_metrics = online_sch.compute_metrics()
+
+    offline_sch = copy.deepcopy(scheduler)
+    start_time = time.time()
+    offline_sch.greedy_schedule(priority_vector=priority_vector)
+    offline_time = time.time() - start_time
+    offline_metrics = offline_sch.compute_metrics()
+
+    return {
+        "schedule": schedule,
+        "online": dict(online_metrics, executionTime=online_time),
+        "offline": dict(offline_metrics, executionTime=offline_time),
+        "events": num_events,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay một instance qua OnlineDispatcher và so sánh với greedy offline.")
+    parser.add_argument("input", help="File instance JSON")
+    args = parser.parse_args(argv)
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        sch = Scheduler.from_dict(json.load(f))
+    result = replay_instance(sch)
+    print(f"Sự kiện: {result['events']}")
+    for name in ("online", "offline"):
+        m = result[name]
+        print(f"{name:8s} objective={m['objectiveValue']:.2f} makespan={m['makespan']} "
+              f"penalty={m['totalPenalty']:.2f} time={m['executionTime']:.4f}s")
+
+
+if __name__ == '__main__':
+    main()
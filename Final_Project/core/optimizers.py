@@ -0,0 +1,397 @@
+"""Các engine tối ưu dùng chung decoder và portfolio chạy song song nhiều engine.
+
+Chạy portfolio engine cho một file instance (trong thư mục Final_Project):
+    python -m core.optimizers Example/hard_ex.json --time 30
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import List, Dict, Any, Callable, Tuple
+
+from .scheduler import Scheduler
+from .engine import Optimizer
+from .gwo import GWOScheduler, scale_to_bounds
+
+
+class RandomKeyGA(Optimizer):
+    """GA khóa ngẫu nhiên: chọn lọc tournament, lai đồng nhất thiên về cha tốt, đột biến reset."""
+
+    name = "ga"
+
+    def __init__(self, scheduler: Scheduler, seed=None, init_vector: Dict[int, float] = None,
+                 pop_size: int = 20, elite: int = 2, tournament: int = 3, bias: float = 0.7,
+                 mutation_rate: float = 0.05, lower: float = -1.0, upper: float = 1.0):
+        super().__init__(scheduler, seed=seed, init_vector=init_vector)
+        self.jobs = list(scheduler.jobs)
+        self.pop_size = max(2, pop_size)
+        self.elite = min(elite, self.pop_size - 1)
+        self.tournament = tournament
+        self.bias = bias
+        self.mutation_rate = mutation_rate
+        self.lower = lower
+        self.upper = upper
+        self.population: List[Dict[int, float]] = []
+        self.fitness: List[float] = []
+
+    def _random(self) -> Dict[int, float]:
+        return {jid: self.rng.uniform(self.lower, self.upper) for jid in self.jobs}
+
+    def init(self):
+        base = scale_to_bounds(self.heuristic_vector(), self.lower, self.upper)
+        self.population = [base] + [self._random() for _ in range(self.pop_size - 1)]
+        self.fitness = [self.evaluate(x) for x in self.population]
+
+    def _pick(self) -> int:
+        contenders = [self.rng.randrange(self.pop_size) for _ in range(self.tournament)]
+        return min(contenders, key=lambda i: self.fitness[i])
+
+    def step(self, t: int) -> bool:
+        order = sorted(range(self.pop_size), key=lambda i: self.fitness[i])
+        new_pop = [self.population[i] for i in order[:self.elite]]
+        new_fit = [self.fitness[i] for i in order[:self.elite]]
+        while len(new_pop) < self.pop_size:
+            a, b = self._pick(), self._pick()
+            if self.fitness[b] < self.fitness[a]:
+                a, b = b, a
+            good, other = self.population[a], self.population[b]
+            child = {}
+            for jid in self.jobs:
+                if self.rng.random() < self.mutation_rate:
+                    child[jid] = self.rng.uniform(self.lower, self.upper)
+                else:
+                    child[jid] = good[jid] if self.rng.random() < self.bias else other[jid]
+            new_pop.append(child)
+            new_fit.append(self.evaluate(child))
+        self.population, self.fitness = new_pop, new_fit
+        self.best_fitness_history.append(self.best_fitness)
+        return True
+
+    def inject(self, vector: Dict[int, float], fitness: float):
+        super().inject(vector, fitness)
+        worst = max(range(len(self.fitness)), key=lambda i: self.fitness[i])
+        self.population[worst] = dict(vector)
+        self.fitness[worst] = fitness
+
+
+class ParticleSwarm(Optimizer):
+    """PSO chuẩn với trọng số quán tính, giới hạn vận tốc và vị trí trong [lower, upper]."""
+
+    name = "pso"
+
+    def __init__(self, scheduler: Scheduler, seed=None, init_vector: Dict[int, float] = None,
+                 pop_size: int = 20, inertia: float = 0.7, c1: float = 1.5, c2: float = 1.5,
+                 vmax: float = 0.2, lower: float = -1.0, upper: float = 1.0):
+        super().__init__(scheduler, seed=seed, init_vector=init_vector)
+        self.jobs = list(scheduler.jobs)
+        self.pop_size = pop_size
+        self.inertia = inertia
+        self.c1 = c1
+        self.c2 = c2
+        self.vmax = vmax * (upper - lower)
+        self.lower = lower
+        self.upper = upper
+        self.positions: List[Dict[int, float]] = []
+        self.velocities: List[Dict[int, float]] = []
+        self.personal: List[Tuple[Dict[int, float], float]] = []
+
+    def init(self):
+        base = scale_to_bounds(self.heuristic_vector(), self.lower, self.upper)
+        self.positions = [base] + [{jid: self.rng.uniform(self.lower, self.upper) for jid in self.jobs}
+                                   for _ in range(self.pop_size - 1)]
+        self.velocities = [{jid: 0.0 for jid in self.jobs} for _ in range(self.pop_size)]
+        self.personal = [(x, self.evaluate(x)) for x in self.positions]
+
+    def step(self, t: int) -> bool:
+        g = self.best_solution
+        for i, (x, v) in enumerate(zip(self.positions, self.velocities)):
+            p_best = self.personal[i][0]
+            new_x = {}
+            for jid in self.jobs:
+                vel = (self.inertia * v[jid] + self.c1 * self.rng.random() * (p_best[jid] - x[jid])
+                       + self.c2 * self.rng.random() * (g[jid] - x[jid]))
+                vel = max(-self.vmax, min(self.vmax, vel))
+                v[jid] = vel
+                new_x[jid] = max(self.lower, min(self.upper, x[jid] + vel))
+            self.positions[i] = new_x
+            f = self.evaluate(new_x)
+            if f < self.personal[i][1]:
+                self.personal[i] = (new_x, f)
+        self.best_fitness_history.append(self.best_fitness)
+        return True
+
+
+def order_vector(order: List[int]) -> Dict[int, float]:
+    # Thứ tự dispatch -> priority vector (vị trí nhỏ hơn được ưu tiên trước)
+    return {jid: float(pos) for pos, jid in enumerate(order)}
+
+
+def vector_order(vector: Dict[int, float]) -> List[int]:
+    return sorted(vector, key=lambda jid: (vector[jid], jid))
+
+
+class SimulatedAnnealing(Optimizer):
+    """SA trên thứ tự dispatch: láng giềng là đổi chỗ hoặc chèn một job, làm nguội hình học.
+
+    Nhiệt độ đầu lấy từ độ lệch trung bình của các bước thử ngẫu nhiên; nhiệt độ cuối
+    bằng final_ratio lần nhiệt độ đầu ở vòng max_iter.
+    """
+
+    name = "sa"
+
+    def __init__(self, scheduler: Scheduler, seed=None, init_vector: Dict[int, float] = None,
+                 moves_per_step: int = 20, final_ratio: float = 1e-3, sample_moves: int = 10):
+        super().__init__(scheduler, seed=seed, init_vector=init_vector)
+        self.moves_per_step = moves_per_step
+        self.final_ratio = final_ratio
+        self.sample_moves = sample_moves
+        self.order: List[int] = []
+        self.current = float('inf')
+        self.temperature = 0.0
+        self.cooling = 1.0
+
+    def _neighbor(self, order: List[int]) -> List[int]:
+        new = list(order)
+        i, j = self.rng.randrange(len(new)), self.rng.randrange(len(new))
+        if self.rng.random() < 0.5:
+            new[i], new[j] = new[j], new[i]
+        else:
+            new.insert(j, new.pop(i))
+        return new
+
+    def init(self):
+        self.order = vector_order(self.heuristic_vector())
+        self.current = self.evaluate(order_vector(self.order))
+        deltas = []
+        if len(self.order) > 1:
+            for _ in range(self.sample_moves):
+                deltas.append(abs(self.evaluate(order_vector(self._neighbor(self.order))) - self.current))
+        self.temperature = (sum(deltas) / len(deltas) if deltas else 0.0) or 1.0
+        self.cooling = self.final_ratio ** (1.0 / max(1, self.max_iter))
+
+    def step(self, t: int) -> bool:
+        if len(self.order) > 1:
+            for _ in range(self.moves_per_step):
+                cand = self._neighbor(self.order)
+                f = self.evaluate(order_vector(cand))
+                delta = f - self.current
+                if delta <= 0 or self.rng.random() < math.exp(-delta / self.temperature):
+                    self.order, self.current = cand, f
+        self.temperature *= self.cooling
+        self.best_fitness_history.append(self.best_fitness)
+        return True
+
+    def inject(self, vector: Dict[int, float], fitness: float):
+        super().inject(vector, fitness)
+        if fitness < self.current:
+            self.order, self.current = vector_order(vector), fitness
+
+
+class IteratedGreedy(Optimizer):
+    """Iterated greedy trên thứ tự dispatch (kiểu Ruiz & Stützle).
+
+    Mỗi vòng gỡ `destroy` job ngẫu nhiên rồi chèn lại lần lượt vào vị trí tốt nhất trong
+    `positions` vị trí thử (lấy mẫu để giới hạn số lần decode). Chấp nhận nghiệm tệ hơn
+    với nhiệt độ hằng tỉ lệ với objective hiện tại.
+    """
+
+    name = "ig"
+
+    def __init__(self, scheduler: Scheduler, seed=None, init_vector: Dict[int, float] = None,
+                 destroy: int = 4, positions: int = 5, temperature: float = 0.01):
+        super().__init__(scheduler, seed=seed, init_vector=init_vector)
+        self.destroy = destroy
+        self.positions = positions
+        self.temperature = temperature
+        self.order: List[int] = []
+        self.current = float('inf')
+
+    def init(self):
+        self.order = vector_order(self.heuristic_vector())
+        self.current = self.evaluate(order_vector(self.order))
+
+    def step(self, t: int) -> bool:
+        n = len(self.order)
+        if n > 1:
+            partial = list(self.order)
+            removed = [partial.pop(self.rng.randrange(len(partial))) for _ in range(min(self.destroy, n - 1))]
+            for jid in removed:
+                slots = range(len(partial) + 1)
+                if len(slots) > self.positions:
+                    slots = self.rng.sample(slots, self.positions)
+                best_slot, best_f = None, float('inf')
+                for s in slots:
+                    # Decode thứ tự một phần: job chưa chèn lại nằm cuối theo thứ tự gỡ
+                    trial = partial[:s] + [jid] + partial[s:]
+                    f = self.evaluate(order_vector(trial + [r for r in removed if r not in trial]))
+                    if f < best_f:
+                        best_slot, best_f = s, f
+                partial.insert(best_slot, jid)
+            f = best_f
+            threshold = self.temperature * abs(self.current)
+            if f <= self.current or self.rng.random() < math.exp(-(f - self.current) / max(threshold, 1e-9)):
+                self.order, self.current = partial, f
+        self.best_fitness_history.append(self.best_fitness)
+        return True
+
+    def inject(self, vector: Dict[int, float], fitness: float):
+        super().inject(vector, fitness)
+        if fitness < self.current:
+            self.order, self.current = vector_order(vector), fitness
+
+
+# ---------- registry ----------
+@dataclass(frozen=True)
+class Engine:
+    name: str
+    label: str
+    build: Callable[..., Optimizer]   # build(scheduler, seed=..., init_vector=..., **params)
+
+
+ENGINES: Dict[str, Engine] = {}
+
+
+def register_engine(engine: Engine) -> Engine:
+    ENGINES[engine.name] = engine
+    return engine
+
+
+register_engine(Engine("gwo", "Grey Wolf Optimizer", GWOScheduler))
+register_engine(Engine("ga", "GA khóa ngẫu nhiên", RandomKeyGA))
+register_engine(Engine("pso", "Particle Swarm", ParticleSwarm))
+register_engine(Engine("sa", "Simulated Annealing (thứ tự)", SimulatedAnnealing))
+register_engine(Engine("ig", "Iterated Greedy", IteratedGreedy))
+
+
+def get_engine(name: str) -> Engine:
+    if name not in ENGINES:
+        raise ValueError(f"Unknown optimizer engine '{name}'")
+    return ENGINES[name]
+
+
+def build_optimizer(scheduler: Scheduler, name: str, seed=None, init_vector: Dict[int, float] = None,
+                    **params) -> Optimizer:
+    return get_engine(name).build(scheduler, seed=seed, init_vector=init_vector, **params)
+
+
+# ---------- portfolio song song ----------
+# Trạng thái dùng chung trong process con (gán bởi _init_shared)
+_shared: Dict[str, Any] = {}
+
+
+def _init_shared(fitness, vector, lock, stop):
+    _shared.update(fitness=fitness, vector=vector, lock=lock, stop=stop)
+
+
+def _exchange(opt: Optimizer, ids: List[int], every: int, target) -> bool:
+    # Đồng bộ incumbent với các engine khác mỗi `every` vòng; False = dừng
+    shared = _shared
+    if shared['stop'].is_set():
+        return False
+    if len(opt.best_fitness_history) % every:
+        return True
+    vector, fitness = opt.best()
+    with shared['lock']:
+        if vector is not None and fitness < shared['fitness'].value:
+            shared['fitness'].value = fitness
+            shared['vector'][:] = [vector[jid] for jid in ids]
+        elif shared['fitness'].value < fitness:
+            incumbent = dict(zip(ids, shared['vector'][:]))
+            opt.inject(incumbent, shared['fitness'].value)
+        if target is not None and shared['fitness'].value <= target:
+            shared['stop'].set()
+            return False
+    return True
+
+
+def run_engine(scheduler: Scheduler, name: str, params: Dict[str, Any], seed, max_iter: int,
+               time_limit: float, target: float, exchange_every: int = 1) -> Dict[str, Any]:
+    # Hàm top-level để chạy trong process con
+    start = time.time()
+    ids = sorted(scheduler.jobs)
+    opt = build_optimizer(scheduler, name, seed=seed, **params)
+    on_iteration = (lambda o: _exchange(o, ids, exchange_every, target)) if _shared else None
+    vector, fitness = opt.run(max_iter, time_limit=time_limit, target=target, on_iteration=on_iteration)
+    if _shared and vector is not None:
+        _exchange(opt, ids, 1, target)
+    return {"engine": name, "label": get_engine(name).label, "vector": vector, "fitness": fitness,
+            "iterations": len(opt.best_fitness_history), "evaluations": opt.evaluations,
+            "history": opt.best_fitness_history, "time": time.time() - start}
+
+
+def run_engine_portfolio(scheduler: Scheduler, engines: List[str] = None, time_limit: float = 30.0,
+                         max_iter: int = 200, target: float = None, seed: int = 0,
+                         params: Dict[str, Dict[str, Any]] = None, exchange_every: int = 1,
+                         max_workers: int = None, on_update=None, cancel_token=None) -> List[Dict[str, Any]]:
+    """Chạy nhiều engine cùng lúc (mỗi engine một process) trên cùng instance.
+
+    Các engine chia sẻ incumbent (fitness + vector trong bộ nhớ dùng chung): engine tìm
+    được nghiệm tốt hơn thì công bố, engine tụt lại thì nhận incumbent qua `inject`.
+    Dừng khi một engine đạt target, hết time_limit (giây) hoặc cancel_token bị hủy.
+    on_update(best_fitness, elapsed) được gọi định kỳ khi incumbent thay đổi.
+    Trả về kết quả từng engine, sắp theo fitness.
+    """
+    names = list(engines) if engines is not None else list(ENGINES)
+    for name in names:
+        get_engine(name)
+    params = params or {}
+    ids = sorted(scheduler.jobs)
+    # "spawn": EngineThread chạy trong process GUI, không fork process đang chạy Qt
+    ctx = multiprocessing.get_context("spawn")
+    fitness = ctx.Value('d', float('inf'), lock=False)
+    vector = ctx.Array('d', len(ids), lock=False)
+    lock = ctx.Lock()
+    stop = ctx.Event()
+
+    start = time.time()
+    results = []
+    last_reported = float('inf')
+    # Mọi engine chạy đồng thời (kể cả khi số engine nhiều hơn số lõi)
+    workers = max_workers or len(names)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_shared,
+                             initargs=(fitness, vector, lock, stop)) as pool:
+        futures = [pool.submit(run_engine, scheduler, name, params.get(name, {}), seed + k, max_iter,
+                               time_limit, target, exchange_every) for k, name in enumerate(names)]
+        not_done = set(futures)
+        while not_done:
+            if cancel_token is not None and cancel_token.cancelled:
+                stop.set()
+            if time.time() - start >= time_limit:
+                stop.set()
+            done, not_done = wait(not_done, timeout=0.2, return_when=FIRST_COMPLETED)
+            results.extend(fut.result() for fut in done)
+            current = fitness.value
+            if on_update and current < last_reported:
+                last_reported = current
+                on_update(current, time.time() - start)
+    results.sort(key=lambda res: res['fitness'])
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chạy song song nhiều engine tối ưu trên một instance.")
+    parser.add_argument("input", help="File instance JSON")
+    parser.add_argument("--engines", default=",".join(ENGINES), help="Danh sách engine, cách nhau bởi dấu phẩy")
+    parser.add_argument("--time", type=float, default=30.0, help="Giới hạn thời gian (giây)")
+    parser.add_argument("--target", type=float, default=None, help="Dừng khi objective <= target")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        sch = Scheduler.from_dict(json.load(f))
+
+    def report(best, elapsed):
+        print(f"{elapsed:7.2f}s incumbent={best:.2f}", flush=True)
+
+    results = run_engine_portfolio(sch, engines=[e for e in args.engines.split(",") if e],
+                                   time_limit=args.time, target=args.target, seed=args.seed, on_update=report)
+    for res in results:
+        print(f"{res['label']:30s} best={res['fitness']:.2f} iter={res['iterations']} "
+              f"eval={res['evaluations']} time={res['time']:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""Archive Pareto (makespan, tổng penalty) và chọn lại nghiệm tức thì khi đổi alpha/beta.
+
+Mỗi lần decode đều tính cả makespan lẫn penalty; objective chỉ là tổ hợp
+alpha * makespan + beta * penalty. Nếu optimizer ghi mọi cặp (makespan, penalty) kèm
+vector vào `ParetoArchive`, nghiệm tốt nhất cho alpha/beta mới được chọn ngay từ archive
+thay vì chạy lại GWO. `fill_front` chạy GWO lần lượt theo nhiều trọng số (dùng chung
+archive, khởi tạo từ điểm tốt nhất đã có) để phủ đều mặt Pareto.
+
+Chạy (trong thư mục Final_Project):
+    python -m core.pareto Example/hard_ex.json --weights 7 --iter 30
+"""
+import argparse
+import bisect
+import json
+import math
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
+
+from .scheduler import Scheduler
+
+
+@dataclass
+class ParetoPoint:
+    makespan: float
+    penalty: float
+    vector: Dict[int, float]
+
+    def objective(self, alpha: float, beta: float) -> float:
+        return alpha * self.makespan + beta * self.penalty
+
+
+class ParetoArchive:
+    """Tập không bị trội (cả hai mục tiêu đều cực tiểu) có giới hạn kích thước.
+
+    Các điểm được giữ theo makespan tăng dần (penalty khi đó giảm ngặt), nên một điểm
+    mới chỉ cần so với điểm đứng ngay trước (tìm bằng bisect) để biết có bị trội không,
+    và các điểm nó trội là một đoạn liên tiếp ngay sau vị trí chèn. Vector chỉ được sao
+    chép khi điểm thực sự vào archive. Khi vượt `capacity`, bỏ điểm ở giữa có crowding
+    distance nhỏ nhất (hai đầu mút luôn được giữ).
+    """
+
+    def __init__(self, capacity: int = 200):
+        if capacity < 2:
+            raise ValueError("capacity phải >= 2")
+        self.capacity = capacity
+        self._makespans: List[float] = []
+        self.points: List[ParetoPoint] = []
+        self.offered = 0
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def would_accept(self, makespan: float, penalty: float) -> bool:
+        i = bisect.bisect_right(self._makespans, makespan)
+        # Điểm trước có makespan <= makespan; nó trội (hoặc trùng) nếu penalty cũng <=
+        return not (i > 0 and self.points[i - 1].penalty <= penalty)
+
+    def add(self, makespan: float, penalty: float, vector: Dict[int, float]) -> bool:
+        self.offered += 1
+        if not self.would_accept(makespan, penalty):
+            return False
+        i = bisect.bisect_left(self._makespans, makespan)
+        j = i
+        while j < len(self.points) and self.points[j].penalty >= penalty:
+            j += 1
+        self.points[i:j] = [ParetoPoint(makespan, penalty, dict(vector))]
+        self._makespans[i:j] = [makespan]
+        if len(self.points) > self.capacity:
+            self._prune()
+        return True
+
+    def _prune(self):
+        pts = self.points
+        m_span = (pts[-1].makespan - pts[0].makespan) or 1.0
+        p_span = (pts[0].penalty - pts[-1].penalty) or 1.0
+        worst = min(range(1, len(pts) - 1),
+                    key=lambda k: (pts[k + 1].makespan - pts[k - 1].makespan) / m_span
+                    + (pts[k - 1].penalty - pts[k + 1].penalty) / p_span)
+        del pts[worst]
+        del self._makespans[worst]
+
+    def best_for(self, alpha: float, beta: float) -> Optional[ParetoPoint]:
+        """Điểm có alpha * makespan + beta * penalty nhỏ nhất (None nếu archive rỗng)."""
+        if not self.points:
+            return None
+        return min(self.points, key=lambda pt: (pt.objective(alpha, beta), pt.makespan))
+
+    def front(self) -> List[Tuple[float, float]]:
+        return [(pt.makespan, pt.penalty) for pt in self.points]
+
+    def merge(self, other: 'ParetoArchive'):
+        for pt in other.points:
+            self.add(pt.makespan, pt.penalty, pt.vector)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"capacity": self.capacity,
+                "points": [{"makespan": pt.makespan, "penalty": pt.penalty, "vector": pt.vector}
+                           for pt in self.points]}
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> 'ParetoArchive':
+        archive = ParetoArchive(int(d.get('capacity', 200)))
+        for pt in d.get('points', []):
+            archive.add(float(pt['makespan']), float(pt['penalty']),
+                        {int(k): float(v) for k, v in pt['vector'].items()})
+        return archive
+
+
+def reweighted(scheduler: Scheduler, archive: ParetoArchive, alpha: float, beta: float) -> Optional[Dict[str, Any]]:
+    """Lịch tốt nhất trong archive cho alpha/beta mới: decode lại vector để có schedule đầy đủ."""
+    point = archive.best_for(alpha, beta)
+    if point is None:
+        return None
+    sch = Scheduler(machines=scheduler.machines, alpha=alpha, beta=beta)
+    sch.jobs = scheduler.jobs
+    sch.machine_ready = dict(scheduler.machine_ready)
+    sch.greedy_schedule(priority_vector=point.vector)
+    return {"vector": point.vector, "metrics": sch.compute_metrics(), "schedule": sch.schedule}
+
+
+def front_weights(count: int) -> List[float]:
+    # Trọng số của penalty trong [0, 1], dày hơn ở hai đầu (nơi mặt Pareto thường cong)
+    if count < 2:
+        return [0.5]
+    return [0.5 - 0.5 * math.cos(math.pi * k / (count - 1)) for k in range(count)]
+
+
+def fill_front(scheduler: Scheduler, weights: int = 7, archive: ParetoArchive = None, pop_size: int = 20,
+               max_iter: int = 30, seed: int = 0, cancel_token=None, on_weight=None) -> ParetoArchive:
+    """Chế độ đa mục tiêu: chạy GWO với từng trọng số lam trong front_weights(weights).
+
+    Objective của lần chạy thứ k là (1 - lam) * makespan / M + lam * penalty / P, với M, P
+    là makespan / penalty của baseline, nên hai mục tiêu cùng thang đo. Mọi lần decode đều
+    ghi vào chung một archive; mỗi lần chạy bắt đầu từ điểm tốt nhất của archive cho trọng
+    số đó. on_weight(k, lam, archive) được gọi sau mỗi lần chạy.
+    """
+    from .gwo import GWOScheduler
+
+    archive = archive if archive is not None else ParetoArchive()
+    base = scheduler.evaluate()
+    m_scale = max(1.0, float(base['makespan']))
+    p_scale = max(1.0, float(base['totalPenalty']))
+    for k, lam in enumerate(front_weights(weights)):
+        alpha, beta = (1 - lam) / m_scale, lam / p_scale
+        sch = Scheduler(machines=scheduler.machines, alpha=alpha, beta=beta)
+        sch.jobs = scheduler.jobs
+        sch.machine_ready = dict(scheduler.machine_ready)
+        start = archive.best_for(alpha, beta)
+        gwo = GWOScheduler(sch, pop_size=pop_size, max_iter=max_iter, seed=seed + k,
+                           init_vector=start.vector if start is not None else None, archive=archive)
+        gwo.solve(cancel_token=cancel_token)
+        if on_weight:
+            on_weight(k, lam, archive)
+        if gwo.cancelled:
+            break
+    return archive
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dựng mặt Pareto makespan / penalty và chọn nghiệm theo alpha, beta.")
+    parser.add_argument("input", help="File instance JSON")
+    parser.add_argument("--weights", type=int, default=7, help="Số trọng số (số lần chạy GWO)")
+    parser.add_argument("--pop", type=int, default=20)
+    parser.add_argument("--iter", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--capacity", type=int, default=200)
+    parser.add_argument("--alpha", type=float, nargs="*", default=[], help="Các alpha cần tra cứu")
+    parser.add_argument("--beta", type=float, nargs="*", default=[], help="Các beta tương ứng")
+    parser.add_argument("-o", "--output", default=None, help="Ghi archive ra file JSON")
+    args = parser.parse_args(argv)
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        sch = Scheduler.from_dict(json.load(f))
+
+    def report(k, lam, archive):
+        print(f"trọng số {k + 1}/{args.weights} (penalty {lam:.2f}): {len(archive)} điểm", flush=True)
+
+    archive = fill_front(sch, args.weights, ParetoArchive(args.capacity), args.pop, args.iter, args.seed,
+                         on_weight=report)
+    for makespan, penalty in archive.front():
+        print(f"  makespan={makespan:g} penalty={penalty:.2f}")
+    for alpha, beta in zip(args.alpha or [sch.alpha], args.beta or [sch.beta]):
+        point = archive.best_for(alpha, beta)
+        print(f"alpha={alpha:g} beta={beta:g}: objective={point.objective(alpha, beta):.2f} "
+              f"(makespan={point.makespan:g}, penalty={point.penalty:.2f})")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(archive.to_dict(), f)
+        print(f"Đã ghi {len(archive)} điểm vào {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+"""Danh mục quy tắc dispatch chạy song song làm baseline nhanh.
+
+Chạy danh mục cho một file instance (trong thư mục Final_Project):
+    python -m core.portfolio Example/hard_ex.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import List, Dict, Any, Callable
+
+from .scheduler import Scheduler, topological_order
+from .rules import RuleKey, baseline_key, edd_key, wspt_key, min_slack_key, atc_key, lrcp_key
+from .gwo import scale_to_bounds
+from .learned_rule import RULE_PATH, load_rule
+
+
+@dataclass(frozen=True)
+class DispatchRule:
+    name: str
+    label: str
+    build: Callable[[Scheduler], RuleKey]   # quy tắc có thể cần thống kê của instance
+
+    def key_for(self, scheduler: Scheduler) -> RuleKey:
+        return self.build(scheduler)
+
+
+def remaining_tails(scheduler: Scheduler) -> Dict[int, float]:
+    """Đường găng còn lại tính từ đầu mỗi job: p của job + tail lớn nhất của job kế tiếp."""
+    order = topological_order(scheduler)   # ValueError nếu thiếu tiền nhiệm / có chu trình
+    succ: Dict[int, List[int]] = {jid: [] for jid in scheduler.jobs}
+    for jid, job in scheduler.jobs.items():
+        for p in job.preds:
+            succ[p].append(jid)
+    tails: Dict[int, float] = {}
+    for jid in reversed(order):
+        tails[jid] = scheduler.jobs[jid].p + max((tails[s] for s in succ[jid]), default=0)
+    return tails
+
+
+def _avg_p(scheduler: Scheduler) -> float:
+    if not scheduler.jobs:
+        return 1.0
+    return sum(job.p for job in scheduler.jobs.values()) / len(scheduler.jobs)
+
+
+DISPATCH_RULES: Dict[str, DispatchRule] = {}
+
+
+def register_rule(rule: DispatchRule) -> DispatchRule:
+    DISPATCH_RULES[rule.name] = rule
+    return rule
+
+
+register_rule(DispatchRule("baseline", "Baseline (áp lực - rủi ro)", lambda sch: baseline_key))
+register_rule(DispatchRule("edd", "EDD", lambda sch: edd_key))
+register_rule(DispatchRule("wspt", "WSPT", lambda sch: wspt_key))
+register_rule(DispatchRule("min_slack", "Min Slack", lambda sch: min_slack_key))
+for _k in (0.5, 1.0, 2.0, 4.0):
+    register_rule(DispatchRule(f"atc_k{_k:g}", f"ATC (k={_k:g})", lambda sch, k=_k: atc_key(_avg_p(sch), k)))
+register_rule(DispatchRule("lrcp", "Longest Remaining Critical Path", lambda sch: lrcp_key(remaining_tails(sch))))
+
+
+def _register_learned_rule(path: str = RULE_PATH):
+    # Quy tắc học được (core/learned_rule.py) tham gia danh mục khi đã có file learned_rule.json
+    if not os.path.exists(path):
+        return
+    try:
+        rule = load_rule(path)
+    except (OSError, ValueError, KeyError):
+        return
+    register_rule(DispatchRule("learned", "Quy tắc học được (tuyến tính)", rule.key_for))
+
+
+_register_learned_rule()
+
+
+def get_rule(name: str) -> DispatchRule:
+    if name not in DISPATCH_RULES:
+        raise ValueError(f"Unknown dispatching rule '{name}'")
+    return DISPATCH_RULES[name]
+
+
+# Bộ đếm job đã dispatch của từng quy tắc, dùng chung với process cha (gán bởi _init_progress)
+_progress = None
+
+
+def _init_progress(counts):
+    global _progress
+    _progress = counts
+
+
+def _count_into(slot: int):
+    counts = _progress
+
+    def callback(done, total):
+        counts[slot] = done
+    return callback
+
+
+def run_rule(scheduler: Scheduler, name: str, slot: int = None, progress_callback=None) -> Dict[str, Any]:
+    # Hàm top-level để chạy trong process con; slot = ô của quy tắc trong bộ đếm dùng chung
+    rule = get_rule(name)
+    if progress_callback is None and _progress is not None and slot is not None:
+        progress_callback = _count_into(slot)
+    start_time = time.time()
+    scheduler.greedy_schedule(rule=rule.key_for(scheduler), progress_callback=progress_callback)
+    metrics = scheduler.compute_metrics()
+    metrics['executionTime'] = time.time() - start_time
+    return {"rule": rule.name, "label": rule.label, "metrics": metrics, "schedule": scheduler.schedule}
+
+
+def run_portfolio(scheduler: Scheduler, rules: List[str] = None, parallel: bool = True,
+                  max_workers: int = None, on_result=None, on_progress=None,
+                  progress_interval: float = 0.1) -> List[Dict[str, Any]]:
+    """Decode instance với mọi quy tắc trong danh mục, trả về kết quả sắp theo objective.
+
+    Với parallel=True mỗi quy tắc chạy trên một process; on_result(res) được gọi khi
+    từng quy tắc xong (theo thứ tự hoàn thành). on_progress(done, total) báo tổng số job
+    đã dispatch trên mọi quy tắc (total = số job * số quy tắc), tối đa một lần mỗi
+    progress_interval giây.
+    """
+    names = list(rules) if rules is not None else list(DISPATCH_RULES)
+    for name in names:
+        get_rule(name)
+    total = len(scheduler.jobs) * len(names)
+    results = []
+    if parallel and len(names) > 1:
+        # "spawn": BaselineThread chạy trong process GUI, không fork process đang chạy Qt
+        ctx = multiprocessing.get_context("spawn")
+        counts = ctx.Array('l', len(names), lock=False)
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx, initializer=_init_progress,
+                                 initargs=(counts,)) as pool:
+            futures = [pool.submit(run_rule, scheduler, name, k if on_progress else None)
+                       for k, name in enumerate(names)]
+            not_done = set(futures)
+            while not_done:
+                done, not_done = wait(not_done, timeout=progress_interval, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    res = fut.result()
+                    results.append(res)
+                    if on_result:
+                        on_result(res)
+                if on_progress:
+                    on_progress(sum(counts), total)
+    else:
+        finished = 0
+        last_emit = [0.0]
+        for name in names:
+            sch = Scheduler(machines=scheduler.machines, alpha=scheduler.alpha, beta=scheduler.beta)
+            sch.jobs = scheduler.jobs
+            sch.machine_ready = dict(scheduler.machine_ready)
+            callback = None
+            if on_progress:
+                def callback(done, n, offset=finished):
+                    now = time.time()
+                    if done == n or now - last_emit[0] >= progress_interval:
+                        last_emit[0] = now
+                        on_progress(offset + done, total)
+            res = run_rule(sch, name, progress_callback=callback)
+            finished += len(scheduler.jobs)
+            results.append(res)
+            if on_result:
+                on_result(res)
+    order = {name: i for i, name in enumerate(names)}
+    results.sort(key=lambda res: (res['metrics']['objectiveValue'], order[res['rule']]))
+    return results
+
+
+def seed_vector(schedule: Dict[str, List[Dict[str, Any]]], lower: float = -1.0,
+                upper: float = 1.0) -> Dict[int, float]:
+    """Priority vector từ một lịch: job bắt đầu sớm hơn có priority nhỏ hơn (dùng làm init_vector cho GWO)."""
+    starts = {task['job']: task['start'] for tasks in schedule.values() for task in tasks}
+    return scale_to_bounds(starts, lower, upper)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chạy danh mục quy tắc dispatch cho một instance.")
+    parser.add_argument("input", help="File instance JSON")
+    parser.add_argument("--serial", action="store_true", help="Chạy tuần tự thay vì song song")
+    args = parser.parse_args(argv)
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        sch = Scheduler.from_dict(json.load(f))
+    for res in run_portfolio(sch, parallel=not args.serial):
+        m = res['metrics']
+        print(f"{res['label']:34s} objective={m['objectiveValue']:.2f} makespan={m['makespan']} "
+              f"penalty={m['totalPenalty']:.2f} time={m['executionTime']:.4f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+from dataclasses import dataclass, field, replace
+from typing import List, Dict, Any, Tuple
+
+from .job import Job
+from .scheduler import Scheduler
+from .gwo import GWOScheduler, scale_to_bounds
+
+CHANGEABLE_FIELDS = ("p", "d", "w", "r", "preds")
+
+
+@dataclass
+class ChangeSet:
+    added: List[Job] = field(default_factory=list)
+    removed: List[int] = field(default_factory=list)
+    changed: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> 'ChangeSet':
+        return ChangeSet(
+            added=[Job.from_dict(j) for j in d.get('added', [])],
+            removed=[int(x) for x in d.get('removed', [])],
+            changed={int(k): dict(v) for k, v in d.get('changed', {}).items()}
+        )
+
+
+class PartialEncoding:
+    """Encoding cho GWOScheduler chỉ tìm trên một tập job; các job còn lại giữ priority cố định.
+
+    `keys` là các job được tối ưu lại, `fixed` là priority đầy đủ (warm start) dùng cho
+    mọi job khác khi `expand`.
+    """
+
+    def __init__(self, keys: List[int], fixed: Dict[int, float]):
+        self.keys: List[int] = list(keys)
+        self.fixed = dict(fixed)
+
+    @property
+    def dimension(self) -> int:
+        return len(self.keys)
+
+    def reduce(self, vector: Dict[int, float]) -> Dict[int, float]:
+        return {jid: vector[jid] for jid in self.keys}
+
+    def expand(self, vector: Dict[int, float]) -> Dict[int, float]:
+        full = dict(self.fixed)
+        full.update(vector)
+        return full
+
+
+def _apply_changes(scheduler: Scheduler, changes: ChangeSet) -> Scheduler:
+    new_sch = Scheduler(machines=scheduler.machines, alpha=scheduler.alpha, beta=scheduler.beta)
+    new_sch.jobs = dict(scheduler.jobs)
+    new_sch.machine_ready = dict(scheduler.machine_ready)
+
+    removed = set(changes.removed)
+    for jid in removed:
+        if jid not in new_sch.jobs:
+            raise ValueError(f"Cannot remove unknown job {jid}")
+        del new_sch.jobs[jid]
+
+    for jid, fields in changes.changed.items():
+        if jid not in new_sch.jobs:
+            raise ValueError(f"Cannot change unknown job {jid}")
+        bad = set(fields) - set(CHANGEABLE_FIELDS)
+        if bad:
+            raise ValueError(f"Unsupported fields for job {jid}: {sorted(bad)}")
+        new_sch.jobs[jid] = replace(new_sch.jobs[jid], **fields)
+
+    for job in changes.added:
+        if job.id in new_sch.jobs or job.id in removed:
+            raise ValueError(f"Job {job.id} already exists")
+        new_sch.jobs[job.id] = job
+
+    if removed:
+        # Job bị hủy không còn ràng buộc các job sau nó
+        for jid, job in list(new_sch.jobs.items()):
+            if any(p in removed for p in job.preds):
+                new_sch.jobs[jid] = replace(job, preds=[p for p in job.preds if p not in removed])
+    return new_sch
+
+
+def repair_schedule(scheduler: Scheduler, schedule: Dict[str, List[Dict[str, Any]]], changes: ChangeSet,
+                    freeze_time: float = 0.0, gwo_iters: int = 0, pop_size: int = 8,
+                    seed=None) -> Tuple[Scheduler, Dict[str, Any]]:
+    """Sửa lịch hiện tại sau khi job được thêm / hủy / thay đổi, thay vì xếp lại từ đầu.
+
+    Giữ nguyên các task đã bắt đầu trước freeze_time và phần lịch trước thời điểm đầu
+    tiên bị thay đổi ảnh hưởng (t0); chỉ dispatch lại phần đuôi cùng các job kế tiếp
+    (trực tiếp hoặc bắc cầu) của job bị thay đổi. Thứ tự cũ được dùng làm priority
+    vector; nếu gwo_iters > 0 thì chạy thêm một GWO ngắn warm-start trên riêng các job đó.
+
+    Trả về (Scheduler mới đã có schedule, thông tin sửa lịch).
+    """
+    new_sch = _apply_changes(scheduler, changes)
+    removed = set(changes.removed)
+    direct = set(changes.changed) | {job.id for job in changes.added}
+
+    placed: Dict[int, Tuple[str, Dict[str, Any]]] = {}
+    for mname, tasks in schedule.items():
+        for task in tasks:
+            placed[task['job']] = (mname, task)
+
+    def earliest_start(jid):
+        # Release mới, nhưng không sớm hơn lúc các tiền nhiệm (theo lịch cũ) xong
+        job = new_sch.jobs[jid]
+        return max([job.r] + [placed[p][1]['end'] for p in job.preds if p in placed])
+
+    # Thời điểm đầu tiên lịch cũ có thể bị ảnh hưởng: vị trí cũ của job bị đổi / hủy;
+    # chỉ lùi về trước đó khi job có thể bắt đầu sớm hơn (release giảm, bớt tiền nhiệm)
+    # hoặc là job mới
+    t0 = float('inf')
+    for jid in direct | removed:
+        if jid in placed:
+            t0 = min(t0, placed[jid][1]['start'])
+    for jid in direct:
+        old = scheduler.jobs.get(jid)
+        relaxed = old is None or new_sch.jobs[jid].r < old.r or not set(old.preds) <= set(new_sch.jobs[jid].preds)
+        if relaxed or jid not in placed:
+            t0 = min(t0, earliest_start(jid))
+    t0 = max(t0, freeze_time)
+
+    # Các job kế tiếp (bắc cầu) của job bị thay đổi / bị hủy cũng phải xếp lại; cạnh theo
+    # đồ thị cũ (còn giữ job kế tiếp của job bị hủy) cộng tiền nhiệm mới của job bị đổi / thêm
+    succ: Dict[int, List[int]] = {}
+    for jid, job in scheduler.jobs.items():
+        for p in job.preds:
+            succ.setdefault(p, []).append(jid)
+    for jid in direct:
+        for p in new_sch.jobs[jid].preds:
+            succ.setdefault(p, []).append(jid)
+    affected = set(direct)
+    stack = list(direct | removed)
+    while stack:
+        x = stack.pop()
+        for s in succ.get(x, []):
+            if s not in affected and s in new_sch.jobs:
+                affected.add(s)
+                stack.append(s)
+
+    kept: Dict[str, List[Dict[str, Any]]] = {mname: [] for mname in schedule}
+    completed_at: Dict[int, float] = {}
+    machine_ready: Dict[int, float] = {}
+    for mname, tasks in schedule.items():
+        mid = int(mname[1:])
+        machine_ready[mid] = max(freeze_time, new_sch.machine_ready.get(mid, 0))
+        for task in tasks:
+            jid = task['job']
+            if jid in removed:
+                continue
+            started = task['start'] < freeze_time
+            if started or (task['start'] < t0 and jid not in affected):
+                task = dict(task)
+                if started and jid in changes.changed and task['end'] > freeze_time:
+                    # Job đang chạy bị đổi thời lượng: cập nhật thời điểm kết thúc
+                    # (job đã xong trước freeze_time là lịch sử, giữ nguyên)
+                    task['end'] = float(task['start'] + new_sch.jobs[jid].p)
+                kept[mname].append(task)
+                completed_at[jid] = task['end']
+                machine_ready[mid] = max(machine_ready[mid], task['end'])
+
+    redispatch = [jid for jid in new_sch.jobs if jid not in completed_at]
+    sub = new_sch.subproblem(redispatch, completed_at, machine_ready)
+
+    # Warm start: giữ thứ tự bắt đầu cũ, job mới / bị đổi xếp theo release
+    warm = {}
+    for jid in redispatch:
+        if jid in placed and jid not in direct:
+            warm[jid] = placed[jid][1]['start']
+        else:
+            warm[jid] = max(sub.jobs[jid].r, t0)
+
+    # GWO chỉ tìm trên các job bị ảnh hưởng; job còn lại giữ priority warm start
+    optimized = [jid for jid in redispatch if jid in affected]
+    vector = warm
+    if gwo_iters > 0 and optimized:
+        scaled = scale_to_bounds(warm, -1.0, 1.0)
+        gwo = GWOScheduler(sub, pop_size=max(3, pop_size), max_iter=gwo_iters, seed=seed,
+                           init_vector=scaled, encoding=PartialEncoding(optimized, scaled))
+        vector, _ = gwo.solve()
+    sub.greedy_schedule(priority_vector=vector)
+
+    merged = {mname: list(tasks) for mname, tasks in kept.items()}
+    for mname, tasks in sub.schedule.items():
+        merged.setdefault(mname, []).extend(tasks)
+    for tasks in merged.values():
+        tasks.sort(key=lambda t: t['start'])
+    new_sch.schedule = merged
+
+    info = {
+        "t0": t0,
+        "kept": len(completed_at),
+        "redispatched": len(redispatch),
+        "affected": len(affected),
+        "optimized": len(optimized),
+    }
+    return new_sch, info
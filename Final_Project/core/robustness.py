@@ -0,0 +1,328 @@
+"""Đánh giá độ bền (Monte Carlo) của một chính sách xếp lịch khi p và r bị nhiễu.
+
+Chính sách (priority vector hoặc quy tắc dispatch) được giữ cố định và decode lại trên
+N kịch bản nhiễu. Với backend Numba và priority vector, các kịch bản được sinh bằng
+numpy theo lô và decode bằng kernel JIT (hạng của job chỉ phụ thuộc priority, d, id nên
+tính một lần); ngược lại các kịch bản được chia theo khối cho process pool. Seed cố định
+cho kết quả tái lập được trên cùng backend.
+
+Chạy (trong thư mục Final_Project):
+    python -m core.robustness Example/hard_ex.json --rule baseline -n 1000 --p-cv 0.1
+    python -m core.robustness Example/hard_ex.json --vector best_vector.json -n 1000
+"""
+import argparse
+import json
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import List, Dict, Any, Optional
+
+from .scheduler import Scheduler
+from . import jit_engine
+from .portfolio import get_rule
+
+DISTRIBUTIONS = ("none", "normal", "uniform", "triangular", "lognormal", "exponential")
+
+
+@dataclass
+class NoiseModel:
+    """Phân phối nhiễu: p nhân với hệ số (trung bình 1, độ lệch chuẩn p_cv), r cộng thêm
+    độ lệch (trung bình 0, độ lệch chuẩn r_std đơn vị thời gian). "exponential" chỉ làm
+    trễ (hệ số 1 + Exp(p_cv), r + Exp(r_std)). Kết quả được làm tròn về số nguyên,
+    p > 0 giữ tối thiểu 1, r không âm."""
+    p_dist: str = "lognormal"
+    p_cv: float = 0.1
+    r_dist: str = "none"
+    r_std: float = 0.0
+
+    def __post_init__(self):
+        for dist in (self.p_dist, self.r_dist):
+            if dist not in DISTRIBUTIONS:
+                raise ValueError(f"Unknown noise distribution '{dist}'")
+        if self.p_cv < 0 or self.r_std < 0:
+            raise ValueError("p_cv và r_std phải không âm")
+
+
+def _unit_noise(rng: random.Random, dist: str, sd: float) -> float:
+    # Nhiễu cộng có trung bình 0 (trừ exponential) và độ lệch chuẩn sd
+    if dist == "none" or sd == 0:
+        return 0.0
+    if dist == "normal":
+        return rng.gauss(0.0, sd)
+    if dist == "uniform":
+        a = math.sqrt(3) * sd
+        return rng.uniform(-a, a)
+    if dist == "triangular":
+        a = math.sqrt(6) * sd
+        return rng.triangular(-a, a, 0.0)
+    if dist == "lognormal":
+        sigma = math.sqrt(math.log(1 + sd * sd))
+        return rng.lognormvariate(-sigma * sigma / 2, sigma) - 1.0
+    return rng.expovariate(1.0 / sd)
+
+
+def _perturb(p: int, r: int, model: NoiseModel, rng: random.Random):
+    new_p = 0 if p <= 0 else max(1, int(round(p * (1.0 + _unit_noise(rng, model.p_dist, model.p_cv)))))
+    new_r = max(0, int(round(r + model.r_std * _unit_noise(rng, model.r_dist, 1.0)))) if model.r_std else r
+    return new_p, new_r
+
+
+def scenario_rng(seed: int, index: int) -> random.Random:
+    # RNG riêng của từng kịch bản: kết quả không phụ thuộc cách chia khối
+    return random.Random(seed * 1000003 + index)
+
+
+@dataclass
+class RobustnessReport:
+    scenarios: int
+    nominal: float                     # objective khi không nhiễu
+    objectives: List[float]
+    job_risk: List[Dict[str, Any]]     # sắp theo xác suất trễ rồi trễ trung bình giảm dần
+    machines: List[Dict[str, Any]]     # thời điểm xong của từng máy qua các kịch bản
+    spread: Dict[str, float]           # chênh lệch (máy xong muộn nhất - sớm nhất) mỗi kịch bản
+    backend: str = "python"
+    stats: Dict[str, float] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not self.stats:
+            self.stats = summarize(self.objectives)
+
+    def top_risks(self, k: int = 10) -> List[Dict[str, Any]]:
+        return self.job_risk[:k]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "scenarios": self.scenarios,
+            "backend": self.backend,
+            "nominal": self.nominal,
+            "objective": self.stats,
+            "job_risk": self.job_risk,
+            "machines": self.machines,
+            "machine_spread": self.spread,
+        }
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    # Nội suy tuyến tính giữa hai hạng gần nhất (như numpy mặc định)
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q
+    lo = int(math.floor(pos))
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"mean": 0.0, "std": 0.0, "p50": 0.0, "p95": 0.0, "best": 0.0, "worst": 0.0}
+    s = sorted(values)
+    mean = sum(s) / len(s)
+    var = sum((v - mean) ** 2 for v in s) / (len(s) - 1) if len(s) > 1 else 0.0
+    return {"mean": mean, "std": math.sqrt(var), "p50": percentile(s, 0.5), "p95": percentile(s, 0.95),
+            "best": s[0], "worst": s[-1]}
+
+
+# ---------- đường Python (process pool) ----------
+def _decode_python(scheduler: Scheduler, jobs, priority_vector, rule_name):
+    sch = Scheduler(machines=scheduler.machines, alpha=scheduler.alpha, beta=scheduler.beta)
+    sch.jobs = jobs
+    sch.machine_ready = dict(scheduler.machine_ready)
+    if priority_vector is not None:
+        sch.greedy_schedule(priority_vector=priority_vector)
+    else:
+        sch.greedy_schedule(rule=get_rule(rule_name).key_for(sch))
+    return sch
+
+
+def run_chunk(scheduler: Scheduler, priority_vector, rule_name: str, model: NoiseModel,
+              seed: int, first: int, count: int) -> Dict[str, Any]:
+    """Decode các kịch bản first..first+count-1 (hàm top-level để chạy trong process con).
+
+    Trả về objective và thời điểm xong của từng máy theo kịch bản, cộng dồn số lần trễ
+    và tổng độ trễ theo job.
+    """
+    ids = list(scheduler.jobs)
+    late = [0] * len(ids)
+    tard_sum = [0.0] * len(ids)
+    objectives = []
+    machine_ends = []
+    for idx in range(first, first + count):
+        rng = scenario_rng(seed, idx)
+        jobs = {}
+        for jid in ids:
+            job = scheduler.jobs[jid]
+            p, r = _perturb(job.p, job.r, model, rng)
+            jobs[jid] = replace(job, p=p, r=r)
+        sch = _decode_python(scheduler, jobs, priority_vector, rule_name)
+        objectives.append(sch.compute_metrics()['objectiveValue'])
+        completion = {}
+        ends = []
+        for m in range(1, scheduler.machines + 1):
+            tasks = sch.schedule.get(f"M{m}", [])
+            for task in tasks:
+                completion[task['job']] = task['end']
+            ends.append(max((task['end'] for task in tasks), default=float(scheduler.machine_ready.get(m, 0))))
+        machine_ends.append(ends)
+        for i, jid in enumerate(ids):
+            tard = completion.get(jid, 0.0) - jobs[jid].d
+            if tard > 0:
+                late[i] += 1
+                tard_sum[i] += tard
+    return {"objectives": objectives, "machine_ends": machine_ends, "late": late, "tard_sum": tard_sum}
+
+
+# ---------- đường JIT (lô numpy + kernel) ----------
+def _sample_factors(gen, dist: str, sd: float, shape):
+    np = jit_engine.np
+    if dist == "none" or sd == 0:
+        return np.zeros(shape)
+    if dist == "normal":
+        return gen.normal(0.0, sd, shape)
+    if dist == "uniform":
+        a = math.sqrt(3) * sd
+        return gen.uniform(-a, a, shape)
+    if dist == "triangular":
+        a = math.sqrt(6) * sd
+        return gen.triangular(-a, 0.0, a, shape)
+    if dist == "lognormal":
+        sigma = math.sqrt(math.log(1 + sd * sd))
+        return gen.lognormal(-sigma * sigma / 2, sigma, shape) - 1.0
+    return gen.exponential(sd, shape)
+
+
+def run_batch_jit(scheduler: Scheduler, priority_vector: Dict[int, float], model: NoiseModel,
+                  seed: int, scenarios: int, batch: int = 256) -> Optional[Dict[str, Any]]:
+    """Sinh kịch bản theo lô bằng numpy và decode bằng kernel; None nếu kernel không dùng được."""
+    np = jit_engine.np
+    arrays = jit_engine.arrays_for(scheduler)
+    n, m = len(arrays.ids), scheduler.machines
+    rank, job_of_rank = arrays.ranks(priority_vector)
+    gen = np.random.default_rng(seed)
+    late = np.zeros(n, dtype=np.int64)
+    tard_sum = np.zeros(n)
+    objectives = []
+    machine_ends = []
+    out = np.zeros(4)
+    base_ends = np.array(arrays.ready_times, dtype=np.float64)
+    for first in range(0, scenarios, batch):
+        k = min(batch, scenarios - first)
+        P = np.rint(arrays.P * (1.0 + _sample_factors(gen, model.p_dist, model.p_cv, (k, n)))).astype(np.int64)
+        P = np.where(arrays.P > 0, np.maximum(P, 1), 0)
+        if model.r_std:
+            R = np.maximum(0, np.rint(arrays.R + model.r_std * _sample_factors(gen, model.r_dist, 1.0, (k, n)))
+                           ).astype(np.int64)
+        else:
+            R = np.broadcast_to(arrays.R, (k, n))
+        for s in range(k):
+            Ps, Rs = np.ascontiguousarray(P[s]), np.ascontiguousarray(R[s])
+            if not arrays.fits_for(Ps, Rs):
+                return None
+            start, machine, _, done = arrays.decode_ranked(rank, job_of_rank, Ps, Rs)
+            if done < n:
+                return None
+            jit_engine._metrics_kernel(start, Ps, arrays.D, arrays.W, float(scheduler.alpha),
+                                       float(scheduler.beta), out)
+            objectives.append(float(out[3]))
+            C = (start + Ps).astype(np.float64)
+            tard = C - arrays.D
+            late += tard > 0
+            tard_sum += np.maximum(tard, 0.0)
+            ends = base_ends.copy()
+            np.maximum.at(ends, machine - 1, C)
+            machine_ends.append(ends.tolist())
+    return {"objectives": objectives, "machine_ends": machine_ends, "late": late.tolist(),
+            "tard_sum": tard_sum.tolist()}
+
+
+def evaluate_robustness(scheduler: Scheduler, priority_vector: Dict[int, float] = None, rule: str = "baseline",
+                        model: NoiseModel = None, scenarios: int = 1000, seed: int = 0,
+                        parallel: bool = True, max_workers: int = None) -> RobustnessReport:
+    """Decode chính sách trên `scenarios` kịch bản nhiễu và tổng hợp phân phối kết quả.
+
+    priority_vector=None thì dùng quy tắc dispatch `rule` (tên trong DISPATCH_RULES).
+    """
+    if scenarios < 1:
+        raise ValueError("scenarios phải >= 1")
+    model = model or NoiseModel()
+    if priority_vector is None:
+        get_rule(rule)
+    nominal_sch = _decode_python(scheduler, scheduler.jobs, priority_vector, rule)
+    nominal = nominal_sch.compute_metrics()['objectiveValue']
+
+    parts = None
+    backend = "python"
+    if priority_vector is not None and jit_engine.supports(scheduler, priority_vector):
+        parts = run_batch_jit(scheduler, priority_vector, model, seed, scenarios)
+        if parts is not None:
+            parts, backend = [parts], "numba"
+    if parts is None:
+        workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        chunk = max(1, math.ceil(scenarios / (workers * 4)))
+        ranges = [(first, min(chunk, scenarios - first)) for first in range(0, scenarios, chunk)]
+        if parallel and workers > 1 and len(ranges) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(run_chunk, scheduler, priority_vector, rule, model, seed, first, count)
+                           for first, count in ranges]
+                parts = [fut.result() for fut in futures]
+        else:
+            parts = [run_chunk(scheduler, priority_vector, rule, model, seed, first, count)
+                     for first, count in ranges]
+    return _merge(scheduler, parts, nominal, backend)
+
+
+def _merge(scheduler: Scheduler, parts: List[Dict[str, Any]], nominal: float, backend: str) -> RobustnessReport:
+    ids = list(scheduler.jobs)
+    objectives = [v for part in parts for v in part['objectives']]
+    machine_ends = [ends for part in parts for ends in part['machine_ends']]
+    late = [sum(part['late'][i] for part in parts) for i in range(len(ids))]
+    tard_sum = [sum(part['tard_sum'][i] for part in parts) for i in range(len(ids))]
+    n = len(objectives)
+
+    job_risk = [{"job": jid, "late_prob": late[i] / n, "mean_tardiness": tard_sum[i] / n,
+                 "weighted_mean_tardiness": scheduler.jobs[jid].w * tard_sum[i] / n}
+                for i, jid in enumerate(ids)]
+    job_risk.sort(key=lambda row: (-row['late_prob'], -row['weighted_mean_tardiness'], row['job']))
+
+    machines = []
+    for k in range(scheduler.machines):
+        s = summarize([ends[k] for ends in machine_ends])
+        machines.append({"machine": f"M{k + 1}", "mean_end": s['mean'], "p95_end": s['p95'], "max_end": s['worst']})
+    spread = summarize([max(ends) - min(ends) for ends in machine_ends if ends])
+    return RobustnessReport(n, nominal, objectives, job_risk, machines, spread, backend)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Đánh giá độ bền của lịch khi p, r bị nhiễu (Monte Carlo).")
+    parser.add_argument("input", help="File instance JSON")
+    parser.add_argument("--vector", default=None, help="File JSON priority vector {job: giá trị}")
+    parser.add_argument("--rule", default="baseline", help="Quy tắc dispatch khi không có --vector")
+    parser.add_argument("-n", "--scenarios", type=int, default=1000)
+    parser.add_argument("--p-dist", default="lognormal", choices=DISTRIBUTIONS)
+    parser.add_argument("--p-cv", type=float, default=0.1)
+    parser.add_argument("--r-dist", default="none", choices=DISTRIBUTIONS)
+    parser.add_argument("--r-std", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--top", type=int, default=10, help="Số job rủi ro cao nhất được in")
+    args = parser.parse_args(argv)
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        sch = Scheduler.from_dict(json.load(f))
+    vector = None
+    if args.vector:
+        with open(args.vector, 'r', encoding='utf-8') as f:
+            vector = {int(k): float(v) for k, v in json.load(f).items()}
+    model = NoiseModel(args.p_dist, args.p_cv, args.r_dist, args.r_std)
+    report = evaluate_robustness(sch, vector, args.rule, model, args.scenarios, args.seed)
+
+    s = report.stats
+    print(f"{report.scenarios} kịch bản ({report.backend}): nominal={report.nominal:.2f} mean={s['mean']:.2f} "
+          f"std={s['std']:.2f} p95={s['p95']:.2f} worst={s['worst']:.2f}")
+    print(f"Chênh lệch thời điểm xong giữa các máy: mean={report.spread['mean']:.2f} p95={report.spread['p95']:.2f}")
+    for row in report.top_risks(args.top):
+        print(f"  Job {row['job']}: P(trễ)={row['late_prob'] * 100:.1f}% trễ TB={row['mean_tardiness']:.2f}")
+
+
+if __name__ == '__main__':
+    main()
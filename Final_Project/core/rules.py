@@ -0,0 +1,61 @@
+import math
+from typing import Dict, Callable, Tuple
+
+from .job import Job
+
+# Một quy tắc dispatch nhận (job, thời điểm hiện tại, thời điểm tiền nhiệm xong)
+# và trả về key sắp xếp; key nhỏ hơn được xếp trước.
+RuleKey = Callable[[Job, float, float], Tuple]
+
+
+def baseline_key(job: Job, now: float, pred_done: float) -> Tuple:
+    # Baseline heuristic (Sử dụng LIFO/Critical path)
+    alpha_h = 10
+    beta_h = 1.0
+    system_pressure = job.d + job.p
+    job_risk = job.w * (max(0, job.p + max(now, pred_done) - job.d))
+    core_score = alpha_h * system_pressure - beta_h * job_risk
+    return (core_score, job.d, job.p, -job.w, job.id)
+
+
+def priority_vector_key(priority_vector: Dict[int, float]) -> RuleKey:
+    # GWO priority: ưu tiên giá trị nhỏ nhất, hòa thì theo due date rồi id
+    def key(job: Job, now: float, pred_done: float) -> Tuple:
+        return (priority_vector.get(job.id, 0), job.d, job.id)
+    return key
+
+
+def edd_key(job: Job, now: float, pred_done: float) -> Tuple:
+    # Earliest Due Date
+    return (job.d, job.p, job.id)
+
+
+def wspt_key(job: Job, now: float, pred_done: float) -> Tuple:
+    # Weighted Shortest Processing Time: w / p lớn nhất trước
+    ratio = job.w / job.p if job.p > 0 else float('inf')
+    return (-ratio, job.d, job.id)
+
+
+def min_slack_key(job: Job, now: float, pred_done: float) -> Tuple:
+    # Minimum Slack: d - (thời điểm bắt đầu sớm nhất + p)
+    slack = job.d - max(now, pred_done, job.r) - job.p
+    return (slack, job.d, job.id)
+
+
+def atc_key(p_avg: float, k: float = 2.0) -> RuleKey:
+    # Apparent Tardiness Cost: w/p * exp(-max(0, slack) / (k * p trung bình))
+    scale = k * p_avg if p_avg > 0 else 1.0
+
+    def key(job: Job, now: float, pred_done: float) -> Tuple:
+        slack = max(0.0, job.d - job.p - max(now, pred_done, job.r))
+        index = (job.w / job.p if job.p > 0 else float('inf')) * math.exp(-slack / scale)
+        return (-index, job.d, job.id)
+    return key
+
+
+def lrcp_key(tails: Dict[int, float]) -> RuleKey:
+    # Longest Remaining Critical Path: job có chuỗi kế tiếp dài nhất trước
+    def key(job: Job, now: float, pred_done: float) -> Tuple:
+        return (-tails.get(job.id, job.p), job.d, job.id)
+    return key
+
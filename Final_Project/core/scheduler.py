@@ -1,7 +1,13 @@
 import heapq
 import math
-from typing import List, Dict, Any
+from dataclasses import replace
+from typing import List, Dict, Any, Iterable
 from .job import Job  # Kết nối với file job.py
+from .rules import RuleKey, baseline_key
+from .int_engine import greedy_schedule_int
+from .machine_pool import MachinePool
+from .contention import ContentionTracker
+from . import jit_engine
 
 class Scheduler:
     def __init__(self, machines:int=1, alpha:float=1.0, beta:float=1.0):
@@ -11,6 +17,8 @@ class Scheduler:
         self.jobs: Dict[int, Job] = {}
         # Đảm bảo schedule luôn là một DICTIONARY RỖNG để tránh lỗi key
         self.schedule: Dict[str, List[Dict[str, Any]]] = {} 
+        # Thời điểm rảnh ban đầu của từng máy (mặc định 0) - dùng cho bài toán con
+        self.machine_ready: Dict[int, float] = {}
 
     @staticmethod
     def from_dict(input_data: Dict[str, Any]) -> 'Scheduler':
@@ -22,7 +30,81 @@ class Scheduler:
             sch.jobs[job.id] = job
         return sch
 
-    def greedy_schedule(self, priority_vector: Dict[int, float] = None):
+    def subproblem(self, job_ids: Iterable[int], completed_at: Dict[int, float] = None,
+                   machine_ready: Dict[int, float] = None) -> 'Scheduler':
+        """Tạo Scheduler con chỉ gồm job_ids.
+
+        Tiền nhiệm nằm ngoài tập được thay bằng điều kiện biên: release của job được nâng
+        lên thời điểm hoàn thành của tiền nhiệm đó (lấy từ completed_at).
+        """
+        completed_at = completed_at or {}
+        ids = set(job_ids)
+        sub = Scheduler(machines=self.machines, alpha=self.alpha, beta=self.beta)
+        for jid in job_ids:
+            job = self.jobs[jid]
+            r = job.r
+            preds = []
+            for p in job.preds:
+                if p in ids:
+                    preds.append(p)
+                elif p in completed_at:
+                    r = max(r, completed_at[p])
+                else:
+                    raise ValueError(f"Predecessor {p} of job {jid} is neither in the subproblem nor completed")
+            sub.jobs[jid] = replace(job, r=r, preds=preds)
+        sub.machine_ready = dict(machine_ready or {})
+        return sub
+
+    def is_integral(self) -> bool:
+        # Mọi mốc thời gian đầu vào (p, r, thời điểm rảnh máy) đều là số nguyên?
+        values = [job.p for job in self.jobs.values()] + [job.r for job in self.jobs.values()]
+        values += list(self.machine_ready.values())
+        return all(isinstance(v, int) or (isinstance(v, float) and v.is_integer()) for v in values)
+
+    def resolve_engine(self, engine: str = "auto") -> str:
+        if engine == "auto":
+            return "int" if self.is_integral() else "float"
+        if engine not in ("float", "int"):
+            raise ValueError(f"Unknown decoder engine '{engine}'")
+        if engine == "int" and not self.is_integral():
+            raise ValueError("Integer engine requires integral p, r and machine ready times")
+        return engine
+
+    def greedy_schedule(self, priority_vector: Dict[int, float] = None, cancel_token=None,
+                        progress_callback=None, engine: str = "auto", contention: set = None,
+                        rule: RuleKey = None):
+        """Decode lịch trình (list scheduling) theo priority_vector hoặc quy tắc dispatch.
+
+        Không có priority_vector thì dùng `rule` (mặc định baseline_key, xem core/rules.py).
+
+        Nếu truyền set `contention`, các job từng phải cạnh tranh trong ready heap (xem
+        ContentionTracker) được thêm vào set đó.
+
+        Với priority_vector trên instance thời gian nguyên, dùng kernel JIT (core/jit_engine.py)
+        khi backend Numba đang bật và không cần contention/progress_callback; kết quả giống
+        hệt engine int.
+        """
+        if (engine in ("auto", "int") and contention is None and progress_callback is None
+                and jit_engine.supports(self, priority_vector)):
+            if cancel_token is not None:
+                cancel_token.check()
+            schedule = jit_engine.greedy_schedule_jit(self, priority_vector)
+            if schedule is not None:
+                self.schedule = schedule
+                return schedule
+
+        indeg, succ = self._precedence_graph()
+        tracker = ContentionTracker(contention) if contention is not None else None
+
+        if self.resolve_engine(engine) == "int":
+            # Engine thời gian nguyên: cùng lịch trình, không cần epsilon
+            self.schedule = greedy_schedule_int(self, indeg, succ, priority_vector,
+                                                cancel_token, progress_callback, tracker, rule)
+            return self.schedule
+        return self._greedy_schedule_float(indeg, succ, priority_vector, cancel_token, progress_callback,
+                                           tracker, rule)
+
+    def _precedence_graph(self):
         # --- build graph (indeg, succ) ---
         indeg = {jid: 0 for jid in self.jobs}
         succ = {jid: [] for jid in self.jobs}
@@ -49,10 +131,15 @@ class Scheduler:
             # Nếu có chu trình, trả về lịch trình rỗng an toàn
             self.schedule = {f"M{m}": [] for m in range(1, self.machines + 1)}
             raise ValueError("Cycle detected in precedence constraints")
+        return indeg, succ
 
-        # --- machine heap: (time_free, machine_id) ---
-        machine_heap = [(0, m) for m in range(1, self.machines + 1)]
-        heapq.heapify(machine_heap)
+    def _greedy_schedule_float(self, indeg, succ, priority_vector=None, cancel_token=None,
+                               progress_callback=None, tracker: ContentionTracker = None,
+                               rule: RuleKey = None):
+        rule = rule or baseline_key
+
+        # --- machine pool: máy gom theo thời điểm rảnh ---
+        machine_pool = MachinePool(self.machines, self.machine_ready)
 
         # --- priority key cho ready heap ---
         def ready_key(jid, now):
@@ -66,13 +153,8 @@ class Scheduler:
                     jid
                 )
             else:
-                # Baseline heuristic (Sử dụng LIFO/Critical path)
-                alpha_h = 10
-                beta_h = 1.0
-                system_pressure = job.d + job.p
-                job_risk = job.w * (max(0, job.p + max(now, preds_completed_at[jid]) - job.d))                
-                core_score = alpha_h * system_pressure - beta_h * job_risk
-                return (core_score, job.d, job.p, -job.w, jid)
+                # Quy tắc dispatch, mặc định baseline heuristic (xem core/rules.py)
+                return rule(job, now, preds_completed_at[jid])
                 
 
         ready_heap = []      
@@ -94,15 +176,21 @@ class Scheduler:
 
         current_time = 0.0 # Sử dụng float cho thời gian
 
-       # helper: chuyển tất cả job có r <= now từ release_heap -> ready_heap (batch)
+        # helper: chuyển job có r <= now từ release_heap sang in_ready (chưa dựng lại heap)
+        def move_releases_up_to(now):
+            while release_heap and release_heap[0][0] <= now:
+                _, jid = heapq.heappop(release_heap)
+                in_ready.add(jid)
+                if tracker is not None:
+                    tracker.entered(jid)
+
+        # helper: chuyển tất cả job có r <= now từ release_heap -> ready_heap (batch)
         def pop_releases_up_to(now):
             # Sử dụng nonlocal để tác động lên biến ở scope cha
             nonlocal ready_heap
             
             # 1. Chuyển job từ release_heap sang in_ready
-            while release_heap and release_heap[0][0] <= now:
-                _, jid = heapq.heappop(release_heap)
-                in_ready.add(jid)
+            move_releases_up_to(now)
             
             # Cập nhật lại toàn bộ ready_heap bằng cách gọi ready_key
             new_heap = []
@@ -117,6 +205,9 @@ class Scheduler:
         
         # --- main loop ---
         while remaining:
+            # Cho phép dừng/tạm dừng ngay giữa một lần decode dài
+            if cancel_token is not None:
+                cancel_token.check()
             
             # 1. Xử lý trường hợp ready_heap trống (chưa có job nào sẵn sàng)
             if not ready_heap:
@@ -131,7 +222,7 @@ class Scheduler:
 
             # 2. Xử lý máy rảnh
             # Lấy máy rảnh sớm nhất
-            t_free, mid = machine_heap[0]
+            t_free = machine_pool.earliest()
             
             # Nếu máy rảnh muộn hơn thời điểm hiện tại và có job sẵn sàng, 
             # cần chuyển thời gian đến thời điểm máy rảnh.
@@ -139,12 +230,11 @@ class Scheduler:
                 current_time = t_free
                 pop_releases_up_to(current_time) # Cần kiểm tra lại release
                 
-            free_machines = []
-            # Lấy tất cả máy rảnh tại thời điểm current_time
-            while machine_heap and machine_heap[0][0] <= current_time + 1e-6:
-                free_machines.append(heapq.heappop(machine_heap))
+            # Lấy một lô máy rảnh tại thời điểm current_time, không nhiều hơn số job sẵn sàng
+            free_machines = machine_pool.take(current_time + 1e-6, len(ready_heap))
 
             # 3. Phân công (Assignments)
+            ready_count = len(ready_heap)
             assignments = []
             for _ in range(len(free_machines)):
                 # Dọn dẹp ready_heap khỏi các job đã bị xếp lịch trong các luồng khác (nếu có)
@@ -158,11 +248,13 @@ class Scheduler:
                 _, jid = heapq.heappop(ready_heap)
                 in_ready.discard(jid)
                 assignments.append(jid)
+            if tracker is not None:
+                tracker.assigned(ready_count, len(free_machines), assignments)
 
             # Schedule
             used_free = free_machines[:len(assignments)]
             unused_free = free_machines[len(assignments):]
-            
+
             for (t_free, mid), jid in zip(used_free, assignments):
                 job = self.jobs[jid]
                 
@@ -178,7 +270,7 @@ class Scheduler:
                     "end": float(completion_time) # Sử dụng key "end"
                 })
                 
-                heapq.heappush(machine_heap, (completion_time, mid))
+                machine_pool.release(completion_time, mid)
                 remaining.discard(jid)
                 
                 # Xử lý các job tiếp theo (successors)
@@ -189,12 +281,17 @@ class Scheduler:
                         # Job tiếp theo đã sẵn sàng, thêm vào release_heap để chờ r.
                         heapq.heappush(release_heap, (self.jobs[s].r, s))
                 
-                # Cập nhật ready_heap với các job mới được release/đã hoàn thành tiền nhiệm
-                pop_releases_up_to(completion_time) 
+                # Job mới được release/đã hoàn thành tiền nhiệm vào in_ready ngay
+                move_releases_up_to(completion_time)
+
+            # Dựng lại ready_heap một lần cho cả lô (key tính tại completion_time của
+            # phân công cuối, như khi dựng lại sau từng phân công)
+            if assignments:
+                pop_releases_up_to(completion_time)
 
             # Trả lại các máy rảnh không được dùng
-            for item in unused_free:
-                heapq.heappush(machine_heap, item)
+            for t_free, mid in unused_free:
+                machine_pool.release(t_free, mid)
             
             # Cập nhật current_time cho vòng lặp tiếp theo
             if assignments:
@@ -205,9 +302,31 @@ class Scheduler:
                  # Nếu không có assignment nào, current_time phải được cập nhật qua logic time jump ở đầu loop
                  pass
 
+            # Báo tiến độ dispatch: (số job đã xếp, tổng số job)
+            if progress_callback is not None:
+                progress_callback(len(self.jobs) - len(remaining), len(self.jobs))
+
         self.schedule = schedule_dict
         return schedule_dict
 
+    def evaluate(self, priority_vector: Dict[int, float] = None, cancel_token=None) -> Dict[str, Any]:
+        """Metrics của lịch decode từ priority_vector, không thay đổi self.schedule.
+
+        Với backend Numba, decode và tính metrics hoàn toàn trong kernel (không dựng schedule).
+        """
+        if jit_engine.supports(self, priority_vector):
+            if cancel_token is not None:
+                cancel_token.check()
+            metrics = jit_engine.evaluate_jit(self, priority_vector)
+            if metrics is not None:
+                return metrics
+        # Bản sao nông: decoder không sửa jobs
+        sch = Scheduler(machines=self.machines, alpha=self.alpha, beta=self.beta)
+        sch.jobs = self.jobs
+        sch.machine_ready = dict(self.machine_ready)
+        sch.greedy_schedule(priority_vector=priority_vector, cancel_token=cancel_token)
+        return sch.compute_metrics()
+
     # Đã sửa: Tính metrics an toàn hơn từ cấu trúc Dict[str, List]
     def compute_metrics(self):
         # Kiểm tra an toàn: Lịch trình phải là dict và phải chứa dữ liệu
@@ -247,4 +366,31 @@ class Scheduler:
             "totalPenalty": float(total_penalty),
             "maxLateness": int(max_lateness),
             "objectiveValue": float(objective_value)
-        }
\ No newline at end of file
+        }
+
+
+def topological_order(scheduler: Scheduler) -> List[int]:
+    """Thứ tự topo của job, ưu tiên (release, due date, id) - job sớm/gấp đứng trước."""
+    indeg = {jid: 0 for jid in scheduler.jobs}
+    succ = {jid: [] for jid in scheduler.jobs}
+    for jid, job in scheduler.jobs.items():
+        for p in job.preds:
+            if p not in scheduler.jobs:
+                raise ValueError(f"Predecessor {p} of job {jid} not found")
+            indeg[jid] += 1
+            succ[p].append(jid)
+
+    heap = [(job.r, job.d, jid) for jid, job in scheduler.jobs.items() if indeg[jid] == 0]
+    heapq.heapify(heap)
+    order = []
+    while heap:
+        _, _, jid = heapq.heappop(heap)
+        order.append(jid)
+        for s in succ[jid]:
+            indeg[s] -= 1
+            if indeg[s] == 0:
+                job = scheduler.jobs[s]
+                heapq.heappush(heap, (job.r, job.d, s))
+    if len(order) != len(scheduler.jobs):
+        raise ValueError("Cycle detected in precedence constraints")
+    return order
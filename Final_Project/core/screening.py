@@ -0,0 +1,90 @@
+import heapq
+import random
+from dataclasses import dataclass, replace
+from typing import List, Dict
+
+from .scheduler import Scheduler
+
+FIDELITIES = ("relaxed", "subset")
+
+
+@dataclass
+class ScreeningConfig:
+    ratio: float = 0.5           # tỉ lệ sói được decode chính xác mỗi vòng (tối thiểu 3 con)
+    fidelity: str = "relaxed"    # "relaxed": một lượt không xét tranh chấp máy; "subset": decode một tập job con
+    subset_fraction: float = 0.3
+    exact_after: float = 0.7     # từ vòng max_iter * exact_after trở đi đánh giá chính xác toàn bộ
+    audit_every: int = 5         # cứ mỗi audit_every vòng sàng lọc thì đánh giá đủ để đo sai lệch (0 = tắt)
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.fidelity not in FIDELITIES:
+            raise ValueError(f"Unknown screening fidelity '{self.fidelity}'")
+        if not (0 < self.ratio <= 1) or not (0 < self.subset_fraction <= 1):
+            raise ValueError("ratio và subset_fraction phải nằm trong (0, 1]")
+
+
+class Screener:
+    """Ước lượng fitness rẻ để xếp hạng sói trước khi decode chính xác.
+
+    - relaxed: duyệt job theo priority (tôn trọng tiền nhiệm) một lượt, m máy được gộp
+      thành một "máy lỏng" tốc độ m; không mô phỏng từng máy nên rẻ hơn decode.
+    - subset: decode chính xác trên một tập job con cố định (chọn ngẫu nhiên theo seed),
+      bỏ các ràng buộc tới job ngoài tập và giảm số máy theo cùng tỉ lệ.
+    Giá trị chỉ dùng để so sánh giữa các sói, không so được với objective thật.
+    """
+
+    def __init__(self, scheduler: Scheduler, config: ScreeningConfig):
+        self.sch = scheduler
+        self.config = config
+        self.succ: Dict[int, List[int]] = {jid: [] for jid in scheduler.jobs}
+        self.indeg: Dict[int, int] = {jid: 0 for jid in scheduler.jobs}
+        for jid, job in scheduler.jobs.items():
+            for p in job.preds:
+                if p in self.succ:
+                    self.succ[p].append(jid)
+                    self.indeg[jid] += 1
+        self.sub = self._build_subset() if config.fidelity == "subset" else None
+
+    def _build_subset(self) -> Scheduler:
+        rng = random.Random(self.config.seed)
+        ids = sorted(self.sch.jobs)
+        k = max(1, int(round(len(ids) * self.config.subset_fraction)))
+        chosen = set(rng.sample(ids, k))
+        machines = max(1, int(round(self.sch.machines * self.config.subset_fraction)))
+        sub = Scheduler(machines=machines, alpha=self.sch.alpha, beta=self.sch.beta)
+        for jid in ids:
+            if jid in chosen:
+                job = self.sch.jobs[jid]
+                sub.jobs[jid] = replace(job, preds=[p for p in job.preds if p in chosen])
+        return sub
+
+    def score(self, vector: Dict[int, float]) -> float:
+        if self.sub is not None:
+            self.sub.greedy_schedule(priority_vector=vector)
+            return self.sub.compute_metrics()["objectiveValue"]
+        return self._relaxed(vector)
+
+    def _relaxed(self, vector: Dict[int, float]) -> float:
+        jobs = self.sch.jobs
+        m = max(1, self.sch.machines)
+        indeg = dict(self.indeg)
+        pred_done = {jid: 0.0 for jid in jobs}
+        heap = [(vector.get(jid, 0), jobs[jid].d, jid) for jid in jobs if indeg[jid] == 0]
+        heapq.heapify(heap)
+        load = min((self.sch.machine_ready.get(k, 0) for k in range(1, m + 1)), default=0)
+        makespan = 0.0
+        penalty = 0.0
+        while heap:
+            _, _, jid = heapq.heappop(heap)
+            job = jobs[jid]
+            c = max(job.r, pred_done[jid], load) + job.p
+            load = max(load, job.r) + job.p / m
+            makespan = max(makespan, c)
+            penalty += job.w * max(0.0, c - job.d)
+            for s in self.succ[jid]:
+                pred_done[s] = max(pred_done[s], c)
+                indeg[s] -= 1
+                if indeg[s] == 0:
+                    heapq.heappush(heap, (vector.get(s, 0), jobs[s].d, s))
+        return self.sch.alpha * makespan + self.sch.beta * penalty
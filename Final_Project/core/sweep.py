@@ -0,0 +1,177 @@
+import copy
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, asdict
+from typing import List, Dict, Any, Callable, Iterable, Tuple
+
+from .scheduler import Scheduler
+from .gwo import GWOScheduler
+
+
+@dataclass(frozen=True)
+class SweepConfig:
+    pop_size: int
+    max_iter: int
+    alpha: float
+    beta: float
+    seed: int = 0
+
+    def key(self) -> Tuple:
+        return (self.pop_size, self.max_iter, float(self.alpha), float(self.beta), self.seed)
+
+    def group_key(self) -> Tuple:
+        # Cùng cấu hình, khác seed
+        return (self.pop_size, self.max_iter, float(self.alpha), float(self.beta))
+
+
+def expand_grid(pop_sizes: Iterable[int], max_iters: Iterable[int],
+                alphas: Iterable[float], betas: Iterable[float],
+                seeds: Iterable[int] = (0,)) -> List[SweepConfig]:
+    return [SweepConfig(int(p), int(it), float(a), float(b), int(sd))
+            for p, it, a, b, sd in itertools.product(pop_sizes, max_iters, alphas, betas, seeds)]
+
+
+def instance_fingerprint(instance_data: Dict[str, Any]) -> str:
+    # alpha/beta thuộc về cấu hình sweep nên không đưa vào fingerprint
+    payload = {"machines": int(instance_data.get('machines', 1)), "jobs": instance_data.get('jobs', [])}
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def run_config(instance_data: Dict[str, Any], config: SweepConfig) -> Dict[str, Any]:
+    # Hàm top-level để chạy trong process con
+    data = dict(instance_data)
+    data['alpha'] = config.alpha
+    data['beta'] = config.beta
+    sch = Scheduler.from_dict(data)
+
+    start_time = time.time()
+    gwo = GWOScheduler(copy.deepcopy(sch), pop_size=config.pop_size, max_iter=config.max_iter, seed=config.seed)
+    vector, _ = gwo.solve()
+    sch.greedy_schedule(priority_vector=vector)
+    metrics = sch.compute_metrics()
+    metrics['executionTime'] = time.time() - start_time
+
+    return {
+        "config": asdict(config),
+        "metrics": metrics,
+        "schedule": sch.schedule,
+        "vector": vector,
+        "fitness_history": gwo.best_fitness_history,
+    }
+
+
+def summarize(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Gộp kết quả theo cấu hình (bỏ qua seed): giữ lịch tốt nhất và giá trị trung bình."""
+    groups: Dict[Tuple, List[Dict[str, Any]]] = {}
+    for res in results:
+        cfg = SweepConfig(**res['config'])
+        groups.setdefault(cfg.group_key(), []).append(res)
+
+    rows = []
+    for (pop_size, max_iter, alpha, beta), runs in groups.items():
+        best = min(runs, key=lambda r: r['metrics']['objectiveValue'])
+        objs = [r['metrics']['objectiveValue'] for r in runs]
+        rows.append({
+            "pop_size": pop_size,
+            "max_iter": max_iter,
+            "alpha": alpha,
+            "beta": beta,
+            "runs": len(runs),
+            "best_objective": best['metrics']['objectiveValue'],
+            "mean_objective": sum(objs) / len(objs),
+            "makespan": best['metrics']['makespan'],
+            "totalPenalty": best['metrics']['totalPenalty'],
+            "mean_time": sum(r['metrics']['executionTime'] for r in runs) / len(runs),
+            "best": best,
+        })
+    rows.sort(key=lambda r: r['best_objective'])
+    return rows
+
+
+class SweepRunner:
+    """Chạy nhiều cấu hình GWO song song trên process pool, có cache kết quả.
+
+    Cache theo (fingerprint instance, cấu hình) nên khi mở rộng sweep chỉ những điểm
+    mới được chạy. Nếu có cache_path, cache được lưu ra file JSON sau mỗi kết quả.
+    """
+
+    def __init__(self, max_workers: int = None, cache_path: str = None):
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.cache_path = cache_path
+        self.cache: Dict[str, Dict[str, Any]] = {}
+        if cache_path and os.path.exists(cache_path):
+            self._load_cache()
+
+    @staticmethod
+    def _cache_key(fingerprint: str, config: SweepConfig) -> str:
+        return f"{fingerprint}:{json.dumps(config.key())}"
+
+    def _load_cache(self):
+        with open(self.cache_path, 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+        for key, res in raw.items():
+            # JSON biến key int thành str
+            res['vector'] = {int(k): v for k, v in res.get('vector', {}).items()}
+            self.cache[key] = res
+
+    def _save_cache(self):
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def pending(self, instance_data: Dict[str, Any], configs: List[SweepConfig]) -> List[SweepConfig]:
+        fp = instance_fingerprint(instance_data)
+        return [c for c in configs if self._cache_key(fp, c) not in self.cache]
+
+    def run(self, instance_data: Dict[str, Any], configs: List[SweepConfig],
+            on_result: Callable[[Dict[str, Any], bool], None] = None,
+            cancel_token=None) -> List[Dict[str, Any]]:
+        fp = instance_fingerprint(instance_data)
+        results = []
+        todo = []
+        seen = set()
+        for config in configs:
+            key = self._cache_key(fp, config)
+            if key in seen:
+                continue
+            seen.add(key)
+            if key in self.cache:
+                results.append(self.cache[key])
+                if on_result:
+                    on_result(self.cache[key], True)
+            else:
+                todo.append(config)
+
+        if not todo:
+            return results
+
+        # "spawn": SweepThread chạy trong process GUI, không fork process đang chạy Qt
+        pool = ProcessPoolExecutor(max_workers=min(self.max_workers, len(todo)),
+                                   mp_context=multiprocessing.get_context("spawn"))
+        cancelled = False
+        try:
+            futures = {pool.submit(run_config, instance_data, c): c for c in todo}
+            not_done = set(futures)
+            while not_done:
+                if cancel_token is not None and cancel_token.cancelled:
+                    cancelled = True
+                    break
+                done, not_done = wait(not_done, timeout=0.2, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    res = fut.result()
+                    self.cache[self._cache_key(fp, futures[fut])] = res
+                    if self.cache_path:
+                        self._save_cache()
+                    results.append(res)
+                    if on_result:
+                        on_result(res, False)
+        finally:
+            # Khi bị dừng: hủy các cấu hình chưa bắt đầu, không chờ các cấu hình đang chạy
+            pool.shutdown(wait=not cancelled, cancel_futures=True)
+        return results
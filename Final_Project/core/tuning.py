@@ -0,0 +1,311 @@
+"""Tự động chỉnh tham số GWO bằng F-race trên một tập instance.
+
+Các cấu hình ứng viên được chạy song song trên từng "block" (một instance + một seed).
+Sau mỗi block, kiểm định Friedman trên hạng trong block; nếu có khác biệt có ý nghĩa
+thì loại các cấu hình có tổng hạng tệ hơn cấu hình tốt nhất quá ngưỡng post-hoc
+(Conover). Cuộc đua dừng khi hết ngân sách CPU, hết block hoặc chỉ còn một cấu hình.
+Instance được chia theo lớp kích thước, mỗi lớp một cuộc đua; cấu hình thắng được ghi
+vào gwo_defaults.json cho GUI và CLI dùng làm mặc định.
+
+Chạy (trong thư mục Final_Project):
+    python -m core.tuning "../Example/*.json" --generate --budget 600
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, field
+from statistics import NormalDist
+from typing import List, Dict, Any, Tuple, Optional, Iterable
+
+from .scheduler import Scheduler
+from .gwo import GWOScheduler
+from .instances import generated_set, load_instances
+
+DEFAULTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gwo_defaults.json")
+
+# (tên lớp, số job tối đa); lớp cuối không giới hạn
+SIZE_CLASSES: Tuple[Tuple[str, Optional[int]], ...] = (("small", 50), ("medium", 500), ("large", None))
+
+
+def size_class(n_jobs: int) -> str:
+    for name, limit in SIZE_CLASSES:
+        if limit is None or n_jobs <= limit:
+            return name
+    return SIZE_CLASSES[-1][0]
+
+
+@dataclass(frozen=True)
+class TuningConfig:
+    pop_size: int
+    max_iter: int
+    lower: float = -1.0
+    upper: float = 1.0
+    scale_init: bool = False
+
+    def label(self) -> str:
+        scale = " scaled" if self.scale_init else ""
+        return f"pop={self.pop_size} iter={self.max_iter} [{self.lower:g}, {self.upper:g}]{scale}"
+
+    def gwo_kwargs(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> 'TuningConfig':
+        return TuningConfig(
+            pop_size=int(d['pop_size']),
+            max_iter=int(d['max_iter']),
+            lower=float(d.get('lower', -1.0)),
+            upper=float(d.get('upper', 1.0)),
+            scale_init=bool(d.get('scale_init', False))
+        )
+
+
+def candidate_grid(pop_sizes: Iterable[int] = (10, 20, 40), max_iters: Iterable[int] = (20, 50),
+                   bounds: Iterable[Tuple[float, float]] = ((-1.0, 1.0), (-10.0, 10.0)),
+                   scale_inits: Iterable[bool] = (False, True)) -> List[TuningConfig]:
+    out = []
+    for p, it, (lo, hi), sc in itertools.product(pop_sizes, max_iters, bounds, scale_inits):
+        if lo >= hi:
+            raise ValueError(f"Cận không hợp lệ: lower={lo} >= upper={hi}")
+        out.append(TuningConfig(int(p), int(it), float(lo), float(hi), bool(sc)))
+    return out
+
+
+def run_candidate(instance_data: Dict[str, Any], config: TuningConfig, seed: int) -> Dict[str, float]:
+    # Hàm top-level để chạy trong process con; thời gian là thời gian CPU của process
+    start = time.process_time()
+    sch = Scheduler.from_dict(instance_data)
+    gwo = GWOScheduler(sch, seed=seed, **config.gwo_kwargs())
+    _, best = gwo.solve()
+    return {"objective": best, "time": time.process_time() - start}
+
+
+# ---------- thống kê ----------
+def block_ranks(values: List[float]) -> List[float]:
+    # Hạng 1..k trong một block, giá trị bằng nhau nhận hạng trung bình
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+
+def chi2_sf(x: float, df: int) -> float:
+    # P(X >= x) với X ~ chi bình phương(df), xấp xỉ Wilson–Hilferty
+    if x <= 0:
+        return 1.0
+    z = ((x / df) ** (1 / 3) - (1 - 2 / (9 * df))) / math.sqrt(2 / (9 * df))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def t_quantile(p: float, df: int) -> float:
+    # Phân vị phân phối Student t, khai triển Cornish–Fisher quanh phân vị chuẩn
+    z = NormalDist().inv_cdf(p)
+    return (z + (z ** 3 + z) / (4 * df) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * df ** 3))
+
+
+def friedman_eliminate(blocks: List[List[float]], alpha: float = 0.05) -> Tuple[float, List[int]]:
+    """Kiểm định Friedman trên ma trận blocks (mỗi hàng là objective của k cấu hình).
+
+    Trả về (p-value, chỉ số các cấu hình bị loại). Loại cấu hình j khi p < alpha và
+    tổng hạng R_j - R_best vượt ngưỡng post-hoc của Conover.
+    """
+    b, k = len(blocks), len(blocks[0])
+    if b < 2 or k < 2:
+        return 1.0, []
+    ranks = [block_ranks(row) for row in blocks]
+    rank_sums = [sum(r[j] for r in ranks) for j in range(k)]
+    A = sum(x * x for r in ranks for x in r)
+    C = b * k * (k + 1) ** 2 / 4
+    if A - C <= 1e-12:
+        # Mọi block đều hòa hoàn toàn
+        return 1.0, []
+    T = (k - 1) * (sum(R * R for R in rank_sums) - b * C) / (A - C)
+    p_value = chi2_sf(T, k - 1)
+    if p_value >= alpha:
+        return p_value, []
+    df = (b - 1) * (k - 1)
+    scale = 2 * b * (A - C) / df * max(0.0, 1 - T / (b * (k - 1)))
+    threshold = t_quantile(1 - alpha / 2, df) * math.sqrt(scale)
+    best = min(rank_sums)
+    return p_value, [j for j in range(k) if rank_sums[j] - best > threshold]
+
+
+# ---------- cuộc đua ----------
+@dataclass
+class RaceResult:
+    size_class: str
+    best: TuningConfig
+    survivors: List[TuningConfig]
+    mean_rank: Dict[str, float]        # label -> hạng trung bình trên các block đã chạy
+    blocks: int
+    cpu_seconds: float
+    conclusive: bool                   # đã chạy đủ min_blocks để kiểm định
+    eliminated: List[Tuple[int, str]] = field(default_factory=list)   # (block, label)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "config": asdict(self.best),
+            "survivors": [asdict(c) for c in self.survivors],
+            "mean_rank": self.mean_rank,
+            "blocks": self.blocks,
+            "cpu_seconds": round(self.cpu_seconds, 3),
+            "conclusive": self.conclusive,
+            "eliminated": [list(e) for e in self.eliminated],
+        }
+
+
+class FRace:
+    """F-race trên một tập instance (cùng lớp kích thước).
+
+    Block thứ i dùng instance thứ (i mod số instance) với seed i, thứ tự instance được
+    xáo theo `seed`. Ngân sách tính bằng tổng thời gian CPU của mọi lần chạy GWO.
+    """
+
+    def __init__(self, candidates: List[TuningConfig], instances: List[Tuple[str, Dict[str, Any]]],
+                 budget_seconds: float = 300.0, alpha: float = 0.05, min_blocks: int = 5,
+                 max_blocks: int = 200, max_workers: int = None, seed: int = 0):
+        if not candidates or not instances:
+            raise ValueError("Cần ít nhất một cấu hình và một instance")
+        self.candidates = list(dict.fromkeys(candidates))
+        self.instances = list(instances)
+        random.Random(seed).shuffle(self.instances)
+        self.budget_seconds = budget_seconds
+        self.alpha = alpha
+        self.min_blocks = min_blocks
+        self.max_blocks = max_blocks
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+
+    def run(self, name: str = "", on_block=None, cancel_token=None) -> RaceResult:
+        alive = list(range(len(self.candidates)))
+        rows: Dict[int, List[float]] = {i: [] for i in alive}   # objective theo block của từng cấu hình
+        times: Dict[int, float] = {i: 0.0 for i in alive}
+        eliminated = []
+        spent = 0.0
+        block_cost = 0.0
+        b = 0
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(alive))) as pool:
+            # Không bắt đầu block mới nếu block trước cho thấy sẽ vượt ngân sách
+            while b < self.max_blocks and spent + block_cost <= self.budget_seconds and len(alive) > 1:
+                if cancel_token is not None and cancel_token.cancelled:
+                    break
+                before = spent
+                inst_name, data = self.instances[b % len(self.instances)]
+                futures = {i: pool.submit(run_candidate, data, self.candidates[i], b) for i in alive}
+                for i, fut in futures.items():
+                    res = fut.result()
+                    rows[i].append(res['objective'])
+                    times[i] += res['time']
+                    spent += res['time']
+                b += 1
+                block_cost = spent - before
+
+                if b >= self.min_blocks:
+                    # Chỉ so sánh trên các block mà mọi cấu hình còn sống đều đã chạy
+                    matrix = [[rows[i][blk] for i in alive] for blk in range(b)]
+                    p_value, worse = friedman_eliminate(matrix, self.alpha)
+                    for idx in worse:
+                        eliminated.append((b, self.candidates[alive[idx]].label()))
+                    alive = [i for idx, i in enumerate(alive) if idx not in set(worse)]
+                if on_block:
+                    on_block(name, b, inst_name, len(alive), spent)
+
+        ranks = [block_ranks([rows[i][blk] for i in alive]) for blk in range(b)]
+        mean_rank = {self.candidates[i].label(): (sum(r[idx] for r in ranks) / b if b else 0.0)
+                     for idx, i in enumerate(alive)}
+        # Hạng tốt nhất; hòa thì ưu tiên cấu hình tốn ít thời gian hơn
+        best = min(alive, key=lambda i: (mean_rank[self.candidates[i].label()], times[i]))
+        return RaceResult(name, self.candidates[best], [self.candidates[i] for i in alive],
+                          mean_rank, b, spent, b >= self.min_blocks or len(alive) == 1, eliminated)
+
+
+def tune(instances: List[Tuple[str, Dict[str, Any]]], candidates: List[TuningConfig] = None,
+         budget_seconds: float = 300.0, on_block=None, cancel_token=None, **race_kwargs) -> Dict[str, RaceResult]:
+    """Chạy một F-race cho mỗi lớp kích thước; ngân sách chia theo số instance của lớp."""
+    candidates = candidates or candidate_grid()
+    by_class: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+    for name, data in instances:
+        by_class.setdefault(size_class(len(data.get('jobs', []))), []).append((name, data))
+    results = {}
+    for cls, members in by_class.items():
+        budget = budget_seconds * len(members) / len(instances)
+        race = FRace(candidates, members, budget_seconds=budget, **race_kwargs)
+        results[cls] = race.run(cls, on_block=on_block, cancel_token=cancel_token)
+    return results
+
+
+# ---------- file mặc định ----------
+def write_defaults(results: Dict[str, RaceResult], path: str = DEFAULTS_PATH) -> List[str]:
+    """Ghi cấu hình thắng của các lớp có kết luận; trả về danh sách lớp đã ghi.
+
+    Lớp chưa chạy đủ min_blocks (thường do hết ngân sách) không được ghi, giữ nguyên
+    kết quả cũ của lớp đó nếu có.
+    """
+    data = load_defaults(path) if os.path.exists(path) else {}
+    written = []
+    for cls, res in results.items():
+        if res.conclusive:
+            data[cls] = res.to_dict()
+            written.append(cls)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+    return written
+
+
+def load_defaults(path: str = DEFAULTS_PATH) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def defaults_for(n_jobs: int, path: str = DEFAULTS_PATH) -> Optional[TuningConfig]:
+    """Cấu hình đã tune cho lớp kích thước của instance; None nếu chưa có file/lớp."""
+    if not os.path.exists(path):
+        return None
+    entry = load_defaults(path).get(size_class(n_jobs))
+    return TuningConfig.from_dict(entry['config']) if entry else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chỉnh tham số GWO bằng F-race trên một tập instance.")
+    parser.add_argument("patterns", nargs="*", help="Glob các file instance JSON")
+    parser.add_argument("--generate", action="store_true", help="Thêm các instance sinh ngẫu nhiên")
+    parser.add_argument("--budget", type=float, default=300.0, help="Tổng ngân sách CPU (giây)")
+    parser.add_argument("--min-blocks", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=DEFAULTS_PATH)
+    args = parser.parse_args(argv)
+
+    instances = load_instances(args.patterns)
+    if args.generate:
+        instances += generated_set([(20, 3), (40, 5), (120, 5), (300, 10), (800, 20)])
+    if not instances:
+        parser.error("Không có instance nào")
+
+    def report(cls, b, inst_name, alive, spent):
+        print(f"[{cls}] block {b} ({inst_name}): còn {alive} cấu hình, CPU {spent:.1f}s", flush=True)
+
+    results = tune(instances, budget_seconds=args.budget, on_block=report,
+                   min_blocks=args.min_blocks, max_workers=args.workers)
+    for cls, res in results.items():
+        note = "" if res.conclusive else ", chưa đủ block - không ghi"
+        print(f"{cls:7s} {res.best.label()}  ({res.blocks} block, {len(res.survivors)} cấu hình còn lại{note})")
+    written = write_defaults(results, args.output)
+    print(f"Đã ghi {', '.join(written) or 'không lớp nào'} vào {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""Kiểm tra tính khả thi của một lịch trình.
+
+Kiểm tra một file lịch trình (trong thư mục Final_Project):
+    python -m core.validation Example/hard_ex.json schedule.json
+Không truyền file lịch trình thì lịch được decode bằng greedy_schedule rồi kiểm tra.
+"""
+import argparse
+import json
+from collections import Counter
+from operator import itemgetter
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional
+
+from .scheduler import Scheduler
+
+# Các loại vi phạm
+MISSING = "missing"          # job không có trong lịch
+DUPLICATE = "duplicate"      # job xuất hiện nhiều lần
+UNKNOWN = "unknown"          # task tham chiếu job không tồn tại
+MACHINE = "machine"          # tên máy không hợp lệ / task nằm sai máy
+DURATION = "duration"        # end - start khác p
+RELEASE = "release"          # bắt đầu trước release time
+MACHINE_READY = "machine_ready"  # bắt đầu trước khi máy rảnh
+OVERLAP = "overlap"          # hai task chồng nhau trên cùng một máy
+PRECEDENCE = "precedence"    # bắt đầu trước khi tiền nhiệm hoàn thành
+
+
+@dataclass
+class Violation:
+    kind: str
+    job: Optional[int]
+    message: str
+    machine: Optional[str] = None
+    other: Optional[int] = None   # job liên quan (tiền nhiệm, task chồng lấn)
+    amount: float = 0.0           # mức vi phạm (đơn vị thời gian)
+
+
+@dataclass
+class ValidationReport:
+    tasks: int
+    violations: List[Violation] = field(default_factory=list)
+    truncated: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations
+
+    def counts(self) -> Dict[str, int]:
+        return dict(Counter(v.kind for v in self.violations))
+
+    def summary(self) -> str:
+        if self.ok:
+            return f"Lịch hợp lệ ({self.tasks} task)"
+        parts = ", ".join(f"{kind}: {n}" for kind, n in sorted(self.counts().items()))
+        more = " (đã cắt bớt)" if self.truncated else ""
+        return f"Lịch không hợp lệ - {len(self.violations)} vi phạm{more} [{parts}]"
+
+    def raise_if_invalid(self):
+        if not self.ok:
+            first = self.violations[0].message
+            raise ValueError(f"{self.summary()}; ví dụ: {first}")
+
+
+def validate_schedule(scheduler: Scheduler, schedule: Dict[str, List[Dict[str, Any]]] = None,
+                      tol: float = 1e-6, max_violations: int = None) -> ValidationReport:
+    """Kiểm tra mọi ràng buộc của lịch trình trong O(n log n).
+
+    Task của mỗi máy được sắp theo thời điểm bắt đầu nên kiểm tra chồng lấn chỉ cần
+    một lượt qua danh sách đã sắp; mỗi cạnh tiền nhiệm được kiểm tra một lần qua tra
+    cứu dict. Mặc định kiểm tra scheduler.schedule.
+    """
+    if schedule is None:
+        schedule = scheduler.schedule
+    jobs = scheduler.jobs
+    report = ValidationReport(tasks=sum(len(tasks) for tasks in schedule.values()))
+    limit = max_violations if max_violations is not None else float('inf')
+
+    def add(kind, job, message, **kw):
+        if len(report.violations) >= limit:
+            report.truncated = True
+            return False
+        report.violations.append(Violation(kind, job, message, **kw))
+        return True
+
+    # --- mỗi job đúng một lần, trên máy hợp lệ ---
+    start_of: Dict[int, float] = {}
+    end_of: Dict[int, float] = {}
+    machine_of: Dict[int, str] = {}
+    valid_names = {f"M{m}" for m in range(1, scheduler.machines + 1)}
+    per_machine: Dict[str, List[tuple]] = {}   # máy -> [(start, end, job)] của job hợp lệ
+    for mname, tasks in schedule.items():
+        if mname not in valid_names:
+            add(MACHINE, None, f"Máy {mname} không tồn tại (có {scheduler.machines} máy)", machine=mname)
+            continue
+        intervals = per_machine[mname] = []
+        for task in tasks:
+            jid = task.get('job')
+            if task.get('machine', mname) != mname:
+                add(MACHINE, jid, f"Job {jid} ghi máy {task.get('machine')} nhưng nằm trong danh sách {mname}",
+                    machine=mname)
+            if jid not in jobs:
+                add(UNKNOWN, jid, f"Job {jid} trên {mname} không có trong dữ liệu", machine=mname)
+                continue
+            intervals.append((task['start'], task['end'], jid))
+            if jid in start_of:
+                add(DUPLICATE, jid, f"Job {jid} xuất hiện trên cả {machine_of[jid]} và {mname}", machine=mname)
+            else:
+                start_of[jid] = task['start']
+                end_of[jid] = task['end']
+                machine_of[jid] = mname
+    if len(start_of) < len(jobs):
+        for jid in jobs:
+            if jid not in start_of and not add(MISSING, jid, f"Job {jid} không được xếp lịch"):
+                break
+
+    # --- thời lượng, release, thời điểm rảnh máy ---
+    for jid, s in start_of.items():
+        job = jobs[jid]
+        e = end_of[jid]
+        if abs((e - s) - job.p) > tol:
+            add(DURATION, jid, f"Job {jid}: end - start = {e - s} khác p = {job.p}",
+                machine=machine_of[jid], amount=abs((e - s) - job.p))
+        if s < job.r - tol:
+            add(RELEASE, jid, f"Job {jid} bắt đầu tại {s} trước release {job.r}",
+                machine=machine_of[jid], amount=job.r - s)
+
+    # --- chồng lấn: task trên từng máy sắp theo (start, end) ---
+    for mname, intervals in per_machine.items():
+        if not intervals:
+            continue
+        intervals.sort(key=itemgetter(0, 1))   # ổn định: task trùng (start, end) giữ thứ tự trong lịch
+        ready = scheduler.machine_ready.get(int(mname[1:]), 0)
+        first_start, _, first_job = intervals[0]
+        if first_start < ready - tol:
+            add(MACHINE_READY, first_job, f"Job {first_job} bắt đầu tại {first_start} "
+                f"trước khi {mname} rảnh ({ready})", machine=mname, amount=ready - first_start)
+        # Hết hạn của task trước phải <= bắt đầu của task sau (dùng max cộng dồn để bắt
+        # cả trường hợp một task dài bao trùm nhiều task sau)
+        prev_end = float('-inf')
+        prev_job = None
+        for s, e, jid in intervals:
+            if s < prev_end - tol:
+                add(OVERLAP, jid, f"Job {jid} trên {mname} bắt đầu tại {s} khi job {prev_job} chưa xong ({prev_end})",
+                    machine=mname, other=prev_job, amount=prev_end - s)
+            if e > prev_end:
+                prev_end = e
+                prev_job = jid
+
+    # --- tiền nhiệm: start của job >= end của mọi tiền nhiệm đã xếp ---
+    for jid, s in start_of.items():
+        for p in jobs[jid].preds:
+            e = end_of.get(p)
+            if e is not None and s < e - tol:
+                if not add(PRECEDENCE, jid, f"Job {jid} bắt đầu tại {s} trước khi tiền nhiệm {p} "
+                           f"hoàn thành ({e})", machine=machine_of[jid], other=p, amount=e - s):
+                    return report
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kiểm tra tính khả thi của lịch trình.")
+    parser.add_argument("input", help="File instance JSON")
+    parser.add_argument("schedule", nargs="?", help="File lịch trình {M1: [...], ...}; bỏ trống để decode greedy")
+    parser.add_argument("--max-violations", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        sch = Scheduler.from_dict(json.load(f))
+    if args.schedule:
+        with open(args.schedule, 'r', encoding='utf-8') as f:
+            schedule = json.load(f)
+    else:
+        schedule = sch.greedy_schedule()
+    report = validate_schedule(sch, schedule, max_violations=args.max_violations)
+    print(report.summary())
+    for v in report.violations:
+        print(f"  [{v.kind}] {v.message}")
+    return 0 if report.ok else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,14 +1,26 @@
 import sys
+import argparse
+import threading
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import Qt
 
+from core import jit_engine
 from ui.app_window import MainWindow
 
 if __name__ == '__main__':
     if not hasattr(Qt.AlignmentFlag, 'AlignCenter') and hasattr(Qt, 'AlignCenter'):
         Qt.AlignmentFlag.AlignCenter = Qt.AlignCenter
-        
-    app = QApplication(sys.argv)
+
+    # --decoder python|numba ép backend decode (mặc định auto: Numba nếu đã cài)
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--decoder", choices=jit_engine.BACKENDS, default=None)
+    args, qt_argv = parser.parse_known_args(sys.argv[1:])
+    if args.decoder:
+        jit_engine.set_backend(args.decoder)
+    # Biên dịch / nạp kernel từ cache đĩa ở nền để không làm chậm lúc mở GUI
+    threading.Thread(target=jit_engine.warmup, daemon=True).start()
+
+    app = QApplication([sys.argv[0]] + qt_argv)
     window = MainWindow()
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    sys.exit(app.exec())
@@ -1,26 +1,35 @@
 import sys
-import copy
 import json
 import os 
+import time
 import traceback 
-import time  
 from typing import Dict, Any, List
 
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QTextEdit, QTabWidget, QLabel,
     QMessageBox, QLineEdit, QSplitter,
-    QFileDialog, QGroupBox
+    QFileDialog, QGroupBox, QProgressBar, QCheckBox, QComboBox
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 
 # Import modules đã phân chia
 from core.scheduler import Scheduler
-from ui.worker import GWOThread
-from ui.components import GanttChartWidget, MetricsDisplayWidget, ScheduleGridDisplay
+from ui.worker import GWOThread, EngineThread, BaselineThread, GanttExportThread, SweepThread, ParetoThread
+from ui.components import (GanttChartWidget, MetricsDisplayWidget, ScheduleGridDisplay, ResultsTableWidget,
+                           ConvergenceChartWidget, ParetoFrontWidget)
+from core.sweep import SweepRunner, expand_grid, summarize, instance_fingerprint
+from core.portfolio import seed_vector
+from core.screening import ScreeningConfig
+from core.tuning import defaults_for, size_class
+from core.optimizers import ENGINES
+from core.pareto import ParetoArchive, reweighted
 
 class MainWindow(QMainWindow):
+    LOG_MAX_LINES = 1000
+    GWO_PROGRESS_RATE = 10.0  # số lần cập nhật progress tối đa mỗi giây
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("🐺 GWOScheduler App 💰 - Hệ thống Tối ưu hóa Xếp lịch")
@@ -28,13 +37,49 @@ class MainWindow(QMainWindow):
         
         self.scheduler: Scheduler = None 
         self.gwo_thread: GWOThread = None
+        self.baseline_thread: BaselineThread = None
+        self.gwo_running = False
+        self.baseline_running = False
+        self.baseline_announce = False
+        self.gwo_result_shown = False
+        self.gap_target: float = None
+        self.engine_time_limit: float = 60.0
+        # Vector từ quy tắc dispatch tốt nhất: init_vector nếu đã có, nếu không thì đưa vào
+        # GWO đang chạy (GWOThread.seed) khi Baseline xong
+        self.gwo_instance_key: str = None
+        self.baseline_seed: Dict[int, float] = None
+        self.baseline_seed_key: str = None
+        self.baseline_instance_key: str = None
+        self.export_thread: GanttExportThread = None
+        self.sweep_thread: SweepThread = None
+        self.sweep_runner = SweepRunner()
+        self.sweep_results: List[Dict[str, Any]] = []
+        self.sweep_rows: List[Dict[str, Any]] = []
+        self.instance_data: Dict[str, Any] = {}
         self.last_schedule_data: Dict[str, List[Dict[str, Any]]] = {}
+        # Archive Pareto (makespan, penalty) của instance hiện tại: đổi alpha/beta chọn lại tức thì
+        self.pareto_archive: ParetoArchive = None
+        self.pareto_key: str = None
+        self.pareto_thread: ParetoThread = None
+        # Metrics của từng quy tắc dispatch (chọn lại quy tắc tốt nhất khi đổi alpha/beta)
+        self.baseline_portfolio: List[Dict[str, Any]] = []
 
         self.init_ui()
         
         self.load_json_btn.clicked.connect(self.load_json_file)
         self.run_baseline_btn.clicked.connect(lambda: self.run_optimization(is_gwo=False))
         self.run_gwo_btn.clicked.connect(lambda: self.run_optimization(is_gwo=True))
+        self.export_gantt_btn.clicked.connect(self.export_gantt_image)
+        self.stop_gwo_btn.clicked.connect(self.stop_gwo)
+        self.pause_gwo_btn.clicked.connect(self.toggle_pause_gwo)
+        self.run_sweep_btn.clicked.connect(self.run_sweep)
+        self.stop_sweep_btn.clicked.connect(self.stop_sweep)
+        self.sweep_table.itemSelectionChanged.connect(self.sweep_row_selected)
+        self.alpha_input.editingFinished.connect(self.reweight_from_pareto)
+        self.beta_input.editingFinished.connect(self.reweight_from_pareto)
+        self.pareto_select_btn.clicked.connect(self.reweight_from_pareto)
+        self.run_pareto_btn.clicked.connect(self.run_pareto)
+        self.stop_pareto_btn.clicked.connect(self.stop_pareto)
 
     def _show_message_box(self, title, text, icon_type):
         msg = QMessageBox(self)
@@ -75,6 +120,7 @@ class MainWindow(QMainWindow):
                 
                 self.json_input.setText(data)
                 self.gwo_log.append(f"✨ Tải file: '{os.path.basename(file_name)}' thành công. ✨")
+                self._apply_tuned_defaults(json.loads(data))
             except json.JSONDecodeError as e: 
                 self._show_message_box("Lỗi File", f"File được chọn không phải là JSON hợp lệ. Chi tiết lỗi: {e}", QMessageBox.Icon.Critical)
             except UnicodeDecodeError:
@@ -84,6 +130,23 @@ class MainWindow(QMainWindow):
     
     
     
+    def _tuned_defaults(self, n_jobs: int):
+        # Cấu hình GWO đã tune (python -m core.tuning) cho lớp kích thước; file lỗi thì bỏ qua
+        try:
+            return defaults_for(n_jobs)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _apply_tuned_defaults(self, data):
+        if not isinstance(data, dict) or not isinstance(data.get('jobs'), list):
+            return
+        tuned = self._tuned_defaults(len(data['jobs']))
+        if tuned is None:
+            return
+        self.pop_size_input.setText(str(tuned.pop_size))
+        self.max_iter_input.setText(str(tuned.max_iter))
+        self.gwo_log.append(f"🎛️ Dùng tham số đã tune cho lớp '{size_class(len(data['jobs']))}': {tuned.label()}")
+
     def load_scheduler(self):
         try:
             data_text = self.json_input.toPlainText()
@@ -104,6 +167,7 @@ class MainWindow(QMainWindow):
                 data['jobs'] = [] 
 
             self.scheduler = Scheduler.from_dict(data) 
+            self.instance_data = data
             return True
         except Exception as e:
             print(f"TRACEBACK LOAD SCHEDULER FAILED:\n{traceback.format_exc()}")
@@ -111,81 +175,382 @@ class MainWindow(QMainWindow):
             return False
 
     def run_optimization(self, is_gwo: bool):
+        if is_gwo and self.gwo_running:
+            self._show_message_box("Cảnh báo", "GWO đang chạy. Vui lòng chờ hoặc bấm Dừng.", QMessageBox.Icon.Warning)
+            return
+        if not is_gwo and self.baseline_running:
+            self._show_message_box("Cảnh báo", "Baseline đang chạy. Vui lòng chờ.", QMessageBox.Icon.Warning)
+            return
+
         if not self.load_scheduler():
             return
 
         if is_gwo:
-             baseline_obj_label = self.metrics_display.labels.get("baseline_objectiveValue", QLabel())
-             if not baseline_obj_label.text() or baseline_obj_label.text() == '...':
-                 self.run_optimization(is_gwo=False)
-                 if not baseline_obj_label.text() or baseline_obj_label.text() == '...':
-                     self._show_message_box("Cảnh báo", "Baseline cần được chạy thành công trước khi chạy GWO. Vui lòng kiểm tra Log lỗi Baseline.", QMessageBox.Icon.Warning)
-                     return
+            try:
+                pop_size = int(self.pop_size_input.text())
+                max_iter = int(self.max_iter_input.text())
+            except ValueError:
+                self._show_message_box("Lỗi Tham số", "Pop Size và Max Iter phải là số nguyên.", QMessageBox.Icon.Critical)
+                return
+            try:
+                self.gap_target = float(self.gap_target_input.text()) / 100 if self.gap_target_input.text().strip() else None
+            except ValueError:
+                self._show_message_box("Lỗi Tham số", "Gap dừng phải là số (%) hoặc để trống.", QMessageBox.Icon.Critical)
+                return
+            try:
+                self.engine_time_limit = float(self.time_limit_input.text())
+            except ValueError:
+                self._show_message_box("Lỗi Tham số", "Thời gian phải là số giây.", QMessageBox.Icon.Critical)
+                return
+
+        # GWO cần Baseline để so sánh: nếu chưa có thì chạy Baseline song song với GWO
+        need_baseline = not is_gwo or (self.metrics_display.values.get(0) is None and not self.baseline_running)
 
         self.gwo_log.append("\n--- 🧹 DỌN DẸP SÂN KHẤU (CLEANING RESULTS) 🧹 ---")
         
         self.metrics_display.update_metrics(1, {k: None for k in ["makespan", "totalPenalty", "objectiveValue", "maxLateness", "executionTime"]})
-        if not is_gwo:
+        if need_baseline:
             self.metrics_display.update_metrics(0, {k: None for k in ["makespan", "totalPenalty", "objectiveValue", "maxLateness", "executionTime"]})
         
         self.schedule_grid.display_schedule({}) 
         self.gantt_chart.set_schedule_data({})
+        self.gwo_result_shown = False
 
-        if not is_gwo:
-            try:
-                self.gwo_log.append("\n🚀 Bắt đầu Baseline (Greedy) ...")
-                
-                start_time = time.time() # <--- BẮT ĐẦU ĐO THỜI GIAN BASELINE
+        if need_baseline:
+            self.start_baseline(announce=not is_gwo)
+        if is_gwo:
+            self.start_gwo(pop_size, max_iter)
 
-                sch_baseline = copy.deepcopy(self.scheduler) 
-                
-                sch_baseline.greedy_schedule() 
-                metrics = sch_baseline.compute_metrics()
+    def start_baseline(self, announce: bool):
+        self.gwo_log.append("\n🚀 Bắt đầu Baseline (Greedy) ...")
+        self.baseline_running = True
+        self.baseline_announce = announce
+        self.baseline_progress.setValue(0)
+        self.baseline_instance_key = instance_fingerprint(self.instance_data)
+        self._update_run_buttons()
 
-                end_time = time.time() # <--- KẾT THÚC ĐO THỜI GIAN BASELINE
-                metrics['executionTime'] = end_time - start_time
-                
-                self.metrics_display.update_metrics(0, metrics)
-                
-                self.last_schedule_data = sch_baseline.schedule
-                
-                self.schedule_grid.display_schedule(self.last_schedule_data) 
-                self.gantt_chart.set_schedule_data(self.last_schedule_data)
+        self.baseline_thread = BaselineThread(self.scheduler)
+        self.baseline_thread.progress.connect(self.update_baseline_progress)
+        self.baseline_thread.finished.connect(self.baseline_finished)
+        self.baseline_thread.error.connect(self.baseline_error)
+        self.baseline_thread.thread_done.connect(self.baseline_done)
+        self.baseline_thread.start()
+
+    def start_gwo(self, pop_size: int, max_iter: int):
+        engine = self.engine_combo.currentData()
+        if engine == "gwo":
+            self.gwo_log.append(f"\n🐺 Bắt đầu GWO Optimization. Pop Size={pop_size}, Max Iter={max_iter}...")
+        else:
+            self.gwo_log.append(f"\n⚙️ Bắt đầu {self.engine_combo.currentText()}. Pop Size={pop_size}, Max Iter={max_iter}, "
+                                f"tối đa {self.engine_time_limit:g}s...")
+        self.gwo_running = True
+        self._update_run_buttons()
+        self.stop_gwo_btn.setEnabled(True)
+        self.pause_gwo_btn.setEnabled(True)
+        
+        self.convergence_chart.clear()
+        init_vector = None
+        self.gwo_instance_key = instance_fingerprint(self.instance_data)
+        if self.baseline_seed is not None and self.baseline_seed_key == self.gwo_instance_key:
+            init_vector = self.baseline_seed
+            self.gwo_log.append("🌱 Khởi tạo alpha wolf từ quy tắc dispatch tốt nhất của Baseline.")
+        elif self.baseline_running:
+            self.gwo_log.append("🌱 Quy tắc dispatch tốt nhất sẽ được đưa vào khi Baseline hoàn thành.")
+        if engine != "gwo":
+            self.gwo_thread = EngineThread(self.scheduler, engine, pop_size, max_iter, time_limit=self.engine_time_limit,
+                                           init_vector=init_vector, max_progress_rate=self.GWO_PROGRESS_RATE)
+        else:
+            tuned = self._tuned_defaults(len(self.scheduler.jobs))
+            gwo_options = {}
+            if tuned is not None:
+                gwo_options = {"lower": tuned.lower, "upper": tuned.upper, "scale_init": tuned.scale_init}
+            self.gwo_thread = GWOThread(self.scheduler, pop_size, max_iter, max_progress_rate=self.GWO_PROGRESS_RATE,
+                                        contract_chains=self.contract_chains_check.isChecked(),
+                                        gap_target=self.gap_target, init_vector=init_vector,
+                                        screening=ScreeningConfig() if self.screening_check.isChecked() else None,
+                                        gwo_options=gwo_options)
+        self.gwo_thread.progress.connect(self.update_gwo_progress)
+        self.gwo_thread.history.connect(self.convergence_chart.append_points)
+        self.gwo_thread.finished.connect(self.gwo_finished)
+        self.gwo_thread.error.connect(self.gwo_error)
+        self.gwo_thread.thread_done.connect(self.re_enable_buttons) 
+        self.gwo_thread.start()
+
+    def update_baseline_progress(self, done: int, total: int):
+        self.baseline_progress.setMaximum(max(1, total))
+        self.baseline_progress.setValue(done)
+
+    def baseline_finished(self, results: dict):
+        metrics = results['metrics']
+        self.metrics_display.update_metrics(0, metrics)
+
+        if results.get('portfolio'):
+            self.rule_table.set_rows([
+                [r['label'], r['metrics']['objectiveValue'], r['metrics']['makespan'], r['metrics']['totalPenalty'],
+                 r['metrics']['maxLateness'], f"{r['metrics']['executionTime']:.4f}"]
+                for r in results['portfolio']
+            ])
+            self.gwo_log.append(f"📋 Quy tắc dispatch tốt nhất: {results['label']} ({len(results['portfolio'])} quy tắc)")
+            self.baseline_seed = seed_vector(results['schedule'])
+            self.baseline_seed_key = self.baseline_instance_key
+            self.baseline_portfolio = results['portfolio']
+            # GWO chạy song song với Baseline: đưa quy tắc tốt nhất vào quần thể đang chạy
+            if (self.gwo_thread and self.gwo_thread.isRunning()
+                    and self.gwo_instance_key == self.baseline_seed_key
+                    and self.gwo_thread.seed(self.baseline_seed)):
+                self.gwo_log.append("🌱 Đã đưa quy tắc dispatch tốt nhất vào GWO đang chạy.")
+
+        # GWO về trước thì giữ nguyên lịch GWO đang hiển thị
+        if not self.gwo_result_shown:
+            self.last_schedule_data = results['schedule']
+            self.schedule_grid.display_schedule(self.last_schedule_data) 
+            self.gantt_chart.set_schedule_data(self.last_schedule_data)
+            if self.baseline_announce:
                 self.output_tabs.setCurrentIndex(1) 
-                
-                self.gwo_log.append(f"\n✅ Baseline hoàn thành. Objective Value = {metrics['objectiveValue']:.2f}. Time = {metrics['executionTime']:.4f}s")
-                self._show_message_box("Thành công Tuyệt vời", f"Baseline (Greedy) đã hoàn thành xuất sắc! Objective: {metrics['objectiveValue']:.2f}", QMessageBox.Icon.Information)
-            except Exception as e:
-                error_msg = f"Lỗi trong quá trình xếp lịch Baseline: {type(e).__name__}: {e}"
-                print(f"TRACEBACK BASELINE FAILED:\n{traceback.format_exc()}")
-                self._show_message_box("Lỗi Baseline (Logic Error)", error_msg, QMessageBox.Icon.Critical)
-                self.gwo_log.append(f"\n❌ Baseline FAILED: {error_msg}")
+        
+        self.gwo_log.append(f"\n✅ Baseline hoàn thành. Objective Value = {metrics['objectiveValue']:.2f}. Time = {metrics['executionTime']:.4f}s")
+        if self.baseline_announce:
+            self._show_message_box("Thành công Tuyệt vời", f"Baseline (Greedy) đã hoàn thành xuất sắc! Objective: {metrics['objectiveValue']:.2f}", QMessageBox.Icon.Information)
+
+    def baseline_error(self, message: str):
+        self._show_message_box("Lỗi Baseline (Logic Error)", message, QMessageBox.Icon.Critical)
+        self.gwo_log.append(f"\n❌ Baseline FAILED: {message}")
+
+    def baseline_done(self):
+        self.baseline_running = False
+        self._update_run_buttons()
+
+    def _update_run_buttons(self):
+        self.run_gwo_btn.setEnabled(not self.gwo_running)
+        self.run_baseline_btn.setEnabled(not self.gwo_running and not self.baseline_running)
+
+    def export_gantt_image(self):
+        if not self.last_schedule_data or not any(self.last_schedule_data.values()):
+            self._show_message_box("Cảnh báo", "Chưa có lịch trình để xuất. Hãy chạy Baseline hoặc GWO trước.", QMessageBox.Icon.Warning)
+            return
+        if self.export_thread and self.export_thread.isRunning():
+            self._show_message_box("Cảnh báo", "Đang xuất Gantt. Vui lòng chờ.", QMessageBox.Icon.Warning)
+            return
+
+        file_name, _ = QFileDialog.getSaveFileName(self, "Lưu Biểu đồ Gantt", "gantt.svg", "SVG (*.svg);;PNG (*.png)")
+        if not file_name:
+            return
+
+        self.export_gantt_btn.setEnabled(False)
+        self.gwo_log.append(f"\n🖼️ Đang xuất Gantt ra '{os.path.basename(file_name)}' ...")
+        self.export_thread = GanttExportThread(self.last_schedule_data, file_name)
+        self.export_thread.finished.connect(self.gantt_export_finished)
+        self.export_thread.error.connect(self.gantt_export_error)
+        self.export_thread.start()
+
+    def gantt_export_finished(self, result: dict):
+        self.export_gantt_btn.setEnabled(True)
+        self.gwo_log.append(f"✅ Đã xuất Gantt: {len(result['files'])} file ({result['width']}x{result['height']} px).")
+
+    def gantt_export_error(self, message: str):
+        self.export_gantt_btn.setEnabled(True)
+        self._show_message_box("Lỗi Xuất Gantt", message, QMessageBox.Icon.Critical)
+        self.gwo_log.append(f"\n❌ {message}")
+
+    def stop_gwo(self):
+        if self.gwo_thread and self.gwo_thread.isRunning():
+            self.gwo_thread.stop()
+            self.stop_gwo_btn.setEnabled(False)
+            self.pause_gwo_btn.setEnabled(False)
+            self.gwo_log.append("\n⛔ Đang dừng GWO... kết quả tốt nhất hiện tại sẽ được giữ lại.")
+
+    def toggle_pause_gwo(self):
+        if not (self.gwo_thread and self.gwo_thread.isRunning()):
+            return
+        if self.gwo_thread.cancel_token.paused:
+            self.gwo_thread.resume()
+            self.pause_gwo_btn.setText("⏸️ Tạm dừng")
+            self.gwo_log.append("▶️ Tiếp tục GWO.")
         else:
-            if self.gwo_thread and self.gwo_thread.isRunning():
-                self._show_message_box("Cảnh báo", "GWO đang chạy. Vui lòng chờ hoặc khởi động lại ứng dụng.", QMessageBox.Icon.Warning)
-                return
+            self.gwo_thread.pause()
+            self.pause_gwo_btn.setText("▶️ Tiếp tục")
+            self.gwo_log.append("⏸️ GWO đã tạm dừng.")
 
-            try:
-                pop_size = int(self.pop_size_input.text())
-                max_iter = int(self.max_iter_input.text())
-            except ValueError:
-                self._show_message_box("Lỗi Tham số", "Pop Size và Max Iter phải là số nguyên.", QMessageBox.Icon.Critical)
-                return
-            
-            self.gwo_log.append(f"\n🐺 Bắt đầu GWO Optimization. Pop Size={pop_size}, Max Iter={max_iter}...")
-            self.run_gwo_btn.setEnabled(False)
-            self.run_baseline_btn.setEnabled(False)
-            
-            self.gwo_thread = GWOThread(self.scheduler, pop_size, max_iter)
-            self.gwo_thread.progress.connect(self.update_gwo_progress)
-            self.gwo_thread.finished.connect(self.gwo_finished)
-            self.gwo_thread.error.connect(self.gwo_error)
-            self.gwo_thread.thread_done.connect(self.re_enable_buttons) 
-            self.gwo_thread.start()
+    # ---------- Pareto / chọn lại theo alpha, beta ----------
+    def _store_pareto(self, archive: ParetoArchive):
+        # Cùng instance (không tính alpha/beta) thì gộp vào archive cũ, khác thì thay mới
+        key = instance_fingerprint(self.instance_data)
+        if self.pareto_archive is not None and self.pareto_key == key and archive is not self.pareto_archive:
+            self.pareto_archive.merge(archive)
+        else:
+            self.pareto_archive = archive
+            self.pareto_key = key
+        self._refresh_pareto_plot(self.scheduler.alpha, self.scheduler.beta)
+
+    def _refresh_pareto_plot(self, alpha: float, beta: float):
+        point = self.pareto_archive.best_for(alpha, beta) if self.pareto_archive is not None else None
+        self.pareto_chart.set_front(self.pareto_archive.front() if self.pareto_archive is not None else [],
+                                    (point.makespan, point.penalty) if point is not None else None)
+        self.pareto_status.setText(f"{len(self.pareto_archive)} điểm không bị trội." if self.pareto_archive is not None
+                                   else "Chưa có archive.")
+
+    def reweight_from_pareto(self):
+        # Chọn lịch tốt nhất cho alpha/beta mới từ archive, không chạy lại GWO
+        if self.pareto_archive is None or self.scheduler is None or self.gwo_running:
+            return
+        if self.pareto_key != instance_fingerprint(self.instance_data):
+            return
+        try:
+            alpha = float(self.alpha_input.text())
+            beta = float(self.beta_input.text())
+        except ValueError:
+            return
+        if (alpha, beta) == (self.scheduler.alpha, self.scheduler.beta) and self.sender() is not self.pareto_select_btn:
+            return
+        start = time.time()
+        result = reweighted(self.scheduler, self.pareto_archive, alpha, beta)
+        if result is None:
+            return
+        self.scheduler.alpha, self.scheduler.beta = alpha, beta
+        self.instance_data['alpha'], self.instance_data['beta'] = alpha, beta
+
+        metrics = dict(result['metrics'], executionTime=time.time() - start)
+        self.metrics_display.update_metrics(1, metrics)
+        if self.baseline_portfolio and self.baseline_seed_key == self.pareto_key:
+            best = min(self.baseline_portfolio,
+                       key=lambda r: alpha * r['metrics']['makespan'] + beta * r['metrics']['totalPenalty'])
+            m = best['metrics']
+            self.metrics_display.update_metrics(0, dict(m, objectiveValue=alpha * m['makespan'] + beta * m['totalPenalty'],
+                                                        executionTime=None))
+        self.last_schedule_data = result['schedule']
+        self.schedule_grid.display_schedule(self.last_schedule_data)
+        self.gantt_chart.set_schedule_data(self.last_schedule_data)
+        self._refresh_pareto_plot(alpha, beta)
+        self.gwo_log.append(f"📐 Alpha={alpha:g}, Beta={beta:g}: chọn từ mặt Pareto objective={metrics['objectiveValue']:.2f} "
+                            f"(makespan={metrics['makespan']}, penalty={metrics['totalPenalty']:.2f}) trong {metrics['executionTime']:.4f}s")
+
+    def run_pareto(self):
+        if self.gwo_running or (self.pareto_thread and self.pareto_thread.isRunning()):
+            self._show_message_box("Cảnh báo", "Đang có lượt tối ưu chạy. Vui lòng chờ hoặc bấm Dừng.", QMessageBox.Icon.Warning)
+            return
+        if not self.load_scheduler():
+            return
+        try:
+            weights = int(self.pareto_weights_input.text())
+            pop_size = int(self.pop_size_input.text())
+            max_iter = int(self.max_iter_input.text())
+        except ValueError:
+            self._show_message_box("Lỗi Tham số", "Số trọng số, Pop Size và Max Iter phải là số nguyên.", QMessageBox.Icon.Critical)
+            return
+        key = instance_fingerprint(self.instance_data)
+        archive = self.pareto_archive if self.pareto_key == key else None
+        self.pareto_thread = ParetoThread(self.scheduler, weights, pop_size, max_iter, archive=archive)
+        self.pareto_thread.progress.connect(self.pareto_progress)
+        self.pareto_thread.finished.connect(self.pareto_finished)
+        self.pareto_thread.error.connect(lambda message: self._show_message_box("Lỗi Pareto", message, QMessageBox.Icon.Critical))
+        self.pareto_thread.thread_done.connect(self.pareto_done)
+        self.run_pareto_btn.setEnabled(False)
+        self.stop_pareto_btn.setEnabled(True)
+        self.gwo_log.append(f"\n📐 Dựng mặt Pareto: GWO theo {weights} trọng số makespan / penalty...")
+        self.pareto_thread.start()
+
+    def stop_pareto(self):
+        if self.pareto_thread and self.pareto_thread.isRunning():
+            self.pareto_thread.stop()
+            self.stop_pareto_btn.setEnabled(False)
+
+    def pareto_progress(self, done: int, total: int):
+        self.pareto_status.setText(f"Trọng số {done}/{total}...")
+
+    def pareto_finished(self, results: dict):
+        self._store_pareto(results['pareto'])
+        note = " (đã dừng)" if results.get('cancelled') else ""
+        self.gwo_log.append(f"📐 Mặt Pareto{note}: {len(self.pareto_archive)} điểm sau {results['executionTime']:.2f}s")
+        self.output_tabs.setCurrentWidget(self.pareto_tab)
+
+    def pareto_done(self):
+        self.run_pareto_btn.setEnabled(True)
+        self.stop_pareto_btn.setEnabled(False)
+
+    @staticmethod
+    def _parse_list(text: str, cast):
+        return [cast(x.strip()) for x in text.split(',') if x.strip()]
+
+    def run_sweep(self):
+        if self.sweep_thread and self.sweep_thread.isRunning():
+            self._show_message_box("Cảnh báo", "Sweep đang chạy. Vui lòng chờ hoặc bấm Dừng Sweep.", QMessageBox.Icon.Warning)
+            return
+        if not self.load_scheduler():
+            return
+
+        try:
+            configs = expand_grid(self._parse_list(self.sweep_pop_input.text(), int),
+                                  self._parse_list(self.sweep_iter_input.text(), int),
+                                  self._parse_list(self.sweep_alpha_input.text(), float),
+                                  self._parse_list(self.sweep_beta_input.text(), float),
+                                  self._parse_list(self.sweep_seed_input.text(), int))
+            workers = int(self.sweep_workers_input.text())
+        except ValueError:
+            self._show_message_box("Lỗi Tham số", "Danh sách tham số Sweep không hợp lệ.", QMessageBox.Icon.Critical)
+            return
+        if not configs:
+            self._show_message_box("Lỗi Tham số", "Sweep không có cấu hình nào.", QMessageBox.Icon.Critical)
+            return
+
+        self.sweep_runner.max_workers = max(1, workers)
+        pending = len(self.sweep_runner.pending(self.instance_data, configs))
+        self.sweep_results = []
+        self.sweep_rows = []
+        self.sweep_table.set_rows([])
+        self.sweep_total = len(configs)
+        self.sweep_status.setText(f"0/{len(configs)} hoàn thành ({pending} cấu hình mới, {len(configs) - pending} từ cache)")
+        self.gwo_log.append(f"\n🔬 Bắt đầu Sweep: {len(configs)} cấu hình, {pending} cần chạy, {workers} process.")
+
+        self.run_sweep_btn.setEnabled(False)
+        self.stop_sweep_btn.setEnabled(True)
+        self.sweep_thread = SweepThread(self.sweep_runner, self.instance_data, configs)
+        self.sweep_thread.result.connect(self.sweep_result)
+        self.sweep_thread.finished.connect(self.sweep_finished)
+        self.sweep_thread.error.connect(self.gwo_error)
+        self.sweep_thread.thread_done.connect(self.sweep_done)
+        self.sweep_thread.start()
+
+    def stop_sweep(self):
+        if self.sweep_thread and self.sweep_thread.isRunning():
+            self.sweep_thread.stop()
+            self.stop_sweep_btn.setEnabled(False)
+            self.gwo_log.append("⛔ Đang dừng Sweep...")
+
+    def sweep_result(self, result: dict, cached: bool):
+        self.sweep_results.append(result)
+        self.sweep_rows = summarize(self.sweep_results)
+        self.sweep_table.set_rows([
+            [row['pop_size'], row['max_iter'], row['alpha'], row['beta'], row['runs'],
+             row['best_objective'], row['mean_objective'], row['makespan'],
+             row['totalPenalty'], row['mean_time']]
+            for row in self.sweep_rows
+        ])
+        self.sweep_status.setText(f"{len(self.sweep_results)}/{self.sweep_total} hoàn thành")
+
+    def sweep_finished(self, results: list):
+        if self.sweep_rows:
+            best = self.sweep_rows[0]
+            self.gwo_log.append(f"✅ Sweep xong {len(results)} lần chạy. Tốt nhất: Pop={best['pop_size']}, "
+                                f"Iter={best['max_iter']}, Alpha={best['alpha']}, Beta={best['beta']} "
+                                f"→ Objective = {best['best_objective']:.2f}")
+
+    def sweep_done(self):
+        self.run_sweep_btn.setEnabled(True)
+        self.stop_sweep_btn.setEnabled(False)
+
+    def sweep_row_selected(self):
+        row = self.sweep_table.currentRow()
+        if 0 <= row < len(self.sweep_rows):
+            self.last_schedule_data = self.sweep_rows[row]['best']['schedule']
+            self.schedule_grid.display_schedule(self.last_schedule_data)
+            self.gantt_chart.set_schedule_data(self.last_schedule_data)
 
     def re_enable_buttons(self):
-        self.run_gwo_btn.setEnabled(True)
-        self.run_baseline_btn.setEnabled(True)
+        self.gwo_running = False
+        self._update_run_buttons()
+        self.stop_gwo_btn.setEnabled(False)
+        self.pause_gwo_btn.setEnabled(False)
+        self.pause_gwo_btn.setText("⏸️ Tạm dừng")
 
     def apply_styles(self):
         # --- QSS Style (Cyber Glam Dark Theme) - Đã Tăng Cường ---
@@ -343,10 +708,21 @@ class MainWindow(QMainWindow):
         button_layout.setContentsMargins(0, 0, 0, 0)
         self.run_baseline_btn = QPushButton("👑 1. RUN BASELINE (Greedy) 🚀")
         self.run_gwo_btn = QPushButton("💰 2. RUN GWO OPTIMIZATION 🐺")
+        self.pause_gwo_btn = QPushButton("⏸️ Tạm dừng")
+        self.stop_gwo_btn = QPushButton("⛔ Dừng")
+        self.pause_gwo_btn.setEnabled(False)
+        self.stop_gwo_btn.setEnabled(False)
         button_layout.addWidget(self.run_baseline_btn)
         button_layout.addWidget(self.run_gwo_btn)
+        button_layout.addWidget(self.pause_gwo_btn)
+        button_layout.addWidget(self.stop_gwo_btn)
         main_layout.addWidget(button_group) 
 
+        self.baseline_progress = QProgressBar()
+        self.baseline_progress.setFormat("Baseline dispatch: %v/%m jobs")
+        self.baseline_progress.setValue(0)
+        main_layout.addWidget(self.baseline_progress)
+
         # 2. CONFIG PARAMS
         config_container = QWidget()
         config_layout_main = QHBoxLayout(config_container)
@@ -367,6 +743,23 @@ class MainWindow(QMainWindow):
         gwo_layout.setContentsMargins(10, 20, 10, 10)
         self._add_config_field(gwo_layout, "Pop Size:", "pop_size_input", "10", 50)
         self._add_config_field(gwo_layout, "Max Iter:", "max_iter_input", "20", 50)
+        self._add_config_field(gwo_layout, "Gap dừng (%):", "gap_target_input", "0", 50)
+        self.gap_target_input.setToolTip("Dừng GWO khi gap so với cận dưới nhỏ hơn hoặc bằng giá trị này; để trống để chạy đủ Max Iter")
+        self.contract_chains_check = QCheckBox("Gộp chuỗi tiền nhiệm")
+        self.contract_chains_check.setToolTip("Mỗi chuỗi job nối tiếp nhau (tiền nhiệm/kế tiếp duy nhất) chỉ dùng một chiều trong GWO")
+        gwo_layout.addWidget(self.contract_chains_check)
+        self.screening_check = QCheckBox("Sàng lọc sói")
+        self.screening_check.setToolTip("Xếp hạng sói bằng fitness rẻ, chỉ decode chính xác nửa tốt nhất ở các vòng đầu")
+        gwo_layout.addWidget(self.screening_check)
+        gwo_layout.addWidget(QLabel("Engine:"))
+        self.engine_combo = QComboBox()
+        for name, engine in ENGINES.items():
+            self.engine_combo.addItem(engine.label, name)
+        self.engine_combo.addItem("Portfolio song song (mọi engine)", "portfolio")
+        self.engine_combo.setToolTip("Các tùy chọn gộp chuỗi / sàng lọc / gap dừng chỉ áp dụng cho GWO")
+        gwo_layout.addWidget(self.engine_combo)
+        self._add_config_field(gwo_layout, "Thời gian (s):", "time_limit_input", "60", 50)
+        self.time_limit_input.setToolTip("Giới hạn thời gian cho engine khác GWO và chế độ portfolio")
         gwo_layout.addStretch(1)
         
         config_layout_main.addWidget(scheduler_group)
@@ -415,10 +808,21 @@ class MainWindow(QMainWindow):
         metrics_log_layout.addWidget(QLabel("So sánh Chỉ số Quan trọng:"))
         self.metrics_display = MetricsDisplayWidget()
         metrics_log_layout.addWidget(self.metrics_display)
+
+        metrics_log_layout.addWidget(QLabel("Đường hội tụ GWO (Convergence):"))
+        self.convergence_chart = ConvergenceChartWidget()
+        metrics_log_layout.addWidget(self.convergence_chart)
+
+        metrics_log_layout.addWidget(QLabel("Danh mục quy tắc dispatch (Baseline):"))
+        self.rule_table = ResultsTableWidget(["Quy tắc", "Objective", "Makespan", "Penalty", "Max Lateness", "Time (s)"])
+        self.rule_table.setMaximumHeight(180)
+        metrics_log_layout.addWidget(self.rule_table)
         
         self.gwo_log = QTextEdit("✨ GWO Log: Tiến trình sẽ hiển thị tại đây... ✨\n\nKiểm tra Log (Console) nếu chương trình bị crash để xem thông báo lỗi chi tiết nhất.")
         self.gwo_log.setReadOnly(True)
         self.gwo_log.setObjectName("GwoLog") # Dùng Object Name để style riêng
+        # Log dạng ring buffer: chỉ giữ các dòng gần nhất để không phình bộ nhớ
+        self.gwo_log.document().setMaximumBlockCount(self.LOG_MAX_LINES)
         metrics_log_layout.addWidget(QLabel("Tiến trình Thuật toán:"))
         metrics_log_layout.addWidget(self.gwo_log)
         self.output_tabs.addTab(metrics_log_widget, "💰 Metrics & Log 📈")
@@ -428,7 +832,13 @@ class MainWindow(QMainWindow):
         schedule_layout = QVBoxLayout(schedule_widget)
         schedule_layout.setContentsMargins(5, 5, 5, 5)
 
-        schedule_layout.addWidget(QLabel("Lịch trình dạng Biểu đồ Gantt: "))
+        gantt_header_layout = QHBoxLayout()
+        gantt_header_layout.addWidget(QLabel("Lịch trình dạng Biểu đồ Gantt: "))
+        gantt_header_layout.addStretch(1)
+        self.export_gantt_btn = QPushButton("🖼️ Xuất Gantt (SVG/PNG)")
+        self.export_gantt_btn.setObjectName("LoadJsonButton")
+        gantt_header_layout.addWidget(self.export_gantt_btn)
+        schedule_layout.addLayout(gantt_header_layout)
         self.gantt_chart = GanttChartWidget()
         schedule_layout.addWidget(self.gantt_chart)
         
@@ -437,6 +847,61 @@ class MainWindow(QMainWindow):
         schedule_layout.addWidget(self.schedule_grid)
         
         self.output_tabs.addTab(schedule_widget, "⚙️ Schedule Output 📊")
+
+        # TAB 3: PARAMETER SWEEP
+        sweep_widget = QWidget()
+        sweep_layout = QVBoxLayout(sweep_widget)
+        sweep_layout.setContentsMargins(5, 5, 5, 5)
+
+        sweep_group = QGroupBox("PARAMETER SWEEP 🔬 (danh sách cách nhau bởi dấu phẩy)")
+        sweep_fields = QHBoxLayout(sweep_group)
+        sweep_fields.setContentsMargins(10, 20, 10, 10)
+        self._add_config_field(sweep_fields, "Pop Sizes:", "sweep_pop_input", "5,10,20", 70)
+        self._add_config_field(sweep_fields, "Max Iters:", "sweep_iter_input", "20", 70)
+        self._add_config_field(sweep_fields, "Alpha (Makespan):", "sweep_alpha_input", "1.0", 70)
+        self._add_config_field(sweep_fields, "Beta (Penalty):", "sweep_beta_input", "3.0", 70)
+        self._add_config_field(sweep_fields, "Seeds:", "sweep_seed_input", "0,1,2", 70)
+        self._add_config_field(sweep_fields, "Workers:", "sweep_workers_input", str(self.sweep_runner.max_workers), 40)
+        sweep_layout.addWidget(sweep_group)
+
+        sweep_buttons = QHBoxLayout()
+        self.run_sweep_btn = QPushButton("🔬 RUN SWEEP")
+        self.stop_sweep_btn = QPushButton("⛔ Dừng Sweep")
+        self.stop_sweep_btn.setEnabled(False)
+        self.sweep_status = QLabel("Chưa chạy sweep.")
+        sweep_buttons.addWidget(self.run_sweep_btn)
+        sweep_buttons.addWidget(self.stop_sweep_btn)
+        sweep_buttons.addWidget(self.sweep_status, 1)
+        sweep_layout.addLayout(sweep_buttons)
+
+        self.sweep_table = ResultsTableWidget(["Pop Size", "Max Iter", "Alpha", "Beta", "Runs",
+                                               "Best Objective", "Mean Objective", "Makespan",
+                                               "Total Penalty", "Mean Time (s)"])
+        sweep_layout.addWidget(self.sweep_table)
+        sweep_layout.addWidget(QLabel("Chọn một dòng để xem lịch tốt nhất của cấu hình đó ở tab Schedule Output."))
+        self.output_tabs.addTab(sweep_widget, "🔬 Parameter Sweep")
+
+        # TAB 4: PARETO (MAKESPAN / PENALTY)
+        self.pareto_tab = QWidget()
+        pareto_layout = QVBoxLayout(self.pareto_tab)
+        pareto_layout.setContentsMargins(5, 5, 5, 5)
+        pareto_buttons = QHBoxLayout()
+        self.pareto_select_btn = QPushButton("🎯 Chọn theo Alpha/Beta hiện tại")
+        self.run_pareto_btn = QPushButton("📐 Dựng mặt Pareto")
+        self.run_pareto_btn.setToolTip("Chạy GWO lần lượt theo nhiều trọng số makespan / penalty (Pop Size, Max Iter ở trên)")
+        self.stop_pareto_btn = QPushButton("⛔ Dừng")
+        self.stop_pareto_btn.setEnabled(False)
+        pareto_buttons.addWidget(self.pareto_select_btn)
+        pareto_buttons.addWidget(self.run_pareto_btn)
+        self._add_config_field(pareto_buttons, "Số trọng số:", "pareto_weights_input", "7", 40)
+        pareto_buttons.addWidget(self.stop_pareto_btn)
+        self.pareto_status = QLabel("Chưa có archive.")
+        pareto_buttons.addWidget(self.pareto_status, 1)
+        pareto_layout.addLayout(pareto_buttons)
+        self.pareto_chart = ParetoFrontWidget()
+        pareto_layout.addWidget(self.pareto_chart, 1)
+        pareto_layout.addWidget(QLabel("Mọi lịch đã decode trong lúc chạy GWO được lưu lại; đổi Alpha/Beta sẽ chọn ngay lịch tốt nhất từ mặt Pareto."))
+        self.output_tabs.addTab(self.pareto_tab, "📐 Pareto")
         
         output_layout.addWidget(self.output_tabs) 
         splitter.addWidget(output_widget)
@@ -518,8 +983,27 @@ class MainWindow(QMainWindow):
         self.gwo_log.append(f"✨ Iteration {current}/{max_iter}: Best Fitness = {fitness:.2f} 💖")
 
     def gwo_finished(self, results: dict):
-        self.gwo_log.append("\n--- 🏆 TỐI ƯU HÓA HOÀN THÀNH VINH QUANG 🏆 ---")
+        self.gwo_result_shown = True
+        if results.get('cancelled'):
+            self.gwo_log.append(f"\n--- ⛔ GWO ĐÃ DỪNG sau {len(results.get('fitness_history', []))} vòng lặp - hiển thị nghiệm tốt nhất đến lúc dừng ---")
+        else:
+            self.gwo_log.append("\n--- 🏆 TỐI ƯU HÓA HOÀN THÀNH VINH QUANG 🏆 ---")
         self.metrics_display.update_metrics(1, results['metrics'])
+        if results.get('stopped_early'):
+            self.gwo_log.append(f"🎯 Dừng sớm sau {len(results.get('fitness_history', []))} vòng lặp: gap {results['metrics']['gap'] * 100:.2f}% đã đạt ngưỡng")
+        stats = results.get('screening_stats')
+        if stats:
+            self.gwo_log.append(f"🔎 Sàng lọc: {stats['screened_iterations']} vòng, {stats['exact_evals']} decode chính xác / "
+                                f"{stats['cheap_evals']} ước lượng rẻ; bộ ba dẫn đầu bị đổi {stats['leader_changes']}/{stats['audits']} lần kiểm tra")
+        if results.get('engine'):
+            self.gwo_log.append(f"⚙️ Engine: {results['engine']}")
+        for row in results.get('engines', []):
+            self.gwo_log.append(f"   • {row['label']}: best={row['fitness']:.2f}, {row['iterations']} vòng, {row['evaluations']} lần decode")
+        if results.get('dimensions') is not None and results['dimensions'] < len(self.scheduler.jobs):
+            self.gwo_log.append(f"🔗 Gộp chuỗi: {len(self.scheduler.jobs)} job -> {results['dimensions']} chiều tìm kiếm")
+        if results.get('pareto') is not None:
+            self._store_pareto(results['pareto'])
+            self.gwo_log.append(f"📐 Mặt Pareto: {len(self.pareto_archive)} điểm - đổi Alpha/Beta để chọn lại lịch ngay, không cần chạy lại GWO")
         
         self.last_schedule_data = results['schedule'] 
         
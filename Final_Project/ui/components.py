@@ -1,12 +1,14 @@
-import random
 import math
 from typing import Dict, List, Any
 from PyQt6.QtWidgets import (
-    QWidget, QLabel, QGridLayout, QScrollArea, QVBoxLayout
+    QWidget, QLabel, QGridLayout, QScrollArea, QVBoxLayout,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
 )
-from PyQt6.QtCore import Qt, QCoreApplication, QRectF
+from PyQt6.QtCore import Qt, QCoreApplication, QRectF, QPointF
 from PyQt6.QtGui import QColor, QFont, QPainter, QPen, QBrush
 
+from ui.gantt_export import job_color_rgb
+
 class GanttChartWidget(QWidget):
     """Widget tùy chỉnh để vẽ biểu đồ Gantt."""
     def __init__(self):
@@ -18,12 +20,8 @@ class GanttChartWidget(QWidget):
 
     def _get_job_color(self, job_id: int):
         if job_id not in self.job_colors:
-            random.seed(job_id * 12345) 
-            # Dùng màu sắc rực rỡ hơn cho theme "lộng lẫy"
-            r = random.randint(150, 255) 
-            g = random.randint(100, 200)
-            b = random.randint(150, 255)
-            self.job_colors[job_id] = QColor(r, g, b)
+            # Dùng màu sắc rực rỡ hơn cho theme "lộng lẫy" (chung quy tắc với gantt_export)
+            self.job_colors[job_id] = QColor(*job_color_rgb(job_id))
         return self.job_colors[job_id]
 
     def set_schedule_data(self, schedule_dict: Dict[str, List[Dict[str, Any]]]):
@@ -137,6 +135,245 @@ class GanttChartWidget(QWidget):
                                      f"J{job_id}")
 
 
+class MinMaxSeries:
+    """Chuỗi giá trị được nén min/max vào số bucket cố định.
+
+    Khi đầy, các bucket kề nhau được gộp đôi, nên bộ nhớ và chi phí vẽ không phụ thuộc
+    số vòng lặp (chỉ phụ thuộc capacity / số cột pixel).
+    """
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.bucket_size = 1
+        self.buckets: List[List[float]] = []  # [min, max, last]
+        self._pending: List[float] = None
+        self._pending_count = 0
+        self.count = 0
+
+    def clear(self):
+        self.bucket_size = 1
+        self.buckets = []
+        self._pending = None
+        self._pending_count = 0
+        self.count = 0
+
+    def append(self, value: float):
+        self.count += 1
+        if self._pending is None:
+            self._pending = [value, value, value]
+        else:
+            p = self._pending
+            p[0] = min(p[0], value)
+            p[1] = max(p[1], value)
+            p[2] = value
+        self._pending_count += 1
+        if self._pending_count >= self.bucket_size:
+            self.buckets.append(self._pending)
+            self._pending = None
+            self._pending_count = 0
+            if len(self.buckets) >= self.capacity:
+                merged = []
+                for i in range(0, len(self.buckets) - 1, 2):
+                    a, b = self.buckets[i], self.buckets[i + 1]
+                    merged.append([min(a[0], b[0]), max(a[1], b[1]), b[2]])
+                if len(self.buckets) % 2:
+                    merged.append(self.buckets[-1])
+                self.buckets = merged
+                self.bucket_size *= 2
+
+    def extend(self, values: List[float]):
+        for v in values:
+            self.append(v)
+
+    def all_buckets(self) -> List[List[float]]:
+        if self._pending is not None:
+            return self.buckets + [self._pending]
+        return self.buckets
+
+    def columns(self, width: int) -> List[List[float]]:
+        # Gộp các bucket vào tối đa `width` cột pixel: mỗi cột giữ [min, max, last]
+        buckets = self.all_buckets()
+        if not buckets or width <= 0:
+            return []
+        if len(buckets) <= width:
+            return buckets
+        cols = []
+        n = len(buckets)
+        for x in range(width):
+            lo = x * n // width
+            hi = max(lo + 1, (x + 1) * n // width)
+            chunk = buckets[lo:hi]
+            cols.append([min(c[0] for c in chunk), max(c[1] for c in chunk), chunk[-1][2]])
+        return cols
+
+    def value_range(self):
+        buckets = self.all_buckets()
+        if not buckets:
+            return None
+        return min(b[0] for b in buckets), max(b[1] for b in buckets)
+
+
+class ConvergenceChartWidget(QWidget):
+    """Đồ thị hội tụ GWO: best / mean fitness và độ đa dạng quần thể (trục phải)."""
+    SERIES_STYLE = {
+        "best": ("#64ffda", "Best"),
+        "mean": ("#ff80ff", "Mean"),
+        "diversity": ("#ffc107", "Diversity"),
+    }
+
+    def __init__(self, capacity: int = 1024):
+        super().__init__()
+        self.series: Dict[str, MinMaxSeries] = {name: MinMaxSeries(capacity) for name in self.SERIES_STYLE}
+        self.setMinimumHeight(160)
+
+    def clear(self):
+        for series in self.series.values():
+            series.clear()
+        self.update()
+
+    def append_points(self, best: List[float], mean: List[float], diversity: List[float]):
+        self.series["best"].extend(best)
+        self.series["mean"].extend(mean)
+        self.series["diversity"].extend(diversity)
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setBrush(QBrush(QColor("#0d1117")))
+        painter.drawRect(self.rect())
+
+        count = self.series["best"].count
+        if count == 0:
+            painter.setPen(QPen(QColor("#9cdafa")))
+            painter.setFont(QFont("Arial", 10))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "✨ Đường hội tụ GWO sẽ hiển thị tại đây. ✨")
+            return
+
+        pad_left, pad_right, pad_y = 70, 50, 20
+        plot_w = max(1, self.width() - pad_left - pad_right)
+        plot_h = max(1, self.height() - 2 * pad_y)
+
+        # Trục trái: fitness (best + mean); trục phải: diversity
+        ranges = [r for r in (self.series["best"].value_range(), self.series["mean"].value_range()) if r]
+        f_lo = min(r[0] for r in ranges)
+        f_hi = max(r[1] for r in ranges)
+        d_range = self.series["diversity"].value_range() or (0.0, 1.0)
+
+        painter.setPen(QPen(QColor("#007bff"), 1))
+        painter.drawLine(pad_left, pad_y, pad_left, pad_y + plot_h)
+        painter.drawLine(pad_left, pad_y + plot_h, pad_left + plot_w, pad_y + plot_h)
+        painter.setPen(QPen(QColor("#00bcd4")))
+        painter.setFont(QFont("Arial", 8))
+        painter.drawText(QRectF(0, pad_y - 8, pad_left - 5, 16), Qt.AlignmentFlag.AlignRight, f"{f_hi:.1f}")
+        painter.drawText(QRectF(0, pad_y + plot_h - 8, pad_left - 5, 16), Qt.AlignmentFlag.AlignRight, f"{f_lo:.1f}")
+        painter.drawText(QRectF(pad_left, pad_y + plot_h + 2, plot_w, 16), Qt.AlignmentFlag.AlignRight, f"iter {count}")
+
+        def draw_series(name, lo, hi):
+            color, _ = self.SERIES_STYLE[name]
+            cols = self.series[name].columns(plot_w)
+            if not cols:
+                return
+            span = (hi - lo) or 1.0
+            step = plot_w / max(1, len(cols) - 1) if len(cols) > 1 else 0
+
+            def y_of(v):
+                return pad_y + plot_h - (v - lo) / span * plot_h
+
+            painter.setPen(QPen(QColor(color), 1.5))
+            prev = None
+            for i, (vmin, vmax, last) in enumerate(cols):
+                x = pad_left + i * step
+                if vmax > vmin:
+                    painter.drawLine(QPointF(x, y_of(vmin)), QPointF(x, y_of(vmax)))
+                point = QPointF(x, y_of(last))
+                if prev is not None:
+                    painter.drawLine(prev, point)
+                prev = point
+
+        draw_series("mean", f_lo, f_hi)
+        draw_series("best", f_lo, f_hi)
+        draw_series("diversity", d_range[0], d_range[1])
+
+        # Chú thích
+        x_legend = pad_left + 10
+        for name, (color, text) in self.SERIES_STYLE.items():
+            painter.setPen(QPen(QColor(color)))
+            painter.drawText(QRectF(x_legend, 2, 80, 16), Qt.AlignmentFlag.AlignLeft, f"■ {text}")
+            x_legend += 80
+
+
+class ParetoFrontWidget(QWidget):
+    """Mặt Pareto makespan / tổng penalty; điểm được chọn cho alpha/beta hiện tại được tô sáng."""
+
+    def __init__(self):
+        super().__init__()
+        self.points: List[tuple] = []
+        self.selected = None
+        self.setMinimumHeight(220)
+
+    def set_front(self, points: List[tuple], selected=None):
+        self.points = sorted(points)
+        self.selected = selected
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setBrush(QBrush(QColor("#0d1117")))
+        painter.drawRect(self.rect())
+
+        if not self.points:
+            painter.setPen(QPen(QColor("#9cdafa")))
+            painter.setFont(QFont("Arial", 10))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "✨ Mặt Pareto sẽ hiển thị sau khi chạy GWO. ✨")
+            return
+
+        pad_left, pad_right, pad_y = 80, 30, 25
+        plot_w = max(1, self.width() - pad_left - pad_right)
+        plot_h = max(1, self.height() - 2 * pad_y)
+        m_lo, m_hi = self.points[0][0], self.points[-1][0]
+        p_lo = min(p for _, p in self.points)
+        p_hi = max(p for _, p in self.points)
+        m_span = (m_hi - m_lo) or 1.0
+        p_span = (p_hi - p_lo) or 1.0
+
+        def to_xy(m, p):
+            return QPointF(pad_left + (m - m_lo) / m_span * plot_w, pad_y + plot_h - (p - p_lo) / p_span * plot_h)
+
+        painter.setPen(QPen(QColor("#007bff"), 1))
+        painter.drawLine(pad_left, pad_y, pad_left, pad_y + plot_h)
+        painter.drawLine(pad_left, pad_y + plot_h, pad_left + plot_w, pad_y + plot_h)
+        painter.setPen(QPen(QColor("#00bcd4")))
+        painter.setFont(QFont("Arial", 8))
+        painter.drawText(QRectF(0, pad_y - 8, pad_left - 5, 16), Qt.AlignmentFlag.AlignRight, f"{p_hi:.1f}")
+        painter.drawText(QRectF(0, pad_y + plot_h - 8, pad_left - 5, 16), Qt.AlignmentFlag.AlignRight, f"{p_lo:.1f}")
+        painter.drawText(QRectF(pad_left, pad_y + plot_h + 2, plot_w, 16), Qt.AlignmentFlag.AlignLeft, f"{m_lo:g}")
+        painter.drawText(QRectF(pad_left, pad_y + plot_h + 2, plot_w, 16), Qt.AlignmentFlag.AlignRight,
+                         f"{m_hi:g}  (makespan)")
+        painter.drawText(QRectF(5, 2, 300, 16), Qt.AlignmentFlag.AlignLeft,
+                         f"Penalty theo makespan - {len(self.points)} điểm không bị trội")
+
+        # Đường bậc thang nối các điểm liên tiếp
+        painter.setPen(QPen(QColor("#ff80ff"), 1, Qt.PenStyle.DashLine))
+        for (m1, p1), (m2, p2) in zip(self.points, self.points[1:]):
+            corner = to_xy(m2, p1)
+            painter.drawLine(to_xy(m1, p1), corner)
+            painter.drawLine(corner, to_xy(m2, p2))
+
+        painter.setPen(QPen(QColor("#64ffda"), 1))
+        painter.setBrush(QBrush(QColor("#64ffda")))
+        for m, p in self.points:
+            painter.drawEllipse(to_xy(m, p), 3, 3)
+
+        if self.selected is not None:
+            m, p = self.selected
+            painter.setPen(QPen(QColor("#ffc107"), 2))
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawEllipse(to_xy(m, p), 7, 7)
+            painter.drawText(QRectF(pad_left + 10, pad_y, plot_w - 10, 16), Qt.AlignmentFlag.AlignRight,
+                             f"Đang chọn: makespan={m:g}, penalty={p:.2f}")
+
+
 class MetricsDisplayWidget(QWidget):
     def __init__(self):
         super().__init__()
@@ -144,6 +381,8 @@ class MetricsDisplayWidget(QWidget):
         self.layout.setContentsMargins(0, 0, 0, 0)
         self.layout.setSpacing(1) 
         self.labels: Dict[str, QLabel] = {}
+        # Metrics hiện tại của từng hàng (0 = Baseline, 1 = GWO); None nếu chưa có
+        self.values: Dict[int, Dict[str, Any]] = {}
         self._setup_grid()
         self.clear_metrics()
 
@@ -154,13 +393,13 @@ class MetricsDisplayWidget(QWidget):
 
     def _setup_grid(self):
         # THÊM CỘT Execution Time
-        HEADERS = ["👑", "Makespan (Thời gian Hoàn tất)", "Total Penalty (Tổng Tiền phạt)", "Objective Value (Mục tiêu)", "Max Lateness (Trễ tối đa)", "Execution Time (Thời gian chạy)"]
+        HEADERS = ["👑", "Makespan (Thời gian Hoàn tất)", "Total Penalty (Tổng Tiền phạt)", "Objective Value (Mục tiêu)", "Max Lateness (Trễ tối đa)", "Execution Time (Thời gian chạy)", "Gap (so với Cận dưới)"]
         
         ROW_NAMES_DISPLAY = ["Baseline", "GWO 🐺"]
         ROW_NAMES_KEYS = ["baseline", "gwo"] 
         
         # THÊM KEY executionTime
-        METRICS_KEYS = ["makespan", "totalPenalty", "objectiveValue", "maxLateness", "executionTime"]
+        METRICS_KEYS = ["makespan", "totalPenalty", "objectiveValue", "maxLateness", "executionTime", "gap"]
         
         # Tăng cường màu mè cho header
         header_style = "background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #8e24aa, stop:1 #ff00ff); color: white; padding: 10px; font-weight: bold; border: 1px solid #ff00ff;"
@@ -196,7 +435,7 @@ class MetricsDisplayWidget(QWidget):
 
     def update_metrics(self, row: int, metrics: Dict[str, Any]):
         ROW_NAME = "gwo" if row == 1 else "baseline"
-        METRICS_KEYS = ["makespan", "totalPenalty", "objectiveValue", "maxLateness", "executionTime"]
+        METRICS_KEYS = ["makespan", "totalPenalty", "objectiveValue", "maxLateness", "executionTime", "gap"]
         data_style_base = "color: #9cdafa; padding: 10px; border: 1px solid #1f2733; background-color: #1f2733;" 
 
         for key in METRICS_KEYS:
@@ -209,6 +448,9 @@ class MetricsDisplayWidget(QWidget):
                 elif key == "executionTime":
                     # HIỂN THỊ THỜI GIAN
                     self.labels[label_name].setText(f"⏱️ {value:.4f}s")
+                elif key == "gap":
+                    # Gap tương đối so với cận dưới (0% = đã chứng minh tối ưu)
+                    self.labels[label_name].setText(f"📉 {value * 100:.2f}%")
                 else:
                     self.labels[label_name].setText(f"💰 {value:.2f}")
             else:
@@ -216,32 +458,34 @@ class MetricsDisplayWidget(QWidget):
             
             self.labels[label_name].setStyleSheet(data_style_base)
 
-        # Highlight Objective Value
-        if "objectiveValue" in metrics:
-            try:
-                baseline_obj_label = self.labels["baseline_objectiveValue"]
-                gwo_obj_label = self.labels["gwo_objectiveValue"]
-                
-                baseline_obj_str = baseline_obj_label.text().replace('💰 ', '').replace('...', '').strip()
-                
-                if row == 1 and baseline_obj_str:
-                    baseline_obj_value = float(baseline_obj_str)
-                    gwo_obj = metrics['objectiveValue']
-                    
-                    if gwo_obj < baseline_obj_value:
-                        # Tốt hơn (Xanh Neon Rực rỡ)
-                        color_style = "background-color: #004d40; color: #4CAF50; padding: 10px; border: 3px solid #64ffda; font-weight: extra bold; font-size: 11pt;" 
-                    elif gwo_obj > baseline_obj_value:
-                        # Kém hơn (Đỏ Cảnh báo)
-                        color_style = "background-color: #4e0000; color: #ff5252; padding: 10px; border: 3px solid #ff1744; font-weight: extra bold; font-size: 11pt;"
-                    else:
-                        # Bằng nhau (Tím Lấp lánh)
-                        color_style = "background-color: #260026; color: #ff80ff; padding: 10px; border: 3px solid #ea80fc; font-weight: extra bold; font-size: 11pt;"
-                    
-                    gwo_obj_label.setStyleSheet(color_style)
-                    
-            except Exception:
-                pass
+        if metrics.get("objectiveValue") is not None:
+            self.values[row] = metrics
+        else:
+            self.values.pop(row, None)
+
+        # Highlight Objective Value (Baseline và GWO có thể về theo thứ tự bất kỳ)
+        self._highlight_objective()
+
+    def _highlight_objective(self):
+        baseline = self.values.get(0)
+        gwo = self.values.get(1)
+        if baseline is None or gwo is None:
+            return
+
+        baseline_obj_value = baseline['objectiveValue']
+        gwo_obj = gwo['objectiveValue']
+
+        if gwo_obj < baseline_obj_value:
+            # Tốt hơn (Xanh Neon Rực rỡ)
+            color_style = "background-color: #004d40; color: #4CAF50; padding: 10px; border: 3px solid #64ffda; font-weight: extra bold; font-size: 11pt;" 
+        elif gwo_obj > baseline_obj_value:
+            # Kém hơn (Đỏ Cảnh báo)
+            color_style = "background-color: #4e0000; color: #ff5252; padding: 10px; border: 3px solid #ff1744; font-weight: extra bold; font-size: 11pt;"
+        else:
+            # Bằng nhau (Tím Lấp lánh)
+            color_style = "background-color: #260026; color: #ff80ff; padding: 10px; border: 3px solid #ea80fc; font-weight: extra bold; font-size: 11pt;"
+
+        self.labels["gwo_objectiveValue"].setStyleSheet(color_style)
 
 
 class ScheduleGridDisplay(QWidget):
@@ -369,4 +613,32 @@ class ScheduleGridDisplay(QWidget):
             
             row_idx += 1
             
-        QCoreApplication.processEvents()
\ No newline at end of file
+        QCoreApplication.processEvents()
+
+class ResultsTableWidget(QTableWidget):
+    """Bảng so sánh kết quả (dùng cho Parameter Sweep)."""
+    def __init__(self, headers: List[str]):
+        super().__init__(0, len(headers))
+        self.setHorizontalHeaderLabels(headers)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.verticalHeader().setVisible(False)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setStyleSheet("""
+            QTableWidget { background-color: #1f2733; color: #9cdafa; gridline-color: #121a24; border: 1px solid #495057; }
+            QTableWidget::item:selected { background-color: #5e35b1; color: #ffeb3b; }
+            QHeaderView::section { background-color: #8e24aa; color: white; padding: 6px; font-weight: bold; border: 1px solid #ff00ff; }
+        """)
+
+    def set_rows(self, rows: List[List[Any]]):
+        self.setRowCount(len(rows))
+        for r, values in enumerate(rows):
+            for c, value in enumerate(values):
+                if isinstance(value, float):
+                    text = f"{value:.2f}"
+                else:
+                    text = str(value)
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                self.setItem(r, c, item)
@@ -0,0 +1,317 @@
+"""Xuất biểu đồ Gantt ra file (SVG hoặc PNG chia tile) không cần cửa sổ GUI.
+
+SVG được ghi trực tiếp bằng Python thuần (không cần Qt). PNG dùng QImage/QPainter
+với platform "offscreen" và ghi từng tile xuống đĩa, nên bộ nhớ chỉ phụ thuộc kích
+thước một tile chứ không phụ thuộc độ dài timeline.
+
+Chạy từ CLI (trong thư mục Final_Project):
+    python -m ui.gantt_export Example/hard_ex.json gantt.svg
+    python -m ui.gantt_export schedule.json gantt.png --px-per-unit 4 --tile-width 4096
+"""
+import argparse
+import bisect
+import json
+import math
+import os
+import random
+import sys
+from typing import Any, Dict, List, Tuple
+from xml.sax.saxutils import escape
+
+# Cùng bảng màu / bố cục với GanttChartWidget
+BACKGROUND_COLOR = "#0d1117"
+AXIS_COLOR = "#007bff"
+TICK_LABEL_COLOR = "#00bcd4"
+MACHINE_LABEL_COLOR = "#ffc107"
+SEPARATOR_COLOR = "#495057"
+PADDING_Y = 20
+PADDING_X_LEFT = 80
+PADDING_X_RIGHT = 20
+ROW_HEIGHT = 30
+BAR_RATIO = 0.6
+
+
+def job_color_rgb(job_id: int) -> Tuple[int, int, int]:
+    # Dùng Random riêng thay vì random.seed() để không làm xáo trộn RNG toàn cục
+    rng = random.Random(job_id * 12345)
+    r = rng.randint(150, 255)
+    g = rng.randint(100, 200)
+    b = rng.randint(150, 255)
+    return r, g, b
+
+
+def machine_sort_key(machine_name: str) -> int:
+    if machine_name.startswith('M') and machine_name[1:].isdigit():
+        return int(machine_name[1:])
+    return 9999
+
+
+def job_label(job_id, bar_width: float):
+    # Quy tắc nhãn giống GanttChartWidget: chỉ ghi "J{id}" khi thanh đủ rộng
+    if bar_width <= 10:
+        return None, 0
+    return f"J{job_id}", (8 if bar_width > 20 else 7)
+
+
+class GanttLayout:
+    """Bố cục chung cho các renderer: tọa độ pixel của trục thời gian và các hàng máy."""
+
+    def __init__(self, schedule_dict: Dict[str, List[Dict[str, Any]]],
+                 px_per_unit: float = None, chart_width: int = 1200,
+                 row_height: int = ROW_HEIGHT, tick_spacing: int = 120):
+        self.machines = sorted(schedule_dict.keys(), key=machine_sort_key)
+        self.max_time = 0.0
+        for tasks in schedule_dict.values():
+            for task in tasks:
+                self.max_time = max(self.max_time, task.get("end", 0.0))
+
+        if px_per_unit is None:
+            px_per_unit = chart_width / self.max_time if self.max_time else 1.0
+        self.px_per_unit = float(px_per_unit)
+        self.chart_width = int(math.ceil(self.max_time * self.px_per_unit))
+        self.width = PADDING_X_LEFT + self.chart_width + PADDING_X_RIGHT
+        self.row_height = row_height
+        self.height = 2 * PADDING_Y + max(1, len(self.machines)) * row_height
+        self.bar_height = row_height * BAR_RATIO
+        self.axis_y = self.height - PADDING_Y
+
+        # Mỗi máy: các task đã sắp theo start (các task trên một máy không chồng nhau)
+        self.rows: List[List[Tuple[float, float, Any]]] = []
+        for machine_name in self.machines:
+            tasks = [(t.get("start", 0.0), t.get("end", 0.0), t.get("job", 0))
+                     for t in schedule_dict.get(machine_name, [])]
+            tasks.sort(key=lambda x: x[0])
+            self.rows.append(tasks)
+
+        self.tick_step = self._nice_step(tick_spacing / self.px_per_unit) if self.max_time else 1.0
+
+    @staticmethod
+    def _nice_step(raw: float) -> float:
+        if raw <= 0:
+            return 1.0
+        exp = 10 ** math.floor(math.log10(raw))
+        for m in (1, 2, 5, 10):
+            if raw <= m * exp:
+                return m * exp
+        return 10 * exp
+
+    def x_of(self, t: float) -> float:
+        return PADDING_X_LEFT + t * self.px_per_unit
+
+    def row_top(self, i: int) -> float:
+        return PADDING_Y + i * self.row_height
+
+    def ticks_between(self, x0: float, x1: float):
+        # Các vạch chia (time_value, x) nằm trong đoạn pixel [x0, x1)
+        if not self.max_time:
+            return
+        t0 = max(0.0, (x0 - PADDING_X_LEFT - 20) / self.px_per_unit)
+        k = int(math.floor(t0 / self.tick_step))
+        while True:
+            time_value = k * self.tick_step
+            if time_value > self.max_time + 1e-6:
+                break
+            x = self.x_of(time_value)
+            if x >= x1 + 20:
+                break
+            if x >= x0 - 20:
+                yield time_value, x
+            k += 1
+
+    def tasks_between(self, row: int, x0: float, x1: float):
+        # Task của một máy giao với đoạn pixel [x0, x1), dùng bisect trên start
+        tasks = self.rows[row]
+        t_lo = (x0 - PADDING_X_LEFT) / self.px_per_unit
+        t_hi = (x1 - PADDING_X_LEFT) / self.px_per_unit
+        i = bisect.bisect_left(tasks, (t_lo,))
+        if i > 0 and tasks[i - 1][1] > t_lo:
+            i -= 1
+        while i < len(tasks) and tasks[i][0] < t_hi:
+            yield tasks[i]
+            i += 1
+
+
+def _rgb_hex(rgb: Tuple[int, int, int]) -> str:
+    return "#%02x%02x%02x" % rgb
+
+
+def export_svg(schedule_dict: Dict[str, List[Dict[str, Any]]], path: str,
+               px_per_unit: float = None, chart_width: int = 1200,
+               row_height: int = ROW_HEIGHT) -> Dict[str, Any]:
+    layout = GanttLayout(schedule_dict, px_per_unit, chart_width, row_height)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{layout.width}" '
+                f'height="{layout.height}" font-family="Arial">\n')
+        f.write(f'<rect width="100%" height="100%" fill="{BACKGROUND_COLOR}"/>\n')
+
+        axis_y = layout.axis_y
+        f.write(f'<line x1="{PADDING_X_LEFT}" y1="{axis_y}" x2="{layout.width - PADDING_X_RIGHT}" '
+                f'y2="{axis_y}" stroke="{AXIS_COLOR}" stroke-width="2"/>\n')
+        for time_value, x in layout.ticks_between(0, layout.width):
+            f.write(f'<line x1="{x:.2f}" y1="{axis_y}" x2="{x:.2f}" y2="{axis_y + 5}" '
+                    f'stroke="{AXIS_COLOR}" stroke-width="2"/>'
+                    f'<text x="{x:.2f}" y="{axis_y + 16}" font-size="8" fill="{TICK_LABEL_COLOR}" '
+                    f'text-anchor="middle">{time_value:.1f}</text>\n')
+
+        bar_h = layout.bar_height
+        for i, machine_name in enumerate(layout.machines):
+            y_start = layout.row_top(i)
+            f.write(f'<text x="{PADDING_X_LEFT - 5}" y="{y_start + row_height / 2:.2f}" font-size="10" '
+                    f'font-weight="bold" fill="{MACHINE_LABEL_COLOR}" text-anchor="end" '
+                    f'dominant-baseline="middle">{escape(str(machine_name))}</text>\n')
+            if i > 0:
+                f.write(f'<line x1="{PADDING_X_LEFT}" y1="{y_start}" x2="{layout.width - PADDING_X_RIGHT}" '
+                        f'y2="{y_start}" stroke="{SEPARATOR_COLOR}" stroke-dasharray="1,3"/>\n')
+
+            y_bar = y_start + (row_height - bar_h) / 2
+            for start, end, job_id in layout.rows[i]:
+                if end - start <= 0:
+                    continue
+                x1 = layout.x_of(start)
+                width = layout.x_of(end) - x1
+                f.write(f'<rect x="{x1:.2f}" y="{y_bar:.2f}" width="{width:.2f}" height="{bar_h:.2f}" '
+                        f'fill="{_rgb_hex(job_color_rgb(int(job_id)))}" stroke="#000000" stroke-width="0.5"/>')
+                text, font_size = job_label(job_id, width)
+                if text:
+                    f.write(f'<text x="{x1 + width / 2:.2f}" y="{y_bar + bar_h / 2:.2f}" '
+                            f'font-size="{font_size}" font-weight="bold" fill="#000000" text-anchor="middle" '
+                            f'dominant-baseline="middle">{escape(text)}</text>')
+                f.write('\n')
+        f.write('</svg>\n')
+
+    return {"format": "svg", "files": [path], "width": layout.width, "height": layout.height}
+
+
+def _ensure_qt_app():
+    from PyQt6.QtGui import QGuiApplication
+    app = QGuiApplication.instance()
+    if app is None:
+        # Không có màn hình: dùng platform offscreen
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        app = QGuiApplication(sys.argv[:1])
+    return app
+
+
+def export_png_tiles(schedule_dict: Dict[str, List[Dict[str, Any]]], path: str,
+                     px_per_unit: float = None, chart_width: int = 1200,
+                     row_height: int = ROW_HEIGHT, tile_width: int = 4096) -> Dict[str, Any]:
+    from PyQt6.QtCore import Qt, QRectF, QPointF
+    from PyQt6.QtGui import QImage, QPainter, QPen, QBrush, QColor, QFont
+
+    _app = _ensure_qt_app()
+    layout = GanttLayout(schedule_dict, px_per_unit, chart_width, row_height)
+
+    num_tiles = max(1, int(math.ceil(layout.width / tile_width)))
+    base, ext = os.path.splitext(path)
+    ext = ext or ".png"
+    files = []
+
+    for tile_idx in range(num_tiles):
+        x0 = tile_idx * tile_width
+        x1 = min(layout.width, x0 + tile_width)
+        image = QImage(int(x1 - x0), int(layout.height), QImage.Format.Format_RGB32)
+        image.fill(QColor(BACKGROUND_COLOR))
+
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.translate(-x0, 0)
+
+        axis_y = layout.axis_y
+        painter.setPen(QPen(QColor(AXIS_COLOR), 2))
+        painter.drawLine(QPointF(max(x0, PADDING_X_LEFT), axis_y),
+                         QPointF(min(x1, layout.width - PADDING_X_RIGHT), axis_y))
+        painter.setFont(QFont("Arial", 8))
+        for time_value, x in layout.ticks_between(x0, x1):
+            painter.setPen(QPen(QColor(AXIS_COLOR), 2))
+            painter.drawLine(QPointF(x, axis_y), QPointF(x, axis_y + 5))
+            painter.setPen(QPen(QColor(TICK_LABEL_COLOR)))
+            painter.drawText(QRectF(x - 20, axis_y + 5, 40, 20), Qt.AlignmentFlag.AlignHCenter, f"{time_value:.1f}")
+
+        for i, machine_name in enumerate(layout.machines):
+            y_start = layout.row_top(i)
+            if x0 < PADDING_X_LEFT:
+                painter.setPen(QPen(QColor(MACHINE_LABEL_COLOR)))
+                painter.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+                painter.drawText(QRectF(0, y_start, PADDING_X_LEFT - 5, row_height),
+                                 Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                                 str(machine_name))
+            if i > 0:
+                painter.setPen(QPen(QColor(SEPARATOR_COLOR), 1, Qt.PenStyle.DotLine))
+                painter.drawLine(QPointF(max(x0, PADDING_X_LEFT), y_start),
+                                 QPointF(min(x1, layout.width - PADDING_X_RIGHT), y_start))
+
+            y_bar = y_start + (row_height - layout.bar_height) / 2
+            for start, end, job_id in layout.tasks_between(i, x0, x1):
+                if end - start <= 0:
+                    continue
+                bx = layout.x_of(start)
+                width = layout.x_of(end) - bx
+                painter.setBrush(QBrush(QColor(*job_color_rgb(int(job_id)))))
+                painter.setPen(QPen(QColor(0, 0, 0), 0.5))
+                painter.drawRect(QRectF(bx, y_bar, width, layout.bar_height))
+                text, font_size = job_label(job_id, width)
+                if text:
+                    painter.setPen(QPen(QColor("#000000")))
+                    painter.setFont(QFont("Arial", font_size, QFont.Weight.Bold))
+                    painter.drawText(QRectF(bx, y_bar, width, layout.bar_height),
+                                     Qt.AlignmentFlag.AlignCenter, text)
+        painter.end()
+
+        tile_path = path if num_tiles == 1 else f"{base}_{tile_idx:04d}{ext}"
+        if not image.save(tile_path):
+            raise IOError(f"Không ghi được tile {tile_path}")
+        files.append(tile_path)
+        del image  # giải phóng tile trước khi vẽ tile tiếp theo
+
+    if num_tiles > 1:
+        manifest = {"width": layout.width, "height": layout.height,
+                    "tile_width": tile_width, "tiles": [os.path.basename(p) for p in files]}
+        with open(f"{base}_tiles.json", 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+    return {"format": "png", "files": files, "width": layout.width, "height": layout.height}
+
+
+def export_gantt(schedule_dict: Dict[str, List[Dict[str, Any]]], path: str, **options) -> Dict[str, Any]:
+    # Hàm top-level để có thể gửi sang ProcessPoolExecutor
+    if path.lower().endswith(".svg"):
+        options.pop("tile_width", None)
+        return export_svg(schedule_dict, path, **options)
+    return export_png_tiles(schedule_dict, path, **options)
+
+
+def _load_schedule(file_name: str) -> Dict[str, List[Dict[str, Any]]]:
+    with open(file_name, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if isinstance(data, dict) and 'jobs' in data:
+        # File instance: tính lịch baseline trước rồi mới vẽ
+        from core.scheduler import Scheduler
+        sch = Scheduler.from_dict(data)
+        return sch.greedy_schedule()
+    if isinstance(data, dict) and 'schedule' in data:
+        return data['schedule']
+    return data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Xuất biểu đồ Gantt ra SVG/PNG (headless).")
+    parser.add_argument("input", help="File instance JSON (có 'jobs') hoặc file lịch trình {M1: [...], ...}")
+    parser.add_argument("output", help="File đầu ra .svg hoặc .png")
+    parser.add_argument("--px-per-unit", type=float, default=None, help="Số pixel cho một đơn vị thời gian")
+    parser.add_argument("--chart-width", type=int, default=1200, help="Chiều rộng vùng vẽ khi không đặt --px-per-unit")
+    parser.add_argument("--row-height", type=int, default=ROW_HEIGHT)
+    parser.add_argument("--tile-width", type=int, default=4096, help="Chiều rộng mỗi tile PNG")
+    args = parser.parse_args(argv)
+
+    schedule = _load_schedule(args.input)
+    result = export_gantt(schedule, args.output, px_per_unit=args.px_per_unit,
+                          chart_width=args.chart_width, row_height=args.row_height,
+                          tile_width=args.tile_width)
+    print(f"Đã xuất {len(result['files'])} file ({result['width']}x{result['height']} px)")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,35 +1,121 @@
 import time
 import copy
+import queue
 import traceback
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from PyQt6.QtCore import QThread, pyqtSignal
 
 # Import từ core package
 from core.scheduler import Scheduler
 from core.gwo import GWOScheduler
+from core.control import CancellationToken
+from core.contraction import ChainContraction
+from core.bounds import lower_bounds, optimality_gap
+from core.portfolio import run_portfolio, DISPATCH_RULES
+from core.screening import ScreeningConfig
+from core.sweep import SweepRunner
+from core.optimizers import ENGINES, build_optimizer, run_engine_portfolio
+from core.pareto import ParetoArchive, fill_front
+from ui.gantt_export import export_gantt
+
+def _inject_seed(opt, vector: dict):
+    # Đưa một nghiệm từ ngoài (vd. quy tắc dispatch tốt nhất) vào optimizer đang chạy;
+    # gọi trong thread của optimizer, giữa hai vòng lặp
+    encoding = getattr(opt, 'encoding', None)
+    X = encoding.reduce(vector) if encoding is not None else dict(vector)
+    opt.inject(vector, opt.evaluate(X))
+
+
+def _drain_seeds(seeds: queue.SimpleQueue, opt):
+    # Inject mọi vector GUI đã gửi kể từ vòng trước (không mất vector nào khi gửi dồn)
+    while True:
+        try:
+            vector = seeds.get_nowait()
+        except queue.Empty:
+            return
+        _inject_seed(opt, vector)
+
 
 class GWOThread(QThread):
     finished = pyqtSignal(dict)
     progress = pyqtSignal(int, int, float)
+    # Các điểm lịch sử mới (best, mean, diversity) kể từ lần emit trước
+    history = pyqtSignal(list, list, list)
     error = pyqtSignal(str)
     thread_done = pyqtSignal() 
 
-    def __init__(self, scheduler: Scheduler, pop_size: int, max_iter: int):
+    def __init__(self, scheduler: Scheduler, pop_size: int, max_iter: int, max_progress_rate: float = 10.0,
+                 contract_chains: bool = False, gap_target: float = None, init_vector: dict = None,
+                 screening: ScreeningConfig = None, gwo_options: dict = None):
         super().__init__()
         self.scheduler = scheduler
         self.pop_size = pop_size
         self.max_iter = max_iter
+        # Tham số GWO khác (vd. lower/upper/scale_init đã tune trong gwo_defaults.json)
+        self.gwo_options = gwo_options or {}
+        # Gộp chuỗi tiền nhiệm tuyến tính thành một chiều tìm kiếm
+        self.contract_chains = contract_chains
+        # Dừng sớm khi gap so với cận dưới <= gap_target (None = chạy đủ max_iter)
+        self.gap_target = gap_target
+        # Vector khởi tạo cho alpha wolf (vd. lấy từ quy tắc dispatch tốt nhất)
+        self.init_vector = init_vector
+        # Cấu hình sàng lọc sói bằng fitness rẻ (None = decode chính xác mọi con)
+        self.screening = screening
+        # Số lần emit progress tối đa mỗi giây (gộp các vòng lặp ở giữa)
+        self.max_progress_rate = max_progress_rate
+        self.cancel_token = CancellationToken()
+        # Vector GUI thread gửi khi GWO đang chạy (xem seed), thread GWO lấy ra ở vòng lặp kế tiếp
+        self._seeds = queue.SimpleQueue()
+
+    def stop(self):
+        self.cancel_token.cancel()
+
+    def pause(self):
+        self.cancel_token.pause()
+
+    def resume(self):
+        self.cancel_token.resume()
+
+    def seed(self, vector: dict) -> bool:
+        """Gửi vector (vd. từ Baseline xong sau khi GWO đã chạy) để thay con sói tệ nhất."""
+        self._seeds.put(vector)
+        return True
 
     def run(self):
         try:
             start_time = time.time()  # <--- BẮT ĐẦU ĐO THỜI GIAN
             
             scheduler_copy = copy.deepcopy(self.scheduler)
-            gwo = GWOScheduler(scheduler_copy, pop_size=self.pop_size, max_iter=self.max_iter)
+            encoding = ChainContraction(scheduler_copy) if self.contract_chains else None
+            # Mọi cặp (makespan, penalty) đã decode: đổi alpha/beta chọn lại ngay từ archive
+            archive = ParetoArchive()
+            gwo = GWOScheduler(scheduler_copy, pop_size=self.pop_size, max_iter=self.max_iter, encoding=encoding,
+                               gap_target=self.gap_target, init_vector=self.init_vector,
+                               screening=self.screening, archive=archive, **self.gwo_options)
             
+            min_interval = 1.0 / self.max_progress_rate if self.max_progress_rate > 0 else 0.0
+            state = {"last_emit": 0.0, "sent": 0}
+
+            def flush_history():
+                sent = state["sent"]
+                if sent < len(gwo.best_fitness_history):
+                    self.history.emit(gwo.best_fitness_history[sent:],
+                                      gwo.mean_fitness_history[sent:],
+                                      gwo.diversity_history[sent:])
+                    state["sent"] = len(gwo.best_fitness_history)
+
             def update_progress(t, max_t, fitness):
-                self.progress.emit(t, max_t, fitness)
+                _drain_seeds(self._seeds, gwo)
+                now = time.time()
+                if t == max_t or now - state["last_emit"] >= min_interval:
+                    state["last_emit"] = now
+                    self.progress.emit(t, max_t, fitness)
+                    flush_history()
 
-            best_priority_vector, best_fitness = gwo.solve(progress_callback=update_progress)
+            best_priority_vector, best_fitness = gwo.solve(progress_callback=update_progress,
+                                                           cancel_token=self.cancel_token)
+            flush_history()
 
             sch_final = copy.deepcopy(self.scheduler)
             sch_final.greedy_schedule(priority_vector=best_priority_vector)
@@ -37,16 +123,311 @@ class GWOThread(QThread):
             
             end_time = time.time()  # <--- KẾT THÚC ĐO THỜI GIAN
             metrics_gwo['executionTime'] = end_time - start_time # Lưu thời gian chạy
+            if gwo.lower_bound is None:
+                gwo.lower_bound = lower_bounds(self.scheduler).objective
+            metrics_gwo['lowerBound'] = gwo.lower_bound
+            metrics_gwo['gap'] = optimality_gap(metrics_gwo['objectiveValue'], gwo.lower_bound)
 
             self.finished.emit({
                 "vector": best_priority_vector,
                 "metrics": metrics_gwo,
                 "schedule": sch_final.schedule, 
-                "fitness_history": getattr(gwo, 'best_fitness_history', [])
+                "fitness_history": getattr(gwo, 'best_fitness_history', []),
+                "cancelled": gwo.cancelled,
+                "dimensions": len(gwo.jobs),
+                "stopped_early": gwo.stopped_early,
+                "screening_stats": gwo.screening_stats,
+                "pareto": archive
             })
         except Exception as e:
             error_message = f"Lỗi GWO (Runtime): {type(e).__name__}: {e}"
             self.error.emit(error_message)
             print(f"TRACEBACK GWO:\n{traceback.format_exc()}")
         finally:
-            self.thread_done.emit()
\ No newline at end of file
+            self.thread_done.emit()
+
+class EngineThread(QThread):
+    """Chạy một engine khác GWO (GA, PSO, SA, IG) hoặc portfolio nhiều engine song song.
+
+    Cùng tín hiệu với GWOThread để GUI dùng chung. Ở chế độ portfolio, progress là
+    (giây đã chạy, giới hạn thời gian, incumbent); tạm dừng chỉ dừng việc báo tiến độ,
+    các process engine vẫn chạy.
+    """
+    finished = pyqtSignal(dict)
+    progress = pyqtSignal(int, int, float)
+    history = pyqtSignal(list, list, list)
+    error = pyqtSignal(str)
+    thread_done = pyqtSignal()
+
+    POPULATION_ENGINES = ("gwo", "ga", "pso")
+
+    def __init__(self, scheduler: Scheduler, engine: str, pop_size: int, max_iter: int,
+                 time_limit: float = 60.0, init_vector: dict = None, max_progress_rate: float = 10.0):
+        super().__init__()
+        self.scheduler = scheduler
+        self.engine = engine            # tên trong ENGINES hoặc "portfolio"
+        self.pop_size = pop_size
+        self.max_iter = max_iter
+        self.time_limit = time_limit
+        self.init_vector = init_vector
+        self.max_progress_rate = max_progress_rate
+        self.cancel_token = CancellationToken()
+        # Vector GUI thread gửi khi engine đang chạy (xem seed), lấy ra ở vòng lặp kế tiếp
+        self._seeds = queue.SimpleQueue()
+
+    def stop(self):
+        self.cancel_token.cancel()
+
+    def pause(self):
+        self.cancel_token.pause()
+
+    def resume(self):
+        self.cancel_token.resume()
+
+    def seed(self, vector: dict) -> bool:
+        # Portfolio chạy engine trong process con: không nhận vector từ ngoài khi đang chạy
+        if self.engine == "portfolio":
+            return False
+        self._seeds.put(vector)
+        return True
+
+    def _params(self, name: str) -> dict:
+        return {"pop_size": self.pop_size} if name in self.POPULATION_ENGINES else {}
+
+    def run(self):
+        try:
+            start_time = time.time()
+            if self.engine == "portfolio":
+                vector, history, cancelled, extra = self.run_portfolio()
+            else:
+                vector, history, cancelled, extra = self.run_single()
+
+            sch_final = copy.deepcopy(self.scheduler)
+            sch_final.greedy_schedule(priority_vector=vector)
+            metrics = sch_final.compute_metrics()
+            metrics['executionTime'] = time.time() - start_time
+            lb = lower_bounds(self.scheduler).objective
+            metrics['lowerBound'] = lb
+            metrics['gap'] = optimality_gap(metrics['objectiveValue'], lb)
+
+            self.finished.emit(dict({
+                "vector": vector,
+                "metrics": metrics,
+                "schedule": sch_final.schedule,
+                "fitness_history": history,
+                "cancelled": cancelled,
+                "dimensions": len(self.scheduler.jobs),
+                "stopped_early": False,
+                "screening_stats": {},
+            }, **extra))
+        except Exception as e:
+            error_message = f"Lỗi Engine (Runtime): {type(e).__name__}: {e}"
+            self.error.emit(error_message)
+            print(f"TRACEBACK ENGINE:\n{traceback.format_exc()}")
+        finally:
+            self.thread_done.emit()
+
+    def run_single(self):
+        opt = build_optimizer(copy.deepcopy(self.scheduler), self.engine, init_vector=self.init_vector,
+                              **self._params(self.engine))
+        opt.archive = ParetoArchive()
+        min_interval = 1.0 / self.max_progress_rate if self.max_progress_rate > 0 else 0.0
+        state = {"last_emit": 0.0, "sent": 0}
+
+        def flush_history():
+            points = opt.best_fitness_history[state["sent"]:]
+            if points:
+                self.history.emit(points, points, [0.0] * len(points))
+                state["sent"] = len(opt.best_fitness_history)
+
+        def update_progress(t, max_t, fitness):
+            _drain_seeds(self._seeds, opt)
+            now = time.time()
+            if t == max_t or now - state["last_emit"] >= min_interval:
+                state["last_emit"] = now
+                self.progress.emit(t, max_t, fitness)
+                flush_history()
+
+        vector, _ = opt.run(self.max_iter, progress_callback=update_progress, cancel_token=self.cancel_token,
+                            time_limit=self.time_limit)
+        flush_history()
+        return vector, opt.best_fitness_history, opt.cancelled, {"engine": ENGINES[self.engine].label,
+                                                                  "pareto": opt.archive}
+
+    def run_portfolio(self):
+        def on_update(best, elapsed):
+            if not self.cancel_token.paused:
+                self.progress.emit(int(elapsed), int(self.time_limit), best)
+                self.history.emit([best], [best], [0.0])
+
+        names = list(ENGINES)
+        results = run_engine_portfolio(copy.deepcopy(self.scheduler), engines=names, time_limit=self.time_limit,
+                                       max_iter=self.max_iter, params={n: self._params(n) for n in names},
+                                       on_update=on_update, cancel_token=self.cancel_token)
+        best = results[0]
+        summary = [{"label": r['label'], "fitness": r['fitness'], "iterations": r['iterations'],
+                    "evaluations": r['evaluations']} for r in results]
+        return best['vector'], best['history'], self.cancel_token.cancelled, \
+            {"engine": f"Portfolio ({best['label']} tốt nhất)", "engines": summary}
+
+
+class ParetoThread(QThread):
+    """Chế độ đa mục tiêu: chạy GWO theo nhiều trọng số makespan / penalty để phủ mặt Pareto.
+
+    progress = (số trọng số đã chạy, tổng số trọng số); kết quả được gộp vào `archive`.
+    """
+    finished = pyqtSignal(dict)
+    progress = pyqtSignal(int, int)
+    error = pyqtSignal(str)
+    thread_done = pyqtSignal()
+
+    def __init__(self, scheduler: Scheduler, weights: int, pop_size: int, max_iter: int,
+                 archive: ParetoArchive = None):
+        super().__init__()
+        self.scheduler = scheduler
+        self.weights = weights
+        self.pop_size = pop_size
+        self.max_iter = max_iter
+        self.archive = archive if archive is not None else ParetoArchive()
+        self.cancel_token = CancellationToken()
+
+    def stop(self):
+        self.cancel_token.cancel()
+
+    def run(self):
+        try:
+            start_time = time.time()
+            self.progress.emit(0, self.weights)
+            fill_front(copy.deepcopy(self.scheduler), self.weights, self.archive, self.pop_size, self.max_iter,
+                       cancel_token=self.cancel_token,
+                       on_weight=lambda k, lam, archive: self.progress.emit(k + 1, self.weights))
+            self.finished.emit({"pareto": self.archive, "cancelled": self.cancel_token.cancelled,
+                                "executionTime": time.time() - start_time})
+        except Exception as e:
+            self.error.emit(f"Lỗi Pareto (Runtime): {type(e).__name__}: {e}")
+            print(f"TRACEBACK PARETO:\n{traceback.format_exc()}")
+        finally:
+            self.thread_done.emit()
+
+
+class BaselineThread(QThread):
+    # Chạy Baseline (Greedy) ngoài GUI thread, báo tiến độ dispatch (số job đã xếp / tổng).
+    # Với portfolio=True, chạy song song mọi quy tắc dispatch và lấy quy tắc tốt nhất
+    # (progress = tổng số job đã xếp trên mọi quy tắc / số job * số quy tắc)
+    finished = pyqtSignal(dict)
+    progress = pyqtSignal(int, int)
+    error = pyqtSignal(str)
+    thread_done = pyqtSignal()
+
+    def __init__(self, scheduler: Scheduler, progress_interval: float = 0.1, portfolio: bool = True):
+        super().__init__()
+        self.scheduler = scheduler
+        self.progress_interval = progress_interval
+        self.portfolio = portfolio
+
+    def run(self):
+        try:
+            if self.portfolio:
+                self.run_portfolio()
+            else:
+                self.run_single()
+        except Exception as e:
+            self.error.emit(f"Lỗi trong quá trình xếp lịch Baseline: {type(e).__name__}: {e}")
+            print(f"TRACEBACK BASELINE FAILED:\n{traceback.format_exc()}")
+        finally:
+            self.thread_done.emit()
+
+    def run_portfolio(self):
+        start_time = time.time()
+        sch = copy.deepcopy(self.scheduler)
+        self.progress.emit(0, len(sch.jobs) * len(DISPATCH_RULES))
+        results = run_portfolio(sch, on_progress=self.progress.emit, progress_interval=self.progress_interval)
+        best = results[0]
+
+        metrics = dict(best['metrics'])
+        metrics['executionTime'] = time.time() - start_time
+        metrics['lowerBound'] = lower_bounds(self.scheduler).objective
+        metrics['gap'] = optimality_gap(metrics['objectiveValue'], metrics['lowerBound'])
+        self.finished.emit({
+            "metrics": metrics,
+            "schedule": best['schedule'],
+            "rule": best['rule'],
+            "label": best['label'],
+            "portfolio": [{"rule": r['rule'], "label": r['label'], "metrics": r['metrics']} for r in results]
+        })
+
+    def run_single(self):
+        start_time = time.time()
+
+        sch_baseline = copy.deepcopy(self.scheduler)
+        last_emit = [0.0]
+
+        def update_progress(done, total):
+            # Giới hạn tần suất emit để không làm ngập event loop với instance lớn
+            now = time.time()
+            if done == total or now - last_emit[0] >= self.progress_interval:
+                last_emit[0] = now
+                self.progress.emit(done, total)
+
+        sch_baseline.greedy_schedule(progress_callback=update_progress)
+        metrics = sch_baseline.compute_metrics()
+        metrics['executionTime'] = time.time() - start_time
+        metrics['lowerBound'] = lower_bounds(self.scheduler).objective
+        metrics['gap'] = optimality_gap(metrics['objectiveValue'], metrics['lowerBound'])
+
+        self.finished.emit({
+            "metrics": metrics,
+            "schedule": sch_baseline.schedule
+        })
+
+
+class SweepThread(QThread):
+    # Chạy Parameter Sweep (nhiều cấu hình GWO song song trên process pool)
+    result = pyqtSignal(dict, bool)
+    finished = pyqtSignal(list)
+    error = pyqtSignal(str)
+    thread_done = pyqtSignal()
+
+    def __init__(self, runner: SweepRunner, instance_data: dict, configs: list):
+        super().__init__()
+        self.runner = runner
+        self.instance_data = instance_data
+        self.configs = configs
+        self.cancel_token = CancellationToken()
+
+    def stop(self):
+        self.cancel_token.cancel()
+
+    def run(self):
+        try:
+            results = self.runner.run(self.instance_data, self.configs,
+                                      on_result=lambda res, cached: self.result.emit(res, cached),
+                                      cancel_token=self.cancel_token)
+            self.finished.emit(results)
+        except Exception as e:
+            self.error.emit(f"Lỗi Sweep (Runtime): {type(e).__name__}: {e}")
+            print(f"TRACEBACK SWEEP:\n{traceback.format_exc()}")
+        finally:
+            self.thread_done.emit()
+
+
+class GanttExportThread(QThread):
+    # Vẽ Gantt trong một process riêng để không chặn GUI với lịch trình rất lớn
+    finished = pyqtSignal(dict)
+    error = pyqtSignal(str)
+
+    def __init__(self, schedule: dict, path: str, **options):
+        super().__init__()
+        self.schedule = schedule
+        self.path = path
+        self.options = options
+
+    def run(self):
+        try:
+            # "spawn": không fork process đang chạy Qt (fork khi có thread GUI sống là không an toàn)
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                result = pool.submit(export_gantt, self.schedule, self.path, **self.options).result()
+            self.finished.emit(result)
+        except Exception as e:
+            self.error.emit(f"Lỗi xuất Gantt: {type(e).__name__}: {e}")
+            print(f"TRACEBACK GANTT EXPORT:\n{traceback.format_exc()}")